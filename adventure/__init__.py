@@ -1,3 +1,4 @@
 from .game import Game
+from .world import World, WorldError
 
-__all__ = ["Game"]
+__all__ = ["Game", "World", "WorldError"]
@@ -1,10 +1,47 @@
 import json
 import os
 import random
-from typing import Dict, List, Tuple
+import re
+import tempfile
+import threading
+from typing import Callable, Collection, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+from .world import DEFAULT_WORLD, DIRECTION_INDEX, Item, Room, World, WorldError
+
+SAVE_DIR = "saves"
+# Commands between snapshots, which bounds how much a restore replays.
+SNAPSHOT_EVERY = 50
+SLOT_RE = re.compile(r"[a-z0-9_-]{1,16}")
+# Up to and including the first ".", "!" or "?" that ends a sentence.
+FIRST_SENTENCE_RE = re.compile(r".*?[.!?](?=\s|$)", re.DOTALL)
+_MASK64 = (1 << 64) - 1
+
+
+class SplitMix64:
+    """Tiny seeded RNG whose whole state is one integer, so saves stay small."""
+
+    __slots__ = ("state",)
+
+    def __init__(self, state: int):
+        self.state = state & _MASK64
+
+    def next(self) -> int:
+        self.state = (self.state + 0x9E3779B97F4A7C15) & _MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> 31)
+
+    def random(self) -> float:
+        return (self.next() >> 11) / (1 << 53)
+
+    def choice(self, seq):
+        return seq[self.next() % len(seq)]
 
 
 class Parser:
+    __slots__ = ()
+
     directions = {
         "n": "north",
         "s": "south",
@@ -25,229 +62,564 @@ class Parser:
                 verb = self.directions[tokens[0]]
             else:
                 verb = tokens[0]
+            if verb == "go" and len(tokens) > 2:
+                # Room names have spaces: "go shrine of echoes".
+                commands.append((verb, " ".join(tokens[1:]), ""))
+                continue
             noun = tokens[1] if len(tokens) > 1 else ""
             prep = tokens[2] if len(tokens) > 2 else ""
             commands.append((verb, noun, prep))
         return commands
 
 
-class Item:
-    def __init__(self, name: str, weight: int, desc: str, can_carry: bool=True):
-        self.name = name
-        self.weight = weight
-        self.desc = desc
-        self.can_carry = can_carry
+def first_sentence(text: str) -> str:
+    """The first sentence of ``text`` with its terminator, or all of it."""
+    match = FIRST_SENTENCE_RE.match(text)
+    return match.group(0) if match else text
 
-    def __repr__(self):
-        return self.name
 
+class Game:
+    """One player's game: a shared :class:`World` plus a small overlay.
+
+    Only what the player has changed is stored per game: the item lists of
+    rooms that differ from the template (``room_items``), changed room state
+    (``room_state``), rooms already described (``visited``) and the
+    inventory.
+
+    Text is written to ``output`` (``print`` by default), one line per call,
+    so concurrent games can each capture their own replies. Hold ``lock``
+    while running commands from more than one thread.
+
+    Progress is also kept as an event log: ``base`` is a snapshot (including
+    the RNG state) and ``journal`` the commands run since, so a save slot is
+    the snapshot followed by one short line per command and a restore
+    replays them. A new snapshot is taken every ``SNAPSHOT_EVERY`` commands.
+    Commands whose words contain spaces are journaled as ``[verb, noun, prep]``
+    lists.
+    """
+
+    __slots__ = (
+        "world",
+        "verbose",
+        "terse",
+        "seen_items",
+        "move_count",
+        "score",
+        "thief_has_item",
+        "player_room",
+        "inventory",
+        "room_items",
+        "room_state",
+        "visited",
+        "locked_doors",
+        "required_items",
+        "output",
+        "lock",
+        "rng",
+        "base",
+        "journal",
+        "saved",
+        "save_dir",
+    )
 
-class Room:
-    def __init__(self, data: Dict):
-        self.id = data["id"]
-        self.name = data["name"]
-        self.desc = data["desc"]
-        self.exits = data["exits"]
-        self.item_names = data.get("items", [])
-        self.state = data.get("state", {"lit": True, "locked": False})
-        self.items: List[Item] = []
+    max_weight = 10
+    total_score = 100
+    parser = Parser()
+    use_actions = {
+        ("lamp", ""): "_use_lamp",
+        ("key", "door"): "unlock_door",
+        ("lockpick", "door"): "unlock_door",
+        ("scroll", ""): "_use_scroll",
+    }
+    # Commands that manage saves rather than play; they are not journaled.
+    meta_verbs = ("save", "restore", "saves")
+    # Verb -> ``do_<verb>`` method, filled in once per class.
+    verbs: Dict[str, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.verbs = _verb_table(cls)
+
+    def __init__(
+        self,
+        data_path: str = None,
+        output: Callable[[str], None] = print,
+        seed: Optional[int] = None,
+    ):
+        self.world = World.load(data_path)
+        self.output = output
+        self.lock = threading.Lock()
+        self.save_dir = SAVE_DIR
+        self.load_dict(self.initial_state(random.getrandbits(64) if seed is None else seed))
+
+    def initial_state(self, seed: int) -> Dict:
+        return {
+            "player_room": self.world.start,
+            "inventory": [],
+            "rooms": {},
+            "rng": seed,
+            "locked_doors": self._initial_locks(),
+            "required_items": {"lamp": False, "key": False, "lockpick": False},
+        }
 
+    def _initial_locks(self) -> Dict[int, Dict[str, bool]]:
+        return {rid: {d: True for d in dirs} for rid, dirs in self.world.locks.items()}
 
-class Game:
-    max_weight = 10
+    @property
+    def thief_room(self) -> int:
+        return self.world.thief_room
 
-    def __init__(self, data_path: str = None):
-        self.parser = Parser()
-        self.verbose = False
-        self.move_count = 0
-        self.score = 0
-        self.total_score = 100
-        self.thief_has_item = None
-        self.thief_room = 30
-        data_path = data_path or os.path.join(os.path.dirname(__file__), "world.json")
-        with open(data_path) as f:
-            data = json.load(f)
-        self.items: Dict[str, Item] = {}
-        for key, val in data["items"].items():
-            self.items[key] = Item(**val)
-        self.rooms: Dict[int, Room] = {}
-        for rdata in data["rooms"]:
-            room = Room(rdata)
-            room.items = [self.items[name] for name in room.item_names]
-            self.rooms[room.id] = room
-        self.player_room = 1
-        self.inventory: List[Item] = []
-        self.locked_doors = {10: {"east": True}}
-        self.required_items = {"lamp": False, "key": False, "lockpick": False}
-        self.use_actions = {
-            ("lamp", ""): self._use_lamp,
-            ("key", "door"): self.unlock_door,
-            ("lockpick", "door"): self.unlock_door,
-            ("scroll", ""): self._use_scroll,
-        }
+    @property
+    def items(self) -> Mapping[str, Item]:
+        return self.world.items
+
+    @property
+    def rooms(self) -> Mapping[int, Room]:
+        return self.world.rooms
 
     def current_room(self) -> Room:
-        return self.rooms[self.player_room]
+        return self.world.rooms[self.player_room]
+
+    def _item_map(self, room_id: int) -> Mapping[str, Item]:
+        items = self.room_items.get(room_id)
+        return items if items is not None else self.world.rooms[room_id].item_map
+
+    def items_in(self, room_id: int) -> Collection[Item]:
+        """Items currently in ``room_id`` (do not mutate the result)."""
+        return self._item_map(room_id).values()
+
+    def _room_items(self, room_id: int) -> Dict[str, Item]:
+        items = self.room_items.get(room_id)
+        if items is None:
+            items = self.room_items[room_id] = dict(self.world.rooms[room_id].item_map)
+        return items
+
+    def state_of(self, room_id: int) -> Mapping:
+        state = self.room_state.get(room_id)
+        return state if state is not None else self.world.rooms[room_id].state
 
     def current_weight(self) -> int:
         return sum(item.weight for item in self.inventory)
 
     def do_look(self, *_):
+        self.describe(explicit=True)
+
+    def describe(self, explicit: bool = False) -> None:
+        """Describe the current room.
+
+        In terse mode a first visit only gets the description's first
+        sentence (an explicit look gives all of it), exits are abbreviated and
+        items are listed only when they differ from what the player was last
+        shown in that room.
+        """
         room = self.current_room()
-        print(f"Room {room.id}: {room.name}")
-        if self.verbose or room.state.get("first", True):
-            print(room.desc)
-            room.state["first"] = False
-        print("Exits: ", ", ".join(room.exits.keys()))
-        if room.items:
-            print("You see:", ", ".join(i.name for i in room.items))
+        self.output(f"Room {room.id}: {room.name}")
+        if self.terse and not (self.verbose or explicit):
+            if room.id not in self.visited:
+                self.output(first_sentence(room.desc))
+                self.visited.add(room.id)
+        elif self.verbose or room.id not in self.visited or self.terse:
+            self.output(room.desc)
+            self.visited.add(room.id)
+        if not self.terse:
+            self.output("Exits:  " + ", ".join(room.exits.keys()))
+            items = self.items_in(room.id)
+            if items:
+                self.output("You see: " + ", ".join(i.name for i in items))
+            return
+        self.output("Exits: " + " ".join(d[0] for d in room.exits))
+        names = tuple(i.name for i in self.items_in(room.id))
+        if names and (explicit or self.seen_items.get(room.id) != names):
+            self.output("See: " + ", ".join(names))
+        self.seen_items[room.id] = names
 
     def do_examine(self, noun, *_):
         if noun in self.items:
             item = self.items[noun]
-            print(item.desc)
+            self.output(item.desc)
         else:
-            print("You see nothing special about it.")
+            self.output("You see nothing special about it.")
 
     def do_take(self, noun, *_):
         room = self.current_room()
-        item = next((i for i in room.items if i.name == noun), None)
+        item = self._item_map(room.id).get(noun)
         if not item:
-            print("There is no such item here.")
+            self.output("There is no such item here.")
             return
         if not item.can_carry:
-            print("You cannot carry that.")
+            self.output("You cannot carry that.")
             return
         if self.current_weight() + item.weight > self.max_weight:
-            print("Your load is too heavy.")
+            self.output("Your load is too heavy.")
             return
-        room.items.remove(item)
+        del self._room_items(room.id)[noun]
         self.inventory.append(item)
         if item.name == "treasure":
             self.score += 10
-        print("Taken.")
+        self.output("Taken.")
 
     def do_drop(self, noun, *_):
         item = next((i for i in self.inventory if i.name == noun), None)
         if not item:
-            print("You don't have that.")
+            self.output("You don't have that.")
             return
         self.inventory.remove(item)
-        self.current_room().items.append(item)
-        print("Dropped.")
+        self._room_items(self.player_room)[item.name] = item
+        self.output("Dropped.")
 
     def do_inventory(self, *_):
         if not self.inventory:
-            print("You are empty-handed.")
+            self.output("You are empty-handed.")
             return
-        print("You are carrying:")
+        if self.terse:
+            carried = ", ".join(i.name for i in self.inventory)
+            self.output(f"Carrying: {carried} ({self.current_weight()}/{self.max_weight})")
+            return
+        self.output("You are carrying:")
         for i in self.inventory:
-            print(f"- {i.name} ({i.weight})")
-        print(f"Total weight: {self.current_weight()}/{self.max_weight}")
+            self.output(f"- {i.name} ({i.weight})")
+        self.output(f"Total weight: {self.current_weight()}/{self.max_weight}")
 
     def do_score(self, *_):
-        print(f"Score: {self.score}/{self.total_score}")
+        self.output(f"Score: {self.score}/{self.total_score}")
 
     def do_moves(self, *_):
-        print(f"Moves: {self.move_count}")
+        self.output(f"Moves: {self.move_count}")
 
-    def do_save(self, noun="save.json", *_):
-        state = {
+    def to_dict(self) -> Dict:
+        """Serialisable snapshot of everything this game has changed."""
+        return {
             "player_room": self.player_room,
             "inventory": [i.name for i in self.inventory],
-            "rooms": {rid: r.state for rid, r in self.rooms.items()},
+            "rooms": {rid: dict(st) for rid, st in self.room_state.items()},
+            "room_items": {rid: list(items) for rid, items in self.room_items.items()},
+            "visited": sorted(self.visited),
             "score": self.score,
             "move_count": self.move_count,
             "thief_has_item": self.thief_has_item,
+            "verbose": self.verbose,
+            "terse": self.terse,
+            "locked_doors": {rid: dict(d) for rid, d in self.locked_doors.items()},
+            "required_items": dict(self.required_items),
+            "rng": self.rng.state,
         }
-        with open(noun, "w") as f:
-            json.dump(state, f)
-        print("Saved.")
 
-    def do_restore(self, noun="save.json", *_):
-        try:
-            with open(noun) as f:
-                state = json.load(f)
-        except Exception:
-            print("Unable to load; start new game?")
-            return
+    def load_dict(self, state: Dict) -> None:
+        """Replace this game's progress with a :meth:`to_dict` snapshot.
+
+        The snapshot becomes the base of a new, empty journal.
+        """
         self.player_room = state["player_room"]
         self.inventory = [self.items[name] for name in state["inventory"]]
+        self.room_state = {}
+        self.visited = set(state.get("visited", []))
         for rid, st in state["rooms"].items():
-            self.rooms[int(rid)].state = st
+            st = dict(st)
+            # Older saves stored every room's state with a "first" flag.
+            if st.pop("first", True) is False:
+                self.visited.add(int(rid))
+            if st != dict(self.rooms[int(rid)].state):
+                self.room_state[int(rid)] = st
+        self.room_items = {
+            int(rid): {name: self.items[name] for name in names}
+            for rid, names in state.get("room_items", {}).items()
+        }
         self.score = state.get("score", 0)
         self.move_count = state.get("move_count", 0)
         self.thief_has_item = state.get("thief_has_item")
-        print("Restored.")
+        self.verbose = state.get("verbose", False)
+        self.terse = state.get("terse", False)
+        # Room id -> item names last shown there (terse mode only).
+        self.seen_items: Dict[int, Tuple[str, ...]] = {}
+        if "locked_doors" in state:
+            self.locked_doors = {int(rid): dict(d) for rid, d in state["locked_doors"].items()}
+        else:
+            self.locked_doors = self._initial_locks()
+        self.required_items = dict(
+            state.get("required_items", {"lamp": False, "key": False, "lockpick": False})
+        )
+        self.rng = SplitMix64(state["rng"] if "rng" in state else random.getrandbits(64))
+        self.base: Dict = state
+        self.journal: List[str] = []
+        # Slot name -> journal entries already written to that slot.
+        self.saved: Dict[str, int] = {}
+
+    @classmethod
+    def from_dict(cls, state: Dict, data_path: str = None) -> "Game":
+        game = cls(data_path)
+        game.load_dict(state)
+        return game
+
+    def replay(self, snapshot: Dict, commands: Sequence) -> None:
+        """Load ``snapshot`` and silently rerun ``commands`` on top of it."""
+        output = self.output
+        self.output = lambda _line: None
+        try:
+            self.load_dict(snapshot)
+            for command in commands:
+                if isinstance(command, list):
+                    verb, noun, prep = command
+                else:
+                    verb, noun, prep = (command.split() + ["", ""])[:3]
+                self.run_command(verb, noun, prep)
+        finally:
+            self.output = output
+
+    def _slot_path(self, slot: str) -> Optional[str]:
+        slot = slot or "default"
+        if not SLOT_RE.fullmatch(slot):
+            return None
+        return os.path.join(self.save_dir, f"{slot}.log")
+
+    def do_save(self, noun="", *_):
+        slot = noun or "default"
+        path = self._slot_path(slot)
+        if path is None:
+            self.output("Slot names use up to 16 letters, digits, - or _.")
+            return
+        written = self.saved.get(slot)
+        try:
+            os.makedirs(self.save_dir, exist_ok=True, mode=0o700)
+            if written is not None and os.path.exists(path):
+                # Same base as last time: append just the new commands.
+                with open(path, "a", encoding="utf-8") as f:
+                    for command in self.journal[written:]:
+                        f.write(json.dumps(command) + "\n")
+            else:
+                fd, tmp_path = tempfile.mkstemp(dir=self.save_dir)
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(json.dumps({"snapshot": self.base}) + "\n")
+                        for command in self.journal:
+                            f.write(json.dumps(command) + "\n")
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+        except OSError:
+            self.output("Unable to save.")
+            return
+        self.saved[slot] = len(self.journal)
+        self.output("Saved." if slot == "default" else f"Saved to {slot}.")
+
+    def do_restore(self, noun="", *_):
+        slot = noun or "default"
+        path = self._slot_path(slot)
+        try:
+            with open(path, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+            snapshot = events[0]["snapshot"]
+            commands = [c for c in events[1:] if isinstance(c, (str, list))]
+            self.replay(snapshot, commands)
+        except Exception:
+            self.output("Unable to load; start new game?")
+            return
+        if self.base is snapshot:
+            self.saved[slot] = len(self.journal)
+        self.output("Restored.")
+
+    def do_saves(self, *_):
+        try:
+            slots = sorted(n[:-4] for n in os.listdir(self.save_dir) if n.endswith(".log"))
+        except OSError:
+            slots = []
+        self.output("Saves: " + ", ".join(slots) if slots else "No saves.")
 
     def do_use(self, noun, prep, *_):
         action = self.use_actions.get((noun, prep))
         if action:
-            action()
+            action(self)
         else:
-            print("Nothing happens.")
+            self.output("Nothing happens.")
 
     def _use_lamp(self):
         self.required_items["lamp"] = True
-        print("The lamp is now lit.")
+        self.output("The lamp is now lit.")
 
     def _use_scroll(self):
-        print("The scroll reveals a secret: score +5!")
+        self.output("The scroll reveals a secret: score +5!")
         self.score += 5
 
     def unlock_door(self):
-        if not self.locked_doors.get(10, {}).get("east"):
-            print("The door is already unlocked.")
+        """Unlock a locked exit of the current room."""
+        doors = self.locked_doors.get(self.player_room)
+        if not doors:
+            self.output("There is nothing to unlock here.")
+            return
+        direction = next((d for d, shut in doors.items() if shut), None)
+        if direction is None:
+            self.output("The door is already unlocked.")
             return
-        self.locked_doors[10]["east"] = False
-        print("The door unlocks.")
+        doors[direction] = False
+        self.output("The door unlocks.")
         self.score += 5
 
-    def do_move(self, direction):
+    def do_move(self, direction, describe: bool = True):
         room = self.current_room()
-        if direction not in room.exits:
-            print("You can't go that way.")
+        new_room = room.exit_table[DIRECTION_INDEX[direction]]
+        if new_room is None:
+            self.output("You can't go that way.")
             return
-        if self.locked_doors.get(room.id, {}).get(direction):
-            print("The way is locked.")
+        doors = self.locked_doors.get(room.id)
+        if doors and doors.get(direction):
+            self.output("The way is locked.")
             return
-        new_room = room.exits[direction]
         self.player_room = new_room
-        if self.inventory and random.random() < 0.1 and not self.thief_has_item:
-            stolen = random.choice(self.inventory)
+        if self.inventory and self.rng.random() < 0.1 and not self.thief_has_item:
+            stolen = self.rng.choice(self.inventory)
             self.inventory.remove(stolen)
-            self.rooms[self.thief_room].items.append(stolen)
+            self._room_items(self.thief_room)[stolen.name] = stolen
             self.thief_has_item = stolen.name
-            print(f"A thief snatches your {stolen.name} and runs away!")
+            self.output(f"A thief snatches your {stolen.name} and runs away!")
         room = self.current_room()
         if room.id == self.thief_room and self.thief_has_item:
-            item = next(i for i in room.items if i.name == self.thief_has_item)
-            room.items.remove(item)
+            item = self._room_items(room.id).pop(self.thief_has_item)
             self.inventory.append(item)
-            print(f"You reclaim your {item.name} from the thief.")
+            self.output(f"You reclaim your {item.name} from the thief.")
             self.thief_has_item = None
-        if not room.state.get("lit") and not self.required_items["lamp"]:
-            print("It is pitch dark.")
+        if describe:
+            self.arrive()
+
+    def arrive(self) -> None:
+        """Describe the current room after moving, unless it is too dark."""
+        if not self.state_of(self.player_room).get("lit") and not self.required_items["lamp"]:
+            self.output("It is pitch dark.")
         else:
-            self.do_look()
+            self.describe()
+
+    def closed_doors(self) -> FrozenSet[Tuple[int, str]]:
+        """``(room, direction)`` of every exit that is still locked."""
+        return frozenset(
+            (rid, d) for rid, doors in self.locked_doors.items() for d, shut in doors.items() if shut
+        )
+
+    def locate(self, name: str) -> Optional[int]:
+        """Room holding item ``name``, or ``None`` if it is carried or gone."""
+        for rid, items in self.room_items.items():
+            if name in items:
+                return rid
+        for room in self.rooms.values():
+            if room.id not in self.room_items and name in room.item_map:
+                return room.id
+        return None
+
+    def do_go(self, noun, *_):
+        """Walk to a room already visited by the shortest unlocked path."""
+        direction = Parser.directions.get(noun, noun)
+        if direction in DIRECTION_INDEX:
+            self.do_move(direction)
+            return
+        if not noun:
+            self.output("Go where?")
+            return
+        room = self.world.find_room(noun, self.visited | {self.player_room, self.world.start})
+        if room is None:
+            self.output("You don't know the way there.")
+            return
+        steps = self.world.routes(self.closed_doors()).path(self.player_room, room.id, self.rooms)
+        if steps is None:
+            self.output("The way there is locked.")
+            return
+        for step in steps:
+            self.do_move(step, describe=False)
+        self.arrive()
+
+    def do_hint(self, *_):
+        """Point the player at the next objective and the way to it."""
+        here = self.player_room
+        routes = self.world.routes(self.closed_doors())
+        held = {i.name for i in self.inventory}
+
+        def towards(goal: str, dst: Optional[int]) -> None:
+            if dst is None:
+                self.output(goal + ".")
+                return
+            room = self.rooms[dst]
+            if dst == here:
+                self.output(f"{goal} here in Room {dst} ({room.name}).")
+                return
+            distance = routes.distance[here].get(dst)
+            if distance is None:
+                self.output(f"{goal} in Room {dst} ({room.name}), but the way is locked.")
+                return
+            moves = "move" if distance == 1 else "moves"
+            self.output(
+                f"{goal} in Room {dst} ({room.name}): {distance} {moves}, "
+                f"head {routes.next_hop[here][dst]}"
+            )
+
+        if self.thief_has_item:
+            towards(f"Catch the thief with your {self.thief_has_item}", self.thief_room)
+            return
+        if not self.required_items["lamp"]:
+            if "lamp" in held:
+                self.output("Light your lamp: use lamp")
+                return
+            if self.locate("lamp") is not None:
+                towards("Get the lamp", self.locate("lamp"))
+                return
+        closed = sorted(self.closed_doors())
+        if closed:
+            tool = next((t for t in ("key", "lockpick") if t in held), None)
+            if tool:
+                towards(f"Unlock the door with: use {tool} door", closed[0][0])
+                return
+            tools = [(t, self.locate(t)) for t in ("key", "lockpick")]
+            reachable = [
+                (routes.distance[here][rid], t, rid)
+                for t, rid in tools
+                if rid is not None and rid in routes.distance[here]
+            ]
+            if reachable:
+                _, tool, rid = min(reachable)
+                towards(f"Get the {tool}", rid)
+                return
+        if "treasure" not in held and self.locate("treasure") is not None:
+            towards("Get the treasure", self.locate("treasure"))
+            return
+        unvisited = [
+            (distance, rid)
+            for rid, distance in routes.distance[here].items()
+            if rid not in self.visited and rid != here
+        ]
+        if unvisited:
+            towards("Explore", min(unvisited)[1])
+            return
+        self.output("Nothing left to find. Check your score.")
 
     def do_verbose(self, *_):
         self.verbose = not self.verbose
-        print("Verbose" if self.verbose else "Brief")
+        self.output("Verbose" if self.verbose else "Brief")
+
+    def do_terse(self, *_):
+        self.terse = not self.terse
+        self.output("Terse" if self.terse else "Full")
 
     def unknown(self, verb, *_):
-        print(f"I don't know the word '{verb}'; try LOOK or EXAMINE")
+        self.output(f"I don't know the word '{verb}'; try LOOK or EXAMINE")
 
     def run_command(self, verb, noun, prep):
+        if verb in self.meta_verbs:
+            self.verbs[verb](self, noun, prep)
+            return
         self.move_count += 1
-        if verb in ("north", "south", "east", "west", "up", "down"):
+        score = self.score
+        if verb in DIRECTION_INDEX:
             self.do_move(verb)
-            return
-        func = getattr(self, f"do_{verb}", None)
-        if func:
-            func(noun, prep)
         else:
-            self.unknown(verb)
+            func = self.verbs.get(verb)
+            if func:
+                func(self, noun, prep)
+            else:
+                self.unknown(verb)
+        if self.terse and self.score != score:
+            self.output(f"Score {self.score - score:+d} ({self.score})")
+        if " " in noun or " " in prep:
+            self.journal.append([verb, noun, prep])
+        else:
+            self.journal.append(" ".join(w for w in (verb, noun, prep) if w))
+        if len(self.journal) >= SNAPSHOT_EVERY:
+            self.base, self.journal, self.saved = self.to_dict(), [], {}
 
     def loop(self):
         self.do_look()
@@ -257,5 +629,14 @@ class Game:
                 self.run_command(verb, noun, prep)
 
 
+def _verb_table(cls) -> Dict[str, Callable]:
+    """Map each ``do_<verb>`` method of ``cls`` to its verb."""
+    return {name[3:]: getattr(cls, name) for name in dir(cls) if name.startswith("do_")}
+
+
+Game.verbs = _verb_table(Game)
+Game.use_actions = {key: getattr(Game, name) for key, name in Game.use_actions.items()}
+
+
 if __name__ == "__main__":
     Game().loop()
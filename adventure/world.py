@@ -0,0 +1,276 @@
+"""Compile ``world.json`` into a validated, indexed, shared :class:`World`.
+
+Run ``python -m adventure.world [path]`` to check a custom world file.
+"""
+
+import json
+import os
+import sys
+import threading
+from types import MappingProxyType
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_WORLD = os.path.join(os.path.dirname(__file__), "world.json")
+DIRECTIONS = ("north", "south", "east", "west", "up", "down")
+DIRECTION_INDEX = MappingProxyType({d: i for i, d in enumerate(DIRECTIONS)})
+ITEM_FIELDS = frozenset({"id", "name", "weight", "desc", "can_carry"})
+
+
+class WorldError(ValueError):
+    """Raised when a world file is inconsistent."""
+
+
+class Item:
+    __slots__ = ("id", "name", "weight", "desc", "can_carry")
+
+    def __init__(self, name: str, weight: int, desc: str, can_carry: bool=True, id: int = 0):
+        self.id = id
+        self.name = name
+        self.weight = weight
+        self.desc = desc
+        self.can_carry = can_carry
+
+    def __repr__(self):
+        return self.name
+
+
+class Room:
+    """Read-only room template; per-game changes live in the :class:`Game`.
+
+    ``exit_table`` holds the destination for each of :data:`DIRECTIONS` by
+    index (``None`` where there is no exit) and ``item_map`` indexes the
+    starting items by name.
+    """
+
+    __slots__ = ("id", "name", "desc", "exits", "exit_table", "item_names", "state", "items", "item_map")
+
+    def __init__(self, data: Dict, items: Mapping[str, Item]):
+        self.id = data["id"]
+        self.name = data["name"]
+        self.desc = data["desc"]
+        self.exits: Mapping[str, int] = MappingProxyType(dict(data["exits"]))
+        self.exit_table: Tuple[Optional[int], ...] = tuple(self.exits.get(d) for d in DIRECTIONS)
+        self.item_names = tuple(data.get("items", []))
+        self.state: Mapping = MappingProxyType(dict(data.get("state", {"lit": True, "locked": False})))
+        self.items: Tuple[Item, ...] = tuple(items[name] for name in self.item_names)
+        self.item_map: Mapping[str, Item] = MappingProxyType({i.name: i for i in self.items})
+
+
+def validate(data: Dict) -> List[str]:
+    """Return every problem found in parsed world ``data``."""
+    errors: List[str] = []
+    if not isinstance(data, dict):
+        return ["world must be a JSON object"]
+    items = data.get("items")
+    rooms = data.get("rooms")
+    if not isinstance(items, dict):
+        errors.append("'items' must be an object")
+        items = {}
+    if not isinstance(rooms, list) or not rooms:
+        errors.append("'rooms' must be a non-empty list")
+        rooms = []
+    for key, item in items.items():
+        if not isinstance(item, dict) or item.get("name") != key:
+            errors.append(f"item {key!r} must be an object whose name is {key!r}")
+        else:
+            if not isinstance(item.get("weight"), int) or item["weight"] < 0:
+                errors.append(f"item {key!r} needs a non-negative integer weight")
+            if not isinstance(item.get("desc"), str):
+                errors.append(f"item {key!r} needs a desc")
+            if not isinstance(item.get("can_carry", True), bool):
+                errors.append(f"item {key!r} can_carry must be true or false")
+            for field in sorted(set(item) - ITEM_FIELDS):
+                errors.append(f"item {key!r} has unknown field {field!r}")
+    ids = set()
+    placed: Dict[str, int] = {}
+    for room in rooms:
+        rid = room.get("id") if isinstance(room, dict) else None
+        if not isinstance(rid, int):
+            errors.append(f"room {room!r} needs an integer id")
+            continue
+        if rid in ids:
+            errors.append(f"duplicate room id {rid}")
+        ids.add(rid)
+        for field in ("name", "desc"):
+            if not isinstance(room.get(field), str):
+                errors.append(f"room {rid} needs a {field}")
+        names = room.get("items", [])
+        if not isinstance(names, list):
+            errors.append(f"room {rid} items must be a list")
+            names = []
+        if not isinstance(room.get("state", {}), dict):
+            errors.append(f"room {rid} state must be an object")
+        for name in names:
+            if not isinstance(name, str) or name not in items:
+                errors.append(f"room {rid} has unknown item {name!r}")
+            elif name in placed:
+                errors.append(f"item {name!r} is in rooms {placed[name]} and {rid}")
+            placed[name] = rid
+    for room in rooms:
+        if not isinstance(room, dict) or not isinstance(room.get("id"), int):
+            continue
+        exits = room.get("exits")
+        if not isinstance(exits, dict):
+            errors.append(f"room {room['id']} needs an exits object")
+            continue
+        for direction, dest in exits.items():
+            if direction not in DIRECTION_INDEX:
+                errors.append(f"room {room['id']} has unknown direction {direction!r}")
+            if not isinstance(dest, int) or dest not in ids:
+                errors.append(f"room {room['id']} exit {direction} leads to missing room {dest!r}")
+    for key in ("start", "thief_room"):
+        if key in data and (not isinstance(data[key], int) or data[key] not in ids):
+            errors.append(f"{key} {data[key]!r} is not a room")
+    by_id = {r["id"]: r for r in rooms if isinstance(r, dict) and isinstance(r.get("id"), int)}
+    locks = data.get("locks", {})
+    if not isinstance(locks, dict):
+        errors.append("'locks' must map room ids to lists of exits")
+        locks = {}
+    for rid, directions in locks.items():
+        room = by_id.get(int(rid)) if str(rid).isdigit() else None
+        if room is None:
+            errors.append(f"lock on missing room {rid!r}")
+            continue
+        if not isinstance(directions, list):
+            errors.append(f"locks of room {rid} must be a list of exits")
+            continue
+        exits = room.get("exits")
+        for direction in directions:
+            if not isinstance(direction, str) or not isinstance(exits, dict) or direction not in exits:
+                errors.append(f"lock on missing exit {direction!r} of room {rid}")
+    return errors
+
+
+class Routes:
+    """All-pairs shortest paths over a world's exits.
+
+    ``next_hop[src][dst]`` is the direction of the first step from ``src``
+    towards ``dst`` and ``distance[src][dst]`` the number of moves; rooms
+    that cannot be reached are absent. Exits in ``closed`` (``(room, dir)``
+    pairs) are treated as missing.
+    """
+
+    __slots__ = ("next_hop", "distance")
+
+    def __init__(self, rooms: Mapping[int, Room], closed: FrozenSet[Tuple[int, str]] = frozenset()):
+        self.next_hop: Dict[int, Dict[int, str]] = {}
+        self.distance: Dict[int, Dict[int, int]] = {}
+        for src in rooms:
+            first: Dict[int, str] = {}
+            dist = {src: 0}
+            queue = deque([src])
+            while queue:
+                here = queue.popleft()
+                for direction, there in rooms[here].exits.items():
+                    if there in dist or (here, direction) in closed:
+                        continue
+                    dist[there] = dist[here] + 1
+                    first[there] = direction if here == src else first[here]
+                    queue.append(there)
+            self.next_hop[src] = first
+            self.distance[src] = dist
+
+    def path(self, src: int, dst: int, rooms: Mapping[int, Room]) -> Optional[List[str]]:
+        """Directions leading from ``src`` to ``dst``, or ``None`` if unreachable."""
+        if dst not in self.distance[src]:
+            return None
+        steps = []
+        while src != dst:
+            direction = self.next_hop[src][dst]
+            steps.append(direction)
+            src = rooms[src].exits[direction]
+        return steps
+
+
+class World:
+    """A compiled ``world.json``, shared by every game that uses it.
+
+    :meth:`load` validates and indexes a file once and returns the cached
+    result until the file's modification time or size changes. Route tables
+    are computed once per set of closed doors and shared as well.
+    """
+
+    __slots__ = ("path", "items", "rooms", "start", "thief_room", "locks", "_routes", "_routes_lock")
+
+    _cache: Dict[str, Tuple[int, int, "World"]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, data: Dict, path: Optional[str] = None):
+        errors = validate(data)
+        if errors:
+            raise WorldError(f"{path or 'world'}: " + "; ".join(errors))
+        self.path = path
+        items = {
+            key: Item(id=n, **{k: v for k, v in val.items() if k != "id"})
+            for n, (key, val) in enumerate(data["items"].items())
+        }
+        self.items: Mapping[str, Item] = MappingProxyType(items)
+        self.rooms: Mapping[int, Room] = MappingProxyType(
+            {rdata["id"]: Room(rdata, items) for rdata in data["rooms"]}
+        )
+        self.start: int = data.get("start", 1 if 1 in self.rooms else data["rooms"][0]["id"])
+        self.thief_room: int = data.get("thief_room", 30 if 30 in self.rooms else self.start)
+        self.locks: Mapping[int, Tuple[str, ...]] = MappingProxyType(
+            {int(rid): tuple(dirs) for rid, dirs in data.get("locks", {}).items()}
+        )
+        self._routes: Dict[FrozenSet[Tuple[int, str]], Routes] = {}
+        self._routes_lock = threading.Lock()
+
+    def routes(self, closed: FrozenSet[Tuple[int, str]] = frozenset()) -> Routes:
+        """Shortest paths with the exits in ``closed`` locked."""
+        routes = self._routes.get(closed)
+        if routes is None:
+            with self._routes_lock:
+                routes = self._routes.get(closed)
+                if routes is None:
+                    routes = self._routes[closed] = Routes(self.rooms, closed)
+        return routes
+
+    def find_room(self, name: str, among: Optional[Iterable[int]] = None) -> Optional[Room]:
+        """The one room (of ``among``, default all) matching a number or name.
+
+        Exact names win over prefixes, which win over substrings.
+        """
+        name = name.strip().lower()
+        rooms = list(self.rooms.values()) if among is None else [self.rooms[i] for i in among]
+        if name.isdigit():
+            return next((r for r in rooms if r.id == int(name)), None)
+        for match in (
+            lambda r: r.name.lower() == name,
+            lambda r: r.name.lower().startswith(name),
+            lambda r: name in r.name.lower(),
+        ):
+            found = [r for r in rooms if match(r)]
+            if found:
+                return found[0] if len(found) == 1 else None
+        return None
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "World":
+        """Return the compiled world at ``path``, recompiling it if it changed."""
+        path = os.path.abspath(path or DEFAULT_WORLD)
+        st = os.stat(path)
+        with cls._lock:
+            cached = cls._cache.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                return cached[2]
+            with open(path) as f:
+                world = cls(json.load(f), path)
+            cls._cache[path] = (st.st_mtime_ns, st.st_size, world)
+            return world
+
+
+def main(argv: List[str]) -> int:
+    path = argv[1] if len(argv) > 1 else DEFAULT_WORLD
+    try:
+        world = World.load(path)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    print(f"{path}: {len(world.rooms)} rooms, {len(world.items)} items OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
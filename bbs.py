@@ -1,9 +1,18 @@
+import atexit
+import bisect
+import gzip
 import json
 import logging
 import os
+import re
 import tempfile
 import threading
-from typing import Dict, List
+import time
+from collections import OrderedDict
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from utils.text import MAX_TEXT_LEN, safe_text
 
@@ -16,40 +25,128 @@ except OSError:
     pass
 
 def _board_path(target: int) -> str:
+    return os.path.join(BBS_DIR, f"{target}.jsonl")
+
+
+def _index_path(target: int) -> str:
+    return os.path.join(BBS_DIR, f"{target}.idx.jsonl")
+
+
+def _legacy_board_path(target: int) -> str:
     return os.path.join(BBS_DIR, f"{target}.json")
 
 
-def _load_board(target: int) -> List[str]:
-    path = _board_path(target)
+def _migrate_board(target: int) -> List[dict]:
+    """Convert a legacy whole-file JSON board into an append-only log."""
+    legacy = _legacy_board_path(target)
     try:
-        with open(path, "r", encoding="utf-8") as f:
+        with open(legacy, "r", encoding="utf-8") as f:
             data = json.load(f)
-            if isinstance(data, list):
-                return [str(x) for x in data]
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
-        pass
-    return []
+    except FileNotFoundError:
+        return []
+    except (json.JSONDecodeError, OSError) as e:
+        logger.error("Failed to read legacy board %s: %s", legacy, e)
+        return []
+    board = [{"n": n, "text": str(x)} for n, x in enumerate(data, 1)] if isinstance(data, list) else []
+    if _save_board(target, board):
+        try:
+            os.unlink(legacy)
+        except OSError as e:
+            logger.error("Failed to remove migrated board %s: %s", legacy, e)
+        logger.info("Migrated board %s to append-only log", target)
+    return board
+
+
+def _load_board(target: int) -> List[str]:
+    board = Board.load(target)
+    return board.read(board.base + 1, board.last)
 
 
-def _save_board(target: int, board: List[str]) -> None:
+def _encode_post(entry) -> bytes:
+    return (json.dumps(entry) + "\n").encode("utf-8")
+
+
+def _as_record(entry, number: int) -> dict:
+    """Normalise a stored post; older logs hold plain ``"user: text"`` strings."""
+    if isinstance(entry, dict):
+        return entry
+    return {"n": number, "text": str(entry)}
+
+
+def _format_post(record: dict) -> str:
+    user = record.get("user")
+    text = record.get("text", "")
+    return f"{user}: {text}" if user is not None else text
+
+
+def _read_records(path: str) -> List[dict]:
+    """Read every post record in a board log (used off the request path)."""
+    records: List[dict] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            number = records[-1].get("n", len(records)) + 1 if records else 1
+            records.append(_as_record(entry, number))
+    return records
+
+
+def _write_appending(path: str, data: bytes, kind: str = "board") -> bool:
+    """Durably append ``data`` to ``path``, creating it with mode 0600."""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    except OSError as e:
+        logger.error("Failed to open %s %s: %s", kind, path, e)
+        return False
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    except OSError as e:
+        logger.error("Failed to append to %s %s: %s", kind, path, e)
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _append_lines(target: int, data: bytes) -> int:
+    """Durably append encoded posts to the board log without rewriting it.
+
+    Returns the number of bytes written, or ``0`` on failure.
+    """
+    return len(data) if _write_appending(_board_path(target), data) else 0
+
+
+def _append_post(target: int, entry: str) -> int:
+    return _append_lines(target, _encode_post(entry))
+
+
+def _save_board(target: int, board: List) -> bool:
+    """Atomically rewrite a board log; used for migration and compaction."""
     path = _board_path(target)
     fd, tmp_path = tempfile.mkstemp(dir=BBS_DIR)
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
             try:
-                json.dump(board, f)
+                for entry in board:
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
             except OSError as e:
                 logger.error("Failed to write board %s: %s", tmp_path, e)
-                return
+                return False
         try:
             os.replace(tmp_path, path)
         except OSError as e:
             logger.error("Failed to replace %s with %s: %s", path, tmp_path, e)
-            return
+            return False
         try:
             os.chmod(path, 0o600)
         except OSError as e:
             logger.error("Failed to chmod %s: %s", path, e)
+        return True
     finally:
         try:
             os.unlink(tmp_path)
@@ -59,9 +156,698 @@ def _save_board(target: int, board: List[str]) -> None:
             logger.error("Failed to remove temp file %s: %s", tmp_path, e)
 
 
-bbs_posts: Dict[int, List[str]] = {}
+class Board:
+    """Byte-offset index over a board log with write-behind appends.
+
+    Only the offset of each post on disk is kept in memory; post text is read
+    when a page or range is requested, so a command never has to load the
+    whole board. New posts wait in ``pending`` until :meth:`flush` appends
+    them in one write. Posts keep their numbers when retention drops older
+    ones: the retained posts are ``base + 1`` through ``last``. Get boards
+    from :meth:`BoardCache.use`, which holds ``lock`` and keeps the board
+    cached while it is in use.
+    """
+
+    def __init__(self, target: int):
+        self.target = target
+        self.path = _board_path(target)
+        self.lock = threading.RLock()
+        self.base = 0
+        self.offsets: List[int] = []
+        self.end = 0
+        self.pending: List[dict] = []
+        self.pending_bytes = 0
+        self.loaded = False
+        self.index: Optional[SearchIndex] = None
+        # Callers inside BoardCache.use(); a board in use is never evicted.
+        self.users = 0
+
+    @classmethod
+    def load(cls, target: int) -> "Board":
+        board = cls(target)
+        board.ensure_loaded()
+        return board
+
+    def ensure_loaded(self) -> None:
+        if self.loaded:
+            return
+        if not os.path.exists(self.path):
+            _migrate_board(self.target)
+        base = 0
+        offsets: List[int] = []
+        end = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # A torn final line from an interrupted append.
+                        logger.warning("Dropping corrupt tail of board %s", self.target)
+                        os.truncate(self.path, end)
+                        break
+                    if not offsets:
+                        try:
+                            first = json.loads(line)
+                        except ValueError:
+                            first = None
+                        if isinstance(first, dict):
+                            base = int(first.get("n", 1)) - 1
+                    offsets.append(end)
+                    end += len(line)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Failed to read board %s: %s", self.path, e)
+        self.base, self.offsets, self.end, self.loaded = base, offsets, end, True
+
+    def unload(self) -> None:
+        """Forget the in-memory index so the next use rereads the log."""
+        self.offsets, self.end, self.base = [], 0, 0
+        self.index = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self.offsets) + len(self.pending)
+
+    @property
+    def last(self) -> int:
+        """Number of the newest post (``base`` if the board is empty)."""
+        return self.base + len(self)
+
+    def size(self) -> int:
+        """Approximate memory held by this board, in bytes."""
+        size = 200 + 8 * len(self.offsets) + self.pending_bytes
+        if self.index is not None:
+            size += self.index.size()
+        return size
+
+    def read(self, first: int, last: int) -> List[str]:
+        """Return posts numbered ``first`` through ``last`` (inclusive)."""
+        first = max(first, self.base + 1) - self.base
+        last = min(last, self.last) - self.base
+        if first > last:
+            return []
+        posts: List[str] = []
+        on_disk = len(self.offsets)
+        if first <= on_disk:
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(self.offsets[first - 1])
+                    for i in range(first, min(last, on_disk) + 1):
+                        try:
+                            record = _as_record(json.loads(f.readline()), self.base + i)
+                            posts.append(_format_post(record))
+                        except ValueError:
+                            posts.append("[unreadable post]")
+            except OSError as e:
+                logger.error("Failed to read board %s: %s", self.path, e)
+        if last > on_disk:
+            pending = self.pending[max(first, on_disk + 1) - on_disk - 1 : last - on_disk]
+            posts.extend(_format_post(r) for r in pending)
+        return posts
+
+    def get(self, n: int) -> Optional[str]:
+        posts = self.read(n, n)
+        return posts[0] if posts else None
+
+    def append(
+        self,
+        text: str,
+        user: Optional[int] = None,
+        ts: Optional[int] = None,
+        post_id: Optional[str] = None,
+    ) -> int:
+        """Queue a new post for the next flush and return its number.
+
+        ``post_id`` is only set for posts replicated from another node; local
+        posts are identified by their number (see :mod:`bbs_sync`).
+        """
+        number = self.last + 1
+        record = {"n": number, "ts": int(time.time()) if ts is None else ts, "user": user, "text": text}
+        if post_id is not None:
+            record["id"] = post_id
+        self.pending.append(record)
+        self.pending_bytes += len(text)
+        if self.index is not None:
+            # Persisted by flush() once the post itself is on disk.
+            self.index.add(number, _format_post(record), persist=False)
+        _flusher.schedule(self)
+        return number
+
+    def flush(self) -> bool:
+        """Append pending posts to disk; return ``False`` if the write failed.
+
+        Search index lines for the posts are written after the posts, so the
+        index never refers to a post that is not on disk.
+        """
+        if not self.pending:
+            return True
+        lines = [_encode_post(record) for record in self.pending]
+        if not _append_lines(self.target, b"".join(lines)):
+            return False
+        for line in lines:
+            self.offsets.append(self.end)
+            self.end += len(line)
+        if self.index is not None or os.path.exists(_index_path(self.target)):
+            _append_index(
+                self.target, [(r["n"], _tokens(_format_post(r))) for r in self.pending]
+            )
+        self.pending, self.pending_bytes = [], 0
+        return True
+
+    def search_index(self) -> "SearchIndex":
+        if self.index is None:
+            self.index = SearchIndex.load(self)
+        return self.index
+
+
+class _Flusher:
+    """Background writer that flushes each dirty board within ``delay`` seconds.
+
+    Boards are tracked by object rather than by number, so a board that was
+    dropped from the cache and loaded again is still flushed.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._due: Dict[Board, float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, board: Board) -> None:
+        with self._cond:
+            if board not in self._due:
+                self._due[board] = time.monotonic() + self.delay
+                self._cond.notify()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="bbs-flush", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due:
+                    self._cond.wait()
+                now = time.monotonic()
+                boards = [board for board, due in self._due.items() if due <= now]
+                if not boards:
+                    self._cond.wait(min(self._due.values()) - now)
+                    continue
+                for board in boards:
+                    del self._due[board]
+            for board in boards:
+                with board.lock:
+                    ok = board.flush()
+                if not ok:
+                    self.schedule(board)
+
+    def flush_all(self) -> None:
+        with self._cond:
+            boards = list(self._due)
+            self._due.clear()
+        for board in boards:
+            with board.lock:
+                ok = board.flush()
+            if not ok:
+                self.schedule(board)
+
+
+BBS_FLUSH_DELAY = 2.0
+_flusher = _Flusher(BBS_FLUSH_DELAY)
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> Set[str]:
+    return {t.casefold() for t in _TOKEN_RE.findall(text)}
+
+
+def _append_index(target: int, entries: Iterable[Tuple[int, Iterable[str]]]) -> None:
+    path = _index_path(target)
+    data = b"".join(
+        (json.dumps([number, sorted(tokens)]) + "\n").encode("utf-8") for number, tokens in entries
+    )
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.error("Failed to update search index %s: %s", path, e)
+
+
+class SearchIndex:
+    """Inverted index from case-folded tokens to post numbers.
+
+    Persisted next to the board as an append-only log of ``[post, tokens]``
+    lines. Loading replays that log and indexes any posts it is missing, so a
+    deleted or stale index file is rebuilt on the next search.
+    """
+
+    def __init__(self, target: int, base: int = 0):
+        self.target = target
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.base = base
+        self.last = base
+        self.entries = 0
+        self._terms: Optional[List[str]] = None
+
+    @classmethod
+    def load(cls, board: Board) -> "SearchIndex":
+        index = cls(board.target, board.base)
+        path = _index_path(board.target)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        number, tokens = json.loads(line)
+                    except ValueError:
+                        break
+                    if number != index.last + 1 or number > board.last:
+                        break
+                    index._add_tokens(number, tokens)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Failed to read search index %s: %s", path, e)
+        if index.last < board.last:
+            if index.last == index.base:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            else:
+                _save_index(index)
+            posts = board.read(index.last + 1, board.last)
+            on_disk = board.base + len(board.offsets)
+            for number, post in enumerate(posts, index.last + 1):
+                index.add(number, post, persist=number <= on_disk)
+        return index
+
+    def _add_tokens(self, number: int, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            self.postings[token].append(number)
+            self.entries += 1
+        self.last = number
+        self._terms = None
 
+    def size(self) -> int:
+        """Approximate memory held by the index, in bytes."""
+        return 80 * len(self.postings) + 8 * self.entries
+
+    def add(self, number: int, text: str, persist: bool = True) -> None:
+        tokens = _tokens(text)
+        self._add_tokens(number, tokens)
+        if persist:
+            _append_index(self.target, [(number, tokens)])
+
+    def _lookup(self, term: str) -> Set[int]:
+        if not term.endswith("*"):
+            return set(self.postings.get(term, ()))
+        prefix = term[:-1]
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        found: Set[int] = set()
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            found.update(self.postings[self._terms[i]])
+            i += 1
+        return found
+
+    def search(self, query: str) -> List[int]:
+        """Post numbers matching any term, best matches and newest first.
+
+        A term ending in ``*`` matches every token with that prefix.
+        """
+        terms: Set[str] = set()
+        for raw in query.split():
+            words = _TOKEN_RE.findall(raw.casefold())
+            if words and raw.endswith("*"):
+                words[-1] += "*"
+            terms.update(words)
+        scores: Dict[int, int] = defaultdict(int)
+        for term in terms:
+            for number in self._lookup(term):
+                scores[number] += 1
+        return sorted(scores, key=lambda n: (-scores[n], -n))
+
+
+def _save_index(index: SearchIndex) -> None:
+    """Rewrite the index log from memory, dropping entries past ``last``."""
+    by_post: Dict[int, List[str]] = defaultdict(list)
+    for token, numbers in index.postings.items():
+        for number in numbers:
+            by_post[number].append(token)
+    path = _index_path(index.target)
+    fd, tmp_path = tempfile.mkstemp(dir=BBS_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for number in range(index.base + 1, index.last + 1):
+                f.write(json.dumps([number, sorted(by_post.get(number, []))]) + "\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error("Failed to write search index %s: %s", path, e)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+# Replies to list and search are sized to fit in a single radio packet.
+PAGE_BYTES = 170
+PAGE_MAX_POSTS = 10
+PREVIEW_CHARS = 40
+MAX_READ_RANGE = 10
+
+
+def _preview(post: str, limit: int = PREVIEW_CHARS) -> str:
+    text = " ".join(post.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _list_posts(board: Board, cursor: Optional[int]) -> str:
+    """Newest-first page of previews starting at post ``cursor``.
+
+    The page is cut so header, previews and the ``More:`` footer fit in
+    ``PAGE_BYTES``; the footer names the cursor for the next page.
+    """
+    if not len(board):
+        return "No posts."
+    start = min(cursor or board.last, board.last)
+    if start <= board.base:
+        return "No such post."
+    first = max(board.base + 1, start - PAGE_MAX_POSTS + 1)
+    lines = [f"Posts ({len(board)}):"]
+    used = len(lines[0].encode("utf-8"))
+    n = start
+    for post in reversed(board.read(first, start)):
+        line = f"{n}. {_preview(post)}"
+        size = len(line.encode("utf-8")) + 1
+        footer = len(f"\nMore: bbs list {n - 1}") if n - 1 > board.base else 0
+        if len(lines) > 1 and used + size + footer > PAGE_BYTES:
+            break
+        lines.append(line)
+        used += size
+        n -= 1
+    if n > board.base:
+        lines.append(f"More: bbs list {n}")
+    return "\n".join(lines)
+
+
+def _search_posts(board: Board, query: str) -> str:
+    """One packet of ranked search results; ``/N`` starts at result N."""
+    query, slash, start_s = query.rpartition(" /")
+    if not slash or not start_s.isdigit():
+        query, start_s = query + slash + start_s, "1"
+    query = query.strip()
+    if not query:
+        return "Usage: bbs search <terms> [/n]"
+    results = board.search_index().search(query)
+    if not results:
+        return "No matches."
+    start = max(int(start_s), 1)
+    if start > len(results):
+        return "No more matches."
+    lines = [f"Matches ({len(results)}):"]
+    used = len(lines[0].encode("utf-8"))
+    rank = start
+    for number in results[start - 1 : start - 1 + PAGE_MAX_POSTS]:
+        line = f"#{number} {_preview(board.get(number) or '')}"
+        size = len(line.encode("utf-8")) + 1
+        footer = len(f"\nMore: bbs search {query} /{rank + 1}".encode("utf-8"))
+        if rank == len(results):
+            footer = 0
+        if len(lines) > 1 and used + size + footer > PAGE_BYTES:
+            break
+        lines.append(line)
+        used += size
+        rank += 1
+    if rank <= len(results):
+        lines.append(f"More: bbs search {query} /{rank}")
+    return "\n".join(lines)
+
+
+def _read_posts(board: Board, spec: str) -> str:
+    first_s, dash, last_s = spec.partition("-")
+    if not first_s.isdigit() or (dash and not last_s.isdigit()):
+        return "Usage: bbs read <n> or bbs read <n>-<m>"
+    first = int(first_s)
+    last = int(last_s) if dash else first
+    if first <= board.base or first > board.last or last < first:
+        return "No such post."
+    if not dash:
+        return board.get(first) or "No such post."
+    last = min(last, board.last, first + MAX_READ_RANGE - 1)
+    posts = board.read(first, last)
+    return "\n".join(f"#{n} {p}" for n, p in zip(range(first, last + 1), posts))
+
+
+class BoardCache:
+    """LRU cache of loaded boards bounded by their approximate memory use.
+
+    ``bbs_lock`` only guards the mapping itself; each board has its own lock
+    so commands on different boards run in parallel. Boards in use or with
+    unflushed posts are never evicted, so there is only ever one
+    :class:`Board` per target.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._boards: "OrderedDict[int, Board]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def __contains__(self, target: object) -> bool:
+        return target in self._boards
+
+    def get(self, target: int) -> Optional[Board]:
+        with bbs_lock:
+            return self._boards.get(target)
+
+    @contextmanager
+    def use(self, target: int) -> Iterator[Board]:
+        """Hold the loaded board for ``target`` (and its lock) for a ``with`` block."""
+        with bbs_lock:
+            board = self._boards.get(target)
+            if board is None:
+                board = self._boards[target] = Board(target)
+            self._boards.move_to_end(target)
+            board.users += 1
+        try:
+            with board.lock:
+                board.ensure_loaded()
+                yield board
+        finally:
+            with bbs_lock:
+                board.users -= 1
+            self._evict(keep=target)
+
+    def size(self) -> int:
+        with bbs_lock:
+            return sum(b.size() for b in self._boards.values())
+
+    def _evict(self, keep: int) -> None:
+        with bbs_lock:
+            total = sum(b.size() for b in self._boards.values())
+            for target in list(self._boards):
+                if total <= self.max_bytes:
+                    break
+                board = self._boards[target]
+                if target == keep or board.users or board.pending:
+                    continue
+                total -= board.size()
+                del self._boards[target]
+
+    def clear(self) -> None:
+        """Flush pending posts and drop every cached board."""
+        _flusher.flush_all()
+        with bbs_lock:
+            self._boards.clear()
+
+
+def flush_boards() -> None:
+    """Write all pending posts to disk, e.g. before shutting down."""
+    _flusher.flush_all()
+
+
+BBS_CACHE_BYTES = int(os.getenv("MESHTASTIC_BBS_CACHE_BYTES", str(1 << 20)))
 bbs_lock = threading.Lock()
+bbs_posts = BoardCache(BBS_CACHE_BYTES)
+atexit.register(flush_boards)
+
+
+def _env_number(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, value)
+        return None
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits on what a board keeps; ``None`` means unlimited.
+
+    ``max_age`` is in seconds. Posts without a timestamp (written before
+    timestamps were recorded) are never expired by age.
+    """
+
+    max_posts: Optional[int] = None
+    max_age: Optional[float] = None
+    max_bytes: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RetentionPolicy":
+        days = data.get("max_age_days")
+        return cls(
+            max_posts=data.get("max_posts"),
+            max_age=days * 86400 if days is not None else None,
+            max_bytes=data.get("max_bytes"),
+        )
+
+    @property
+    def unlimited(self) -> bool:
+        return self.max_posts is None and self.max_age is None and self.max_bytes is None
+
+    def expired(self, records: List[dict], now: float) -> int:
+        """Number of oldest ``records`` to drop; the newest is always kept."""
+        cut = 0
+        if self.max_posts is not None:
+            cut = max(cut, len(records) - int(self.max_posts))
+        if self.max_age is not None:
+            cutoff = now - self.max_age
+            i = 0
+            while i < len(records) and (records[i].get("ts") or cutoff) < cutoff:
+                i += 1
+            cut = max(cut, i)
+        if self.max_bytes is not None:
+            total = 0
+            i = len(records)
+            while i > 0:
+                total += len(_encode_post(records[i - 1]))
+                if total > self.max_bytes:
+                    break
+                i -= 1
+            cut = max(cut, i)
+        return max(0, min(cut, len(records) - 1))
+
+
+DEFAULT_RETENTION = RetentionPolicy.from_dict(
+    {
+        "max_posts": _env_number("MESHTASTIC_BBS_MAX_POSTS"),
+        "max_age_days": _env_number("MESHTASTIC_BBS_MAX_AGE_DAYS"),
+        "max_bytes": _env_number("MESHTASTIC_BBS_MAX_BYTES"),
+    }
+)
+RETENTION_FILE = os.path.join(BBS_DIR, "retention.json")
+BBS_COMPACT_INTERVAL = 3600
+
+
+def retention_for(target: int) -> RetentionPolicy:
+    """Policy for ``target`` from ``retention.json``, else the env defaults.
+
+    The file maps board numbers (and optionally ``"default"``) to objects
+    with ``max_posts``, ``max_age_days`` and ``max_bytes``.
+    """
+    try:
+        with open(RETENTION_FILE, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+    except FileNotFoundError:
+        return DEFAULT_RETENTION
+    except (OSError, ValueError) as e:
+        logger.error("Failed to read %s: %s", RETENTION_FILE, e)
+        return DEFAULT_RETENTION
+    rule = rules.get(str(target), rules.get("default")) if isinstance(rules, dict) else None
+    return RetentionPolicy.from_dict(rule) if isinstance(rule, dict) else DEFAULT_RETENTION
+
+
+def _archive_path(target: int) -> str:
+    return os.path.join(BBS_DIR, f"{target}.archive.jsonl.gz")
+
+
+def _archive_records(target: int, records: List[dict]) -> bool:
+    """Append expired posts to the board's archive as a new gzip member."""
+    path = _archive_path(target)
+    data = gzip.compress(b"".join(_encode_post(r) for r in records))
+    return _write_appending(path, data, "archive")
+
+
+def read_archive(target: int) -> List[dict]:
+    """Return every archived post for ``target``, oldest first."""
+    try:
+        with gzip.open(_archive_path(target), "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def compact_board(target: int, policy: Optional[RetentionPolicy] = None, now: Optional[float] = None) -> int:
+    """Apply retention to one board; return how many posts were archived.
+
+    Expired posts are appended to the archive before the log is rewritten
+    without them. The search index is discarded and rebuilt on next use.
+    """
+    policy = policy or retention_for(target)
+    if policy.unlimited:
+        return 0
+    with bbs_posts.use(target) as board:
+        if not board.flush():
+            return 0
+        try:
+            records = _read_records(board.path)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.error("Failed to read board %s: %s", board.path, e)
+            return 0
+        drop = policy.expired(records, time.time() if now is None else now)
+        if not drop:
+            return 0
+        if not _archive_records(target, records[:drop]):
+            return 0
+        if not _save_board(target, records[drop:]):
+            return 0
+        try:
+            os.unlink(_index_path(target))
+        except FileNotFoundError:
+            pass
+        board.unload()
+        board.ensure_loaded()
+    logger.info("Archived %d expired posts from board %s", drop, target)
+    return drop
+
+
+def compact_boards() -> int:
+    """Apply retention to every board on disk that has a limit configured."""
+    flush_boards()
+    total = 0
+    for name in sorted(os.listdir(BBS_DIR)):
+        stem, ext = os.path.splitext(name)
+        if ext == ".jsonl" and stem.lstrip("-").isdigit():
+            policy = retention_for(int(stem))
+            if policy.unlimited:
+                continue
+            try:
+                total += compact_board(int(stem), policy)
+            except Exception:
+                logger.exception("Failed to compact board %s", stem)
+    return total
+
+
+def start_compactor(interval: float = BBS_COMPACT_INTERVAL) -> threading.Thread:
+    """Run :func:`compact_boards` now and then every ``interval`` seconds."""
+
+    def loop():
+        while True:
+            compact_boards()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="bbs-compact", daemon=True)
+    thread.start()
+    return thread
 
 
 def handle_bbs(
@@ -74,34 +860,20 @@ def handle_bbs(
     send_chunked_text,
 ) -> None:
     command = command.strip()
-    with bbs_lock:
-        board = bbs_posts.get(target)
-        if board is None:
-            board = _load_board(target)
-            bbs_posts[target] = board
-        if not command or command == "list":
-            if not board:
-                reply = "No posts."
-            else:
-                lines = [f"{i+1}. {p}" for i, p in enumerate(board)]
-                reply = "Posts:\n" + "\n".join(lines)
-        elif command.startswith("read"):
-            parts = command.split(maxsplit=1)
-            if len(parts) == 2 and parts[1].isdigit():
-                idx = int(parts[1]) - 1
-                if 0 <= idx < len(board):
-                    reply = board[idx]
-                else:
-                    reply = "No such post."
-            else:
-                reply = "Usage: bbs read <n>"
+    with bbs_posts.use(target) as board:
+        parts = command.split(maxsplit=1)
+        verb = parts[0].lower() if parts else "list"
+        arg = parts[1].strip() if len(parts) > 1 else ""
+        if verb == "list" and (not arg or arg.isdigit()):
+            reply = _list_posts(board, int(arg) if arg else None)
+        elif verb == "read":
+            reply = _read_posts(board, arg.replace(" ", ""))
+        elif verb == "search":
+            reply = _search_posts(board, arg)
         else:
             content = command[5:].strip() if command.startswith("post ") else command
             content = safe_text(content, MAX_TEXT_LEN)
-            entry = f"{user}: {content}" if user is not None else content
-            board.append(entry)
-            _save_board(target, board)
-            reply = f"Post #{len(board)} recorded."
+            reply = f"Post #{board.append(content, user)} recorded."
 
     log_message("OUT", target, reply, channel=is_channel)
     send_chunked_text(reply, target, iface, channel=is_channel)
@@ -0,0 +1,621 @@
+"""Replicate BBS boards between bot instances.
+
+Every post has a global id ``"<origin>:<seq>"``. Posts written here use this
+node's id and their local post number as ``seq``; posts merged from a peer
+keep the id they arrived with (stored in the record's ``id`` field). Because
+each origin's sequence numbers only grow, a board's state is summarised by a
+version vector ``{origin: highest seq seen}`` and a peer only needs the posts
+above the vector it announces. Merging is a grow-only set union keyed on the
+id, so replicas converge no matter how often or in which order they sync.
+Post numbers stay local to each instance.
+
+Peers exchange two JSON messages over a pluggable :class:`Transport`::
+
+    {"type": "vector", "node": ..., "board": 0, "vector": {"a1b2": 12}}
+    {"type": "posts", "node": ..., "to": ..., "board": 0, "posts": [...]}
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import secrets
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import bbs
+from utils.text import MAX_TEXT_LEN, safe_text
+
+logger = logging.getLogger("meshtastic_llm_bot")
+
+SYNC_PREFIX = "BBSYNC1 "
+SYNC_INTERVAL = float(os.getenv("MESHTASTIC_BBS_SYNC_INTERVAL", "300"))
+SYNC_BATCH = 50
+# Meshtastic text payloads are limited to roughly 230 bytes.
+MESH_MAX_BYTES = 228
+# Most packets a vector may be split into over the mesh.
+MESH_MAX_PARTS = 16
+# Hex digits of the HMAC on each mesh packet; a full one would not fit.
+MESH_MAC_CHARS = 16
+# Airtime budget for mesh replication, in bytes per minute.
+MESH_AIRTIME = float(os.getenv("MESHTASTIC_BBS_SYNC_AIRTIME", "400"))
+SYNC_BOARDS = {
+    int(b) for b in os.getenv("MESHTASTIC_BBS_SYNC_BOARDS", "0,1,2,3,4").split(",") if b.strip()
+}
+NODE_FILE = os.path.join(bbs.BBS_DIR, "node_id")
+# Shared secret that TCP peers sign their messages with.
+SYNC_SECRET = os.getenv("MESHTASTIC_BBS_SYNC_SECRET", "")
+
+
+def node_id() -> str:
+    """This instance's replication id, created once and kept in ``BBS_DIR``."""
+    env = os.getenv("MESHTASTIC_BBS_NODE_ID")
+    if env:
+        return env.strip()
+    try:
+        with open(NODE_FILE, "r", encoding="utf-8") as f:
+            existing = f.read().strip()
+        if existing:
+            return existing
+    except FileNotFoundError:
+        pass
+    new = secrets.token_hex(4)
+    fd = os.open(NODE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(new + "\n")
+    return new
+
+
+def _split_id(post_id: str) -> Optional[Tuple[str, int]]:
+    origin, _, seq = str(post_id).rpartition(":")
+    if not origin or not seq.isdigit():
+        return None
+    return origin, int(seq)
+
+
+def _sign(key: bytes, payload: bytes, length: int = 64) -> bytes:
+    """``payload`` prefixed with its HMAC-SHA256 (``length`` hex digits) and a space."""
+    digest = hmac.new(key, payload, hashlib.sha256).hexdigest()[:length]
+    return digest.encode("ascii") + b" " + payload
+
+
+def _verify(key: bytes, signed: bytes, length: int = 64) -> Optional[bytes]:
+    """The payload of a :func:`_sign` result, or ``None`` if the signature is bad."""
+    digest, _, payload = signed.strip().partition(b" ")
+    expected = hmac.new(key, payload, hashlib.sha256).hexdigest()[:length].encode("ascii")
+    return payload if hmac.compare_digest(digest, expected) else None
+
+
+class Transport(ABC):
+    """Carries replication messages between peers.
+
+    ``send`` broadcasts to every peer and returns ``False`` if the message
+    could not be sent now; ``receive`` returns the messages that arrived since
+    the last call. ``batch`` is the number of posts to put in one message.
+    """
+
+    batch = SYNC_BATCH
+
+    @abstractmethod
+    def send(self, message: dict) -> bool:
+        ...
+
+    @abstractmethod
+    def receive(self) -> List[dict]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class FileTransport(Transport):
+    """Exchange messages through a shared directory with one inbox per node."""
+
+    def __init__(self, directory: str, node: str):
+        self.directory = directory
+        self.node = node
+        self.inbox = os.path.join(directory, node)
+        os.makedirs(self.inbox, exist_ok=True, mode=0o700)
+
+    def _peers(self) -> List[str]:
+        return [
+            name
+            for name in os.listdir(self.directory)
+            if name != self.node and os.path.isdir(os.path.join(self.directory, name))
+        ]
+
+    def send(self, message: dict) -> bool:
+        data = json.dumps(message)
+        to = message.get("to")
+        for peer in [to] if to else self._peers():
+            inbox = os.path.join(self.directory, peer)
+            try:
+                fd, tmp = tempfile.mkstemp(dir=inbox, prefix=".")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, os.path.join(inbox, f"{time.time_ns()}-{self.node}.json"))
+            except OSError as e:
+                logger.warning("Failed to deliver sync message to %s: %s", peer, e)
+        return True
+
+    def receive(self) -> List[dict]:
+        messages = []
+        for name in sorted(os.listdir(self.inbox)):
+            if name.startswith("."):
+                continue
+            path = os.path.join(self.inbox, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    messages.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping unreadable sync message %s: %s", path, e)
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        return messages
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+class TCPTransport(Transport):
+    """Newline-delimited JSON over TCP between a fixed set of peers.
+
+    With a ``secret`` every line is ``<hmac> <json>``, signed with
+    HMAC-SHA256, and lines without a valid signature are dropped. The
+    transport refuses to listen on a non-loopback address without one.
+    """
+
+    def __init__(
+        self,
+        listen: Tuple[str, int],
+        peers: Iterable[Tuple[str, int]],
+        timeout: float = 5.0,
+        secret: str = "",
+    ):
+        if not secret and not _is_loopback(listen[0]):
+            raise ValueError(f"refusing to listen on {listen[0]} without MESHTASTIC_BBS_SYNC_SECRET")
+        self.peers = list(peers)
+        self.timeout = timeout
+        self._key = secret.encode("utf-8") if secret else None
+        self._inbox: Deque[dict] = deque()
+        inbox = self._inbox
+        transport = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    payload = line if transport._key is None else _verify(transport._key, line)
+                    if payload is None:
+                        logger.warning("Dropping unsigned sync message from %s", self.client_address)
+                        continue
+                    try:
+                        inbox.append(json.loads(payload))
+                    except ValueError:
+                        logger.warning("Dropping malformed sync message from %s", self.client_address)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer(listen, Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="bbs-sync-tcp", daemon=True
+        ).start()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def send(self, message: dict) -> bool:
+        data = json.dumps(message).encode("utf-8")
+        if self._key is not None:
+            data = _sign(self._key, data)
+        data += b"\n"
+        for peer in self.peers:
+            try:
+                with socket.create_connection(peer, timeout=self.timeout) as conn:
+                    conn.sendall(data)
+            except OSError as e:
+                logger.debug("Sync peer %s:%s unreachable: %s", peer[0], peer[1], e)
+        return True
+
+    def receive(self) -> List[dict]:
+        messages = []
+        while self._inbox:
+            messages.append(self._inbox.popleft())
+        return messages
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MeshTransport(Transport):
+    """Send sync messages as text packets on a mesh channel.
+
+    Posts are sent one per packet, and posts too long for a packet are not
+    replicated over the mesh. A vector too large for one packet is split
+    into parts (``"part": [i, n]``) that the receiver joins again; a round
+    with a lost part is simply dropped. Outgoing bytes are limited by a
+    token bucket refilled at ``airtime`` bytes per minute; when it is empty
+    :meth:`send` returns ``False`` and the remaining posts wait for a later
+    round.
+
+    Incoming packets are handed over by the bot through :meth:`deliver` and
+    only accepted from this channel, never from a DM. Anyone on the channel
+    can send, so the transport needs ``peers`` (the node numbers to accept),
+    a shared ``secret`` (each packet then carries a truncated HMAC-SHA256
+    after the prefix), or both.
+    """
+
+    batch = 1
+
+    def __init__(
+        self,
+        iface,
+        channel: int,
+        airtime: float = MESH_AIRTIME,
+        peers: Optional[Set[int]] = None,
+        secret: str = "",
+        clock=time.monotonic,
+    ):
+        if not peers and not secret:
+            raise ValueError(
+                "mesh sync needs MESHTASTIC_BBS_SYNC_PEERS or MESHTASTIC_BBS_SYNC_SECRET"
+            )
+        self.iface = iface
+        self.channel = channel
+        self.rate = airtime / 60.0
+        self.burst = max(airtime, 2 * MESH_MAX_BYTES)
+        self.peers = peers
+        self._key = secret.encode("utf-8") if secret else None
+        self._clock = clock
+        self._tokens = self.burst
+        self._stamp = clock()
+        self._inbox: Deque[dict] = deque()
+        # (node, board) -> vector parts received so far, by part number.
+        self._parts: Dict[Tuple[object, object], Dict[int, dict]] = {}
+
+    def _take(self, size: int) -> bool:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        # A split vector may cost more than the burst; it goes out once the
+        # bucket is full and the debt is paid off before the next send.
+        if self._tokens < min(size, self.burst):
+            return False
+        self._tokens -= size
+        return True
+
+    def _packet(self, message: dict) -> str:
+        payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+        if self._key is not None:
+            payload = _sign(self._key, payload, MESH_MAC_CHARS)
+        return SYNC_PREFIX + payload.decode("utf-8")
+
+    def _split_vector(self, message: dict) -> List[str]:
+        chunks: List[Dict[str, int]] = []
+        chunk: Dict[str, int] = {}
+        for origin, seq in sorted(message["vector"].items()):
+            chunk[origin] = seq
+            probe = self._packet(dict(message, vector=chunk, part=[99, 99]))
+            if len(chunk) > 1 and len(probe.encode("utf-8")) > MESH_MAX_BYTES:
+                del chunk[origin]
+                chunks.append(chunk)
+                chunk = {origin: seq}
+        chunks.append(chunk)
+        return [
+            self._packet(dict(message, vector=chunk, part=[i, len(chunks)]))
+            for i, chunk in enumerate(chunks)
+        ]
+
+    def send(self, message: dict) -> bool:
+        texts = [self._packet(message)]
+        if len(texts[0].encode("utf-8")) > MESH_MAX_BYTES and message.get("type") == "vector":
+            texts = self._split_vector(message)
+        sizes = [len(text.encode("utf-8")) for text in texts]
+        if max(sizes) > MESH_MAX_BYTES or len(texts) > MESH_MAX_PARTS:
+            logger.warning(
+                "Sync %s message of %d bytes too large for the mesh; skipped",
+                message.get("type"),
+                sum(sizes),
+            )
+            return True
+        if not self._take(sum(sizes)):
+            return False
+        for text in texts:
+            self.iface.sendText(text, channelIndex=self.channel)
+        return True
+
+    def _join(self, message: dict) -> Optional[dict]:
+        """Collect one part of a split vector; return the whole once complete."""
+        part = message.pop("part")
+        if not (
+            isinstance(part, list)
+            and len(part) == 2
+            and all(isinstance(x, int) for x in part)
+            and 0 <= part[0] < part[1] <= MESH_MAX_PARTS
+            and isinstance(message.get("vector"), dict)
+        ):
+            return None
+        index, count = part
+        key = (message.get("node"), message.get("board"))
+        if index == 0 or key not in self._parts:
+            self._parts[key] = {}
+        parts = self._parts[key]
+        parts[index] = message["vector"]
+        if any(i not in parts for i in range(count)):
+            return None
+        del self._parts[key]
+        vector: Dict[str, int] = {}
+        for i in range(count):
+            vector.update(parts[i])
+        return dict(message, vector=vector)
+
+    def deliver(
+        self, text: str, src: Optional[int] = None, channel: Optional[int] = None, direct: bool = False
+    ) -> bool:
+        """Queue a received packet; return ``True`` if it was a sync message.
+
+        ``channel`` is the channel index the packet arrived on and ``direct``
+        is true for a DM; sync messages are only taken from broadcasts on
+        :attr:`channel`.
+        """
+        if not text.startswith(SYNC_PREFIX):
+            return False
+        if direct or channel != self.channel:
+            logger.debug("Ignoring sync message from %s outside channel %s", src, self.channel)
+            return True
+        if self.peers and src not in self.peers:
+            logger.debug("Ignoring sync message from unknown node %s", src)
+            return True
+        payload: Optional[bytes] = text[len(SYNC_PREFIX) :].encode("utf-8")
+        if self._key is not None:
+            payload = _verify(self._key, payload, MESH_MAC_CHARS)
+            if payload is None:
+                logger.warning("Dropping unsigned sync message from %s", src)
+                return True
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.debug("Dropping malformed sync message from %s", src)
+            return True
+        if isinstance(message, dict) and "part" in message:
+            message = self._join(message)
+        if message is not None:
+            self._inbox.append(message)
+        return True
+
+    def receive(self) -> List[dict]:
+        messages = []
+        while self._inbox:
+            messages.append(self._inbox.popleft())
+        return messages
+
+
+class Replicator:
+    """Keep this node's shared boards in sync with its peers."""
+
+    def __init__(self, transport: Transport, node: Optional[str] = None, boards: Iterable[int] = SYNC_BOARDS):
+        self.transport = transport
+        self.node = node or node_id()
+        self.boards = set(boards)
+        self._vectors: Dict[int, Dict[str, int]] = {}
+        # Board.last when each cached vector was last brought up to date.
+        self._seen_last: Dict[int, int] = {}
+        self.merged = 0
+
+    def _origin(self, record: dict) -> Tuple[str, int]:
+        parsed = _split_id(record["id"]) if "id" in record else None
+        return parsed or (self.node, int(record.get("n", 0)))
+
+    def _records(self, board: bbs.Board) -> List[dict]:
+        board.flush()
+        try:
+            return bbs._read_records(board.path)
+        except FileNotFoundError:
+            return []
+
+    def _vector(self, target: int, board: bbs.Board) -> Dict[str, int]:
+        """The cached vector for ``target``; call with the board in use."""
+        vector = self._vectors.get(target)
+        if vector is None:
+            vector = {}
+            # Archived posts still count, so peers do not resend them.
+            for record in bbs.read_archive(target) + self._records(board):
+                origin, seq = self._origin(record)
+                vector[origin] = max(vector.get(origin, 0), seq)
+            self._vectors[target] = vector
+        elif board.last > self._seen_last[target]:
+            # merge() accounts for the posts it adds, so any newer post was
+            # written here and its number is this node's sequence number.
+            vector[self.node] = board.last
+        self._seen_last[target] = board.last
+        return vector
+
+    def vector(self, target: int) -> Dict[str, int]:
+        """Highest sequence number held for each origin on ``target``.
+
+        This node's entry is the newest post it wrote itself, not counting
+        posts merged from peers.
+        """
+        with bbs.bbs_posts.use(target) as board:
+            return dict(self._vector(target, board))
+
+    def changes_since(self, target: int, vector: Dict[str, int]) -> List[dict]:
+        """Posts on ``target`` newer than ``vector``, oldest first."""
+        ours = self.vector(target)
+        if all(vector.get(origin, 0) >= seq for origin, seq in ours.items()):
+            return []
+        with bbs.bbs_posts.use(target) as board:
+            posts = []
+            for record in self._records(board):
+                origin, seq = self._origin(record)
+                if seq > vector.get(origin, 0):
+                    posts.append(
+                        {
+                            "id": f"{origin}:{seq}",
+                            "ts": record.get("ts"),
+                            "user": record.get("user"),
+                            "text": record.get("text", ""),
+                        }
+                    )
+            return posts
+
+    def merge(self, target: int, posts: Iterable[dict]) -> int:
+        """Add unseen ``posts`` to ``target``; return how many were new."""
+        added = 0
+        with bbs.bbs_posts.use(target) as board:
+            vector = self._vector(target, board)
+            for post in posts:
+                parsed = _split_id(post.get("id", "")) if isinstance(post, dict) else None
+                if parsed is None:
+                    continue
+                origin, seq = parsed
+                if origin == self.node or seq <= vector.get(origin, 0):
+                    continue
+                ts, user, text = post.get("ts"), post.get("user"), post.get("text")
+                if not isinstance(text, str):
+                    continue
+                board.append(
+                    safe_text(text, MAX_TEXT_LEN),
+                    user if isinstance(user, int) else None,
+                    ts=ts if isinstance(ts, int) else None,
+                    post_id=f"{origin}:{seq}",
+                )
+                vector[origin] = seq
+                added += 1
+            self._seen_last[target] = board.last
+        self.merged += added
+        return added
+
+    def announce(self) -> None:
+        for target in sorted(self.boards):
+            if not self.transport.send(
+                {"type": "vector", "node": self.node, "board": target, "vector": self.vector(target)}
+            ):
+                break
+
+    def handle(self, message: dict) -> None:
+        peer = message.get("node")
+        target = message.get("board")
+        if peer == self.node or target not in self.boards:
+            return
+        if message.get("type") == "vector" and isinstance(message.get("vector"), dict):
+            posts = self.changes_since(target, message["vector"])
+            batch = self.transport.batch
+            for i in range(0, len(posts), batch):
+                sent = self.transport.send(
+                    {
+                        "type": "posts",
+                        "node": self.node,
+                        "to": peer,
+                        "board": target,
+                        "posts": posts[i : i + batch],
+                    }
+                )
+                if not sent:
+                    logger.debug("Sync budget exhausted; %d posts deferred", len(posts) - i)
+                    break
+        elif message.get("type") == "posts" and message.get("to") in (None, self.node):
+            if isinstance(message.get("posts"), list):
+                added = self.merge(target, message["posts"])
+                if added:
+                    logger.info("Merged %d posts from %s into board %s", added, peer, target)
+
+    def sync_once(self) -> int:
+        """Process received messages, then announce our vectors."""
+        before = self.merged
+        for message in self.transport.receive():
+            try:
+                self.handle(message)
+            except Exception:
+                logger.exception("Failed to handle sync message from %s", message.get("node"))
+        self.announce()
+        return self.merged - before
+
+    def start(self, interval: float = SYNC_INTERVAL) -> threading.Thread:
+        def loop():
+            while True:
+                try:
+                    self.sync_once()
+                except Exception:
+                    logger.exception("BBS sync round failed")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name="bbs-sync", daemon=True)
+        thread.start()
+        return thread
+
+
+def _address(spec: str) -> Tuple[str, int]:
+    host, _, port = spec.strip().rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def configured_transport(iface=None) -> Optional[Transport]:
+    """Build the transport named by ``MESHTASTIC_BBS_SYNC``.
+
+    ``file:<dir>`` uses a shared directory, ``tcp:<listen>=<peer>,<peer>``
+    connects to fixed peers and ``mesh:<channel>`` sends packets on a mesh
+    channel. TCP and mesh messages are signed with
+    ``MESHTASTIC_BBS_SYNC_SECRET``; mesh sync also accepts an allowlist of
+    node numbers in ``MESHTASTIC_BBS_SYNC_PEERS`` and needs one or the other.
+    """
+    spec = os.getenv("MESHTASTIC_BBS_SYNC", "").strip()
+    kind, _, arg = spec.partition(":")
+    try:
+        if kind == "file":
+            return FileTransport(arg, node_id())
+        if kind == "tcp":
+            listen, _, peers = arg.partition("=")
+            return TCPTransport(
+                _address(listen),
+                [_address(p) for p in peers.split(",") if p.strip()],
+                secret=SYNC_SECRET,
+            )
+        if kind == "mesh" and iface is not None:
+            peers_env = os.getenv("MESHTASTIC_BBS_SYNC_PEERS")
+            peers = {int(p) for p in peers_env.split(",") if p.strip()} if peers_env else None
+            return MeshTransport(iface, int(arg or 0), peers=peers, secret=SYNC_SECRET)
+    except (OSError, ValueError) as e:
+        logger.error("Invalid MESHTASTIC_BBS_SYNC=%r: %s", spec, e)
+        return None
+    if spec:
+        logger.error("Unknown MESHTASTIC_BBS_SYNC=%r", spec)
+    return None
+
+
+replicator: Optional[Replicator] = None
+
+
+def start_replication(iface=None) -> Optional[Replicator]:
+    """Start syncing if ``MESHTASTIC_BBS_SYNC`` is configured."""
+    global replicator
+    transport = configured_transport(iface)
+    if transport is None:
+        return None
+    replicator = Replicator(transport)
+    replicator.start()
+    logger.info("BBS replication started as node %s", replicator.node)
+    return replicator
+
+
+def deliver(
+    text: str, src: Optional[int] = None, channel: Optional[int] = None, direct: bool = False
+) -> bool:
+    """Hand a received mesh packet to the replicator if it is a sync message."""
+    transport = replicator.transport if replicator is not None else None
+    return isinstance(transport, MeshTransport) and transport.deliver(text, src, channel, direct)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Per-message sanitation cost: the old two-pass ``safe_text`` vs the new one.
+
+A received message used to be sanitized in ``on_receive``,
+``handle_message`` and ``record_message`` (and again when logged), and a
+reply in ``handle_message`` and ``log_message``. This replays those five
+calls per message over a mix of realistic packets.
+
+    python benchmarks/bench_sanitize.py [messages]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text import MAX_TEXT_LEN, safe_text
+
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x09\x0b-\x0c\x0e-\x1f\x7f]")
+_PLACEHOLDER_RE = re.compile(r"\s*\[[A-Z_]+\]\s*")
+
+PACKETS = [
+    "hi",
+    "weather Hartford",
+    "zork take lamp",
+    "bbs post Anyone on the north ridge repeater tonight? Heading up around 8.",
+    "@cipher what's the best antenna for a handheld at 915 MHz? 📡",
+    "Thanks!\nSee you at the meetup.",
+    "Hey [USERNAME], your node [NODE_ID] is online\x07",
+    "Es ist kalt hier oben 🥶 aber der Empfang ist super.",
+]
+REPLY = "[1/2] A quarter-wave whip cut to about 8 cm works well; a half-wave gains a bit more."
+
+
+def two_pass(s, max_len=MAX_TEXT_LEN):
+    s = _PLACEHOLDER_RE.sub(" ", s).strip()
+    return _CONTROL_CHARS_RE.sub(lambda m: f"\\x{ord(m.group(0)):02x}", s)[:max_len]
+
+
+def per_message(sanitize, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        text = PACKETS[i % len(PACKETS)]
+        text = sanitize(text, MAX_TEXT_LEN)  # on_receive
+        text = sanitize(text, MAX_TEXT_LEN)  # handle_message
+        sanitize(text, MAX_TEXT_LEN)  # record_message
+        reply = sanitize(REPLY, MAX_TEXT_LEN)  # handle_message
+        sanitize(reply, MAX_TEXT_LEN)  # log_message
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for packet in PACKETS:
+        assert safe_text(packet) == two_pass(packet), packet
+    before = per_message(two_pass, n)
+    after = per_message(safe_text, n)
+    print(f"two-pass:    {before:6.2f} us/message")
+    print(f"single-pass: {after:6.2f} us/message ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Offline benchmark of weather lookups.
+
+Serves reports from a temporary local export through :class:`ProviderRace`
+and compares uncached lookups with cache hits. No network access is needed.
+
+    python benchmarks/bench_weather.py [lookups]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weather import LocalFileProvider, ProviderRace, WeatherCache
+
+LOCATIONS = ["San Francisco", "Oakland", "Hartford", "New Haven", "Reno"]
+
+
+def timed(fn, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        fn(LOCATIONS[i % len(LOCATIONS)])
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({loc: f"{loc}: ☀️ +61°F" for loc in LOCATIONS}, f)
+        race = ProviderRace([LocalFileProvider(path)])
+        cache = WeatherCache(race, ttl=3600, stale_ttl=7200)
+        print(f"local provider: {timed(race, n):8.1f} us/lookup")
+        print(f"cached:         {timed(cache.get, n):8.1f} us/lookup")
+        print(f"cache hits={cache.hits} misses={cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Concurrent adventure throughput: global lock + stdout capture vs per-game sinks.
+
+Runs the same scripted commands for many players on a thread pool, first the
+old way (one lock around every command, output captured with
+``redirect_stdout``) and then through :func:`zork._run` with per-game locks
+and output sinks. Also checks that no player received another's output.
+
+    python benchmarks/bench_zork.py [players] [commands]
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import zork
+from adventure import Game
+
+SCRIPT = ["look", "take lamp", "east", "take key", "west", "inventory", "score", "drop lamp"]
+WORKERS = 8
+
+
+def global_lock(games, players, commands):
+    lock = threading.Lock()
+
+    def player(p):
+        out = []
+        for i in range(commands):
+            with lock:
+                buf = io.StringIO()
+                with redirect_stdout(buf):
+                    zork._play(games[p], SCRIPT[i % len(SCRIPT)])
+                out.append(buf.getvalue())
+        return out
+
+    with ThreadPoolExecutor(WORKERS) as pool:
+        return list(pool.map(player, range(players)))
+
+
+def per_game(games, players, commands):
+    def player(p):
+        game = games[p]
+        return [zork._run(game, zork._play, game, SCRIPT[i % len(SCRIPT)]) for i in range(commands)]
+
+    with ThreadPoolExecutor(WORKERS) as pool:
+        return list(pool.map(player, range(players)))
+
+
+def bench(name, fn, players, commands):
+    games = [Game() for _ in range(players)]
+    started = time.perf_counter()
+    outputs = fn(games, players, commands)
+    elapsed = time.perf_counter() - started
+    total = players * commands
+    # Every "score" reply must be that player's own score line.
+    score = SCRIPT.index("score")
+    mixed = sum(
+        1
+        for out in outputs
+        for i, reply in enumerate(out)
+        if i % len(SCRIPT) == score and not reply.strip().startswith("Score:")
+    )
+    print(f"{name:12s} {total / elapsed:10.0f} commands/s  ({elapsed * 1e3:.1f} ms, mixed replies: {mixed})")
+
+
+def main() -> None:
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    commands = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    bench("global lock", global_lock, players, commands)
+    bench("per-game", per_game, players, commands)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Headless adventure simulator for sizing and regression checks.
+
+Starts many players through :func:`zork.handle_zork` against a fake radio,
+then plays seeded random (or scripted) command streams for every player on
+a thread pool and reports commands/s, latency percentiles, memory per game
+and reply bytes per command. Games hibernate to a temporary directory, so
+``--max-games`` below ``--players`` also exercises the disk path.
+
+    python benchmarks/zork_sim.py [--players N] [--commands N] [--workers N]
+                                  [--seed N] [--script FILE] [--max-games N]
+                                  [--trace-memory]
+
+Memory per game is measured with :mod:`tracemalloc` while the games are
+started; ``--trace-memory`` keeps tracing during play (slower) to report it
+again once every command has run.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SIM_DIR = tempfile.TemporaryDirectory(prefix="zork-sim-")
+os.environ["MESHTASTIC_ZORK_DIR"] = SIM_DIR.name
+
+import zork  # noqa: E402
+from adventure import World  # noqa: E402
+
+SCRIPT = [
+    "look", "take lamp", "use lamp", "east", "take key", "south", "east", "east",
+    "use key door", "east", "north", "hint", "go dusty entrance", "inventory", "score",
+]
+VERBS = ["look", "inventory", "score", "hint", "moves"]
+
+
+class FakeRadio:
+    """Counts what would have gone out over the air."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.replies = 0
+        self.bytes = 0
+
+    def send(self, text, target, iface, channel=False):
+        with self.lock:
+            self.replies += 1
+            self.bytes += len(text.encode("utf-8"))
+
+
+def random_stream(seed: int, n: int):
+    """A player's seeded command stream, weighted towards movement."""
+    world = World.load()
+    rng = random.Random(seed)
+    items = list(world.items)
+    rooms = [room.name.lower() for room in world.rooms.values()]
+    directions = ["north", "south", "east", "west", "n", "s", "e", "w"]
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.5:
+            yield rng.choice(directions)
+        elif roll < 0.65:
+            yield f"take {rng.choice(items)}"
+        elif roll < 0.72:
+            yield f"drop {rng.choice(items)}"
+        elif roll < 0.8:
+            yield rng.choice(["use lamp", "use key door", "use scroll", f"examine {rng.choice(items)}"])
+        elif roll < 0.87:
+            yield f"go {rng.choice(rooms)}"
+        else:
+            yield rng.choice(VERBS)
+
+
+def scripted_stream(script, n: int):
+    for i in range(n):
+        yield script[i % len(script)]
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=50, help="commands per player")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--script", help="file with one command per line, played by every player")
+    parser.add_argument("--max-games", type=int, help="games kept in memory (default: all players)")
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    zork.games = zork.GameStore(zork.ZORK_DIR, zork.ZORK_IDLE_TTL, args.max_games or args.players)
+    radio = FakeRadio()
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = [line.strip() for line in f if line.strip()]
+
+    def command(player: int, text: str) -> float:
+        started = time.perf_counter()
+        zork.handle_zork(player, text, None, False, player, lambda *a, **k: None, radio.send)
+        return time.perf_counter() - started
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for player in range(args.players):
+        command(player, "start")
+    start_elapsed = time.perf_counter() - started
+    fresh = (tracemalloc.get_traced_memory()[0] - base) / args.players
+    if not args.trace_memory:
+        tracemalloc.stop()
+    radio.replies = radio.bytes = 0
+
+    def play(player: int):
+        if script:
+            stream = scripted_stream(script, args.commands)
+        else:
+            stream = random_stream(args.seed * 1_000_003 + player, args.commands)
+        return [command(player, text) for text in stream]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as pool:
+        latencies = sorted(t for per_player in pool.map(play, range(args.players)) for t in per_player)
+    elapsed = time.perf_counter() - started
+
+    total = len(latencies)
+    print(f"players {args.players}, {args.commands} commands each, {args.workers} workers")
+    print(f"start:        {args.players / start_elapsed:10.0f} games/s")
+    print(f"throughput:   {total / elapsed:10.0f} commands/s ({elapsed:.2f} s)")
+    print(
+        f"latency:      p50 {percentile(latencies, 0.5) * 1e3:.3f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1e3:.3f} ms  max {latencies[-1] * 1e3:.3f} ms"
+    )
+    print(f"memory/game:  {fresh / 1024:10.1f} KiB when started")
+    if args.trace_memory:
+        played = (tracemalloc.get_traced_memory()[0] - base) / args.players
+        tracemalloc.stop()
+        print(f"              {played / 1024:10.1f} KiB after play (timings include tracing)")
+    print(f"output:       {radio.bytes / max(radio.replies, 1):10.1f} bytes/command")
+    print(f"in memory:    {len(zork.games):10d} games (rest hibernated)")
+    zork.games.clear()
+    SIM_DIR.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Summarise the bot's per-message metrics logs.
+
+Reads ``logs/<date>-metrics.jsonl`` files (optionally gzipped) one line at a
+time. Latencies go into fixed log-scale histograms and traffic into per-hour
+counters, so memory use does not grow with the number of records however
+many months are scanned::
+
+    python log_report.py [paths ...] [--since 2026-01-01] [--until 2026-03-31]
+                         [--top 10] [--json]
+
+``paths`` are files or directories (default ``logs``).
+"""
+
+import argparse
+import datetime
+import gzip
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+
+METRICS_FILE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})-metrics\.jsonl(\.gz)?$")
+LATENCY_FIELDS = ("total_ms", "queue_ms", "llm_ms", "tx_ms")
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """Log-scale histogram; percentiles are accurate to about ``growth``."""
+
+    def __init__(self, growth: float = 1.05):
+        self._log_growth = math.log(growth)
+        self.growth = growth
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        index = int(math.log(value) / self._log_growth) if value >= 1 else 0
+        self.buckets[index] += 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q``-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(q / 100 * self.count)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.growth ** (index + 1) if index else 1.0, self.max)
+        return self.max
+
+
+class Report:
+    def __init__(self):
+        self.records = 0
+        self.outcomes: Counter = Counter()
+        self.drop_reasons: Counter = Counter()
+        self.kinds: Counter = Counter()
+        self.cache: Counter = Counter()
+        self.hour_of_day: Counter = Counter()
+        self.hours: Counter = Counter()
+        self.peer_bytes: Counter = Counter()
+        self.channel_bytes: Counter = Counter()
+        self.chunks = 0
+        self.latency = {field: Histogram() for field in LATENCY_FIELDS}
+        self.kind_latency: Dict[str, Histogram] = {}
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def add(self, record: dict) -> None:
+        count = _number(record.get("count"), 1)
+        outcome = _text(record.get("outcome"), "ok")
+        self.records += count
+        self.outcomes[outcome] += count
+        if outcome == "dropped":
+            self.drop_reasons[_text(record.get("reason"), "unknown")] += count
+        ts = record.get("ts")
+        if isinstance(ts, (int, float)):
+            self.first = ts if self.first is None else min(self.first, ts)
+            self.last = ts if self.last is None else max(self.last, ts)
+            if outcome not in ("dropped", "duplicate"):
+                when = datetime.datetime.fromtimestamp(ts)
+                self.hour_of_day[when.hour] += 1
+                # Keyed by hour since the epoch: one counter per hour scanned.
+                self.hours[int(ts // 3600)] += 1
+        if outcome in ("dropped", "duplicate"):
+            return
+        kind = _text(record.get("kind"), "llm")
+        self.kinds[kind] += 1
+        if isinstance(record.get("cache"), str):
+            self.cache[record["cache"]] += 1
+        sent = _number(record.get("tx_bytes"), 0)
+        self.chunks += _number(record.get("chunks"), 0)
+        target = record.get("target")
+        if sent and isinstance(target, (int, str)):
+            bucket = self.channel_bytes if record.get("channel") else self.peer_bytes
+            bucket[target] += sent
+        for field in LATENCY_FIELDS:
+            value = record.get(field)
+            if isinstance(value, (int, float)):
+                self.latency[field].add(value)
+        if isinstance(record.get("total_ms"), (int, float)):
+            self.kind_latency.setdefault(kind, Histogram()).add(record["total_ms"])
+
+    def summary(self, top: int) -> dict:
+        handled = sum(self.kinds.values())
+        received = self.records - self.outcomes["duplicate"]
+        busiest = max(self.hours.items(), key=lambda kv: kv[1], default=None)
+        days = max(1, len({hour // 24 for hour in self.hours}))
+        return {
+            "records": self.records,
+            "first": _iso(self.first),
+            "last": _iso(self.last),
+            "handled": handled,
+            "outcomes": dict(self.outcomes),
+            "drop_rate": _ratio(self.outcomes["dropped"], received),
+            "drop_reasons": dict(self.drop_reasons),
+            "duplicate_rate": _ratio(self.outcomes["duplicate"], self.records),
+            "kinds": dict(self.kinds.most_common()),
+            "per_hour": {
+                "average": round(handled / max(1, len(self.hours)), 2),
+                "busiest": (
+                    {"hour": _iso(busiest[0] * 3600), "messages": busiest[1]} if busiest else None
+                ),
+                "by_hour_of_day": {
+                    hour: round(self.hour_of_day[hour] / days, 2) for hour in range(24)
+                },
+            },
+            "latency_ms": {
+                field: _percentiles(hist) for field, hist in self.latency.items() if hist.count
+            },
+            "latency_ms_by_kind": {
+                kind: _percentiles(hist) for kind, hist in sorted(self.kind_latency.items())
+            },
+            "chunks_per_reply": round(self.chunks / handled, 2) if handled else 0.0,
+            "top_peers_by_airtime": _top(self.peer_bytes, top),
+            "top_channels_by_airtime": _top(self.channel_bytes, top),
+            "cache": {
+                "lookups": sum(self.cache.values()),
+                "hit_rate": _ratio(self.cache["hit"] + self.cache["stale"], sum(self.cache.values())),
+                **dict(self.cache),
+            },
+        }
+
+
+def _number(value, default: int) -> int:
+    """``value`` if it is a whole number, else ``default``."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+
+def _text(value, default: str) -> str:
+    return value if isinstance(value, str) else default
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts).isoformat(sep=" ", timespec="minutes")
+
+
+def _ratio(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _percentiles(hist: Histogram) -> dict:
+    result = {f"p{q}": round(hist.percentile(q), 1) for q in PERCENTILES}
+    result["max"] = round(hist.max, 1)
+    result["n"] = hist.count
+    return result
+
+
+def _top(counter: Counter, n: int) -> List[dict]:
+    return [{"target": target, "bytes": sent} for target, sent in counter.most_common(n)]
+
+
+def metrics_files(paths: List[str], since: Optional[str], until: Optional[str]) -> List[str]:
+    """Metrics files under ``paths`` within the date range, oldest first."""
+    found = []
+    for path in paths:
+        names = [os.path.join(path, n) for n in os.listdir(path)] if os.path.isdir(path) else [path]
+        for name in names:
+            match = METRICS_FILE_RE.search(os.path.basename(name))
+            if not match:
+                continue
+            day = match.group(1)
+            if (since and day < since) or (until and day > until):
+                continue
+            found.append((day, name))
+    return [name for _, name in sorted(found)]
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Records in ``path``, skipping lines that are not JSON objects."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def render(summary: dict) -> str:
+    reasons = ", ".join(f"{k} {v}" for k, v in summary["drop_reasons"].items())
+    lines = [
+        f"{summary['records']} records, {summary['first']} to {summary['last']}",
+        f"handled {summary['handled']}, drop rate {summary['drop_rate']:.2%}"
+        + (f" ({reasons})" if reasons else "")
+        + f", duplicates {summary['duplicate_rate']:.2%}",
+        "outcomes: " + ", ".join(f"{k} {v}" for k, v in summary["outcomes"].items()),
+        "kinds: " + ", ".join(f"{k} {v}" for k, v in summary["kinds"].items()),
+    ]
+    per_hour = summary["per_hour"]
+    busiest = per_hour["busiest"]
+    lines.append(
+        f"throughput: {per_hour['average']} messages/active hour"
+        + (f", busiest {busiest['hour']} ({busiest['messages']})" if busiest else "")
+    )
+    profile = per_hour["by_hour_of_day"]
+    lines.append("  hour of day (avg/day): " + " ".join(f"{h:02d}:{profile[h]:g}" for h in range(24)))
+    lines.append("latency (ms):")
+    for field, pct in summary["latency_ms"].items():
+        lines.append(
+            f"  {field:9s} p50 {pct['p50']:>9} p90 {pct['p90']:>9} p99 {pct['p99']:>9} "
+            f"max {pct['max']:>9} (n={pct['n']})"
+        )
+    for kind, pct in summary["latency_ms_by_kind"].items():
+        lines.append(f"  {kind:9s} p50 {pct['p50']:>9} p99 {pct['p99']:>9} (n={pct['n']})")
+    lines.append(f"chunks/reply: {summary['chunks_per_reply']}")
+    for title, key in (("peers", "top_peers_by_airtime"), ("channels", "top_channels_by_airtime")):
+        top = summary[key]
+        if top:
+            lines.append(f"top {title} by airtime: " + ", ".join(f"{t['target']} {t['bytes']}B" for t in top))
+    cache = summary["cache"]
+    if cache["lookups"]:
+        lines.append(
+            f"weather cache: {cache['hit_rate']:.1%} hits of {cache['lookups']} "
+            f"(hit {cache.get('hit', 0)}, stale {cache.get('stale', 0)}, miss {cache.get('miss', 0)})"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarise logs/<date>-metrics.jsonl files.")
+    parser.add_argument("paths", nargs="*", default=["logs"])
+    parser.add_argument("--since", help="first day to include (YYYY-MM-DD)")
+    parser.add_argument("--until", help="last day to include (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=10, help="peers/channels to list")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+    try:
+        files = metrics_files(args.paths, args.since, args.until)
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if not files:
+        print("No metrics files found.", file=sys.stderr)
+        return 1
+    report = Report()
+    for path in files:
+        try:
+            for record in read_records(path):
+                report.add(record)
+        except (EOFError, OSError, UnicodeDecodeError) as e:
+            # A truncated or corrupt file keeps the records read before the damage.
+            print(f"warning: {path}: {e}", file=sys.stderr)
+    summary = report.summary(args.top)
+    print(json.dumps(summary, indent=2) if args.json else render(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,11 +20,17 @@ import requests
 from pubsub import pub
 from meshtastic.serial_interface import SerialInterface
 
-from weather import get_weather
-from bbs import handle_bbs, bbs_posts
-from zork import handle_zork
-from utils.text import MAX_TEXT_LEN, MAX_LOC_LEN, safe_text, strip_llm_artifacts
-from utils import redact_sensitive
+from weather import get_weather, start_weather_prefetch, weather_cache
+from bbs import flush_boards, handle_bbs, bbs_posts, start_compactor
+from bbs_sync import SYNC_PREFIX, deliver as deliver_sync, start_replication
+from zork import handle_zork, hibernate_games
+from utils.text import MAX_TEXT_LEN, MAX_LOC_LEN, SafeText, safe_text, strip_llm_artifacts
+from utils import Redacted, redact_sensitive
+from utils.dedupe import DedupeCache, packet_key
+from utils.ingress import IngressQueue
+from utils.jsonlog import JsonFormatter
+from utils.load import DegradationLevel, LoadController
+from utils.metrics import MetricsLog
 
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True, mode=0o700)
@@ -47,6 +53,8 @@ except OSError:
 logger = logging.getLogger("meshtastic_llm_bot")
 logger.propagate = False
 for handler in logging.getLogger().handlers:
+    if os.getenv("MESHTASTIC_LOG_JSON"):
+        handler.setFormatter(JsonFormatter())
     logger.addHandler(handler)
 
 if os.getenv("MESHTASTIC_DEBUG"):
@@ -96,6 +104,9 @@ MODEL_NAME = os.getenv(
     "MESHTASTIC_MODEL_NAME", "mradermacher/WizardLM-1.0-Uncensored-Llama2-13b-GGUF"
 )
 
+# Smaller model used by the heaviest degradation levels; defaults to MODEL_NAME.
+LOW_COST_MODEL_NAME = os.getenv("MESHTASTIC_LOW_COST_MODEL_NAME") or None
+
 CHUNK_BYTES = 200
 CHANNEL_CHUNK_BYTES = 180
 DELAY_MIN = 3
@@ -107,8 +118,37 @@ MAX_WORKERS = 4
 MAX_QUEUE_SIZE = 20
 
 MAX_PACKET_CHARS = 1024
+INGRESS_QUEUE_SIZE = 256
+# Per-message records in logs/<date>-metrics.jsonl; see log_report.py.
+METRICS_ENABLED = os.getenv("MESHTASTIC_METRICS", "1").lower() not in {"0", "false", "no"}
+# First words recorded as the message kind; anything else is "llm".
+MESSAGE_KINDS = frozenset({"bbs", "zork", "weather", "help", "stop", "reset"})
+# Requests that change state; they run even when a newer message supersedes them.
+STATEFUL_KINDS = frozenset({"bbs", "zork", "reset"})
+
+MAX_TOKENS = 300
+
+# Degradation levels stepped through while the bot is under sustained load.
+DEGRADATION_LEVELS = (
+    DegradationLevel("normal", MAX_TOKENS, MAX_HISTORY_LEN),
+    DegradationLevel("reduced", 200, 10),
+    DegradationLevel("lean", 120, 6, model=LOW_COST_MODEL_NAME),
+    DegradationLevel("dm-only", 80, 4, model=LOW_COST_MODEL_NAME, pause_channel_chat=True),
+)
+LOAD_QUEUE_HIGH = MAX_WORKERS + MAX_QUEUE_SIZE // 2
+LOAD_QUEUE_LOW = MAX_WORKERS
+LOAD_LATENCY_HIGH = 20.0
+LOAD_LATENCY_LOW = 8.0
+LOAD_RECOVER_AFTER = 60.0
+# While channel chat is paused, each user is told so at most this often.
+BUSY_NOTICE_INTERVAL = 600
 
 CONVO_TIMEOUT = 120
+DEDUPE_TTL = 300
+# Packets without an id are matched on content, so only rebroadcasts arriving
+# within a few seconds count as duplicates and a repeated command still works.
+DEDUPE_HASH_TTL = 10
+DEDUPE_MAX_ENTRIES = 2048
 FORBIDDEN_PROMPTS = ("assistant:", "system:", "```")
 
 MENU = (
@@ -116,10 +156,12 @@ MENU = (
     "- help: show this message\n"
     "- weather [location]: current weather\n"
     "- bbs post <msg>: add a post\n"
-    "- bbs list: show posts\n"
-    "- bbs read <n>: read post n\n"
+    "- bbs list [n]: newest posts, or from post n back\n"
+    "- bbs read <n>[-m]: read post n (or n to m)\n"
+    "- bbs search <terms>: find posts (word* for prefixes)\n"
     "- zork start: begin adventure game\n"
     "- zork <cmd>: play the game\n"
+    "- stop: cancel the reply in progress\n"
     "- anything else: chat with the language model"
 )
 DEFAULT_LOCATION = "San Francisco"
@@ -156,6 +198,25 @@ GREET_JITTER = 900
 
 NO_BOOT = "--no-boot" in sys.argv
 
+def _env_seconds(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = float("nan")
+    if not 0 <= seconds < float("inf"):
+        logger.warning("Ignoring invalid %s=%r", name, value)
+        return default
+    return seconds
+
+
+# Seconds to wait for the model backend before the boot broadcast; 0 warms up
+# in the background instead.
+BACKEND_WAIT = _env_seconds("MESHTASTIC_BACKEND_WAIT", 0)
+BACKEND_PROBE_INTERVAL = 2
+
 
 histories: dict[int, list[dict]] = {}
 history_lock = threading.Lock()
@@ -167,12 +228,27 @@ class BoundedExecutor:
     def __init__(self, max_workers: int, max_queue_size: int):
         self._semaphore = threading.BoundedSemaphore(max_workers + max_queue_size)
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._count_lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+
+    def _run(self, fn, *args, **kwargs):
+        with self._count_lock:
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
 
     def submit(self, fn, *args, **kwargs):
         if not self._semaphore.acquire(blocking=False):
             logger.warning("executor queue full; dropping task")
             return None
-        future = self._executor.submit(fn, *args, **kwargs)
+        with self._count_lock:
+            self.queued += 1
+        future = self._executor.submit(self._run, fn, *args, **kwargs)
         future.add_done_callback(lambda f: self._semaphore.release())
         return future
 
@@ -181,7 +257,60 @@ class BoundedExecutor:
 
 
 executor = BoundedExecutor(MAX_WORKERS, MAX_QUEUE_SIZE)
+load_controller = LoadController(
+    DEGRADATION_LEVELS,
+    queue_high=LOAD_QUEUE_HIGH,
+    queue_low=LOAD_QUEUE_LOW,
+    latency_high=LOAD_LATENCY_HIGH,
+    latency_low=LOAD_LATENCY_LOW,
+    recover_after=LOAD_RECOVER_AFTER,
+)
 respond_channels: set[int] = set()
+recent_packets = DedupeCache(DEDUPE_MAX_ENTRIES, DEDUPE_TTL)
+busy_notices = DedupeCache(DEDUPE_MAX_ENTRIES, BUSY_NOTICE_INTERVAL)
+metrics = MetricsLog(LOG_DIR, METRICS_ENABLED)
+
+# Outstanding replies keyed by (target, user); setting the event cancels one.
+active_replies: dict[tuple[int, Optional[int]], threading.Event] = {}
+reply_lock = threading.Lock()
+_reply_ctx = threading.local()
+
+
+def supersede_reply(key: tuple[int, Optional[int]], token: threading.Event) -> None:
+    """Cancel any reply still in progress for ``key`` and register ``token``."""
+    with reply_lock:
+        prev = active_replies.get(key)
+        if prev is not None:
+            prev.set()
+        active_replies[key] = token
+
+
+def end_reply(key: tuple[int, Optional[int]], token: threading.Event) -> None:
+    with reply_lock:
+        if active_replies.get(key) is token:
+            del active_replies[key]
+
+
+def trace_note(**fields) -> None:
+    """Add ``fields`` to the metrics record of the message being handled."""
+    trace = getattr(_reply_ctx, "trace", None)
+    if trace is not None:
+        trace.update(fields)
+
+
+def reply_cancelled() -> bool:
+    cancel = getattr(_reply_ctx, "cancel", None)
+    return cancel is not None and cancel.is_set()
+
+
+def _pause(seconds: float) -> bool:
+    """Sleep for ``seconds``; return ``True`` early if the current reply is cancelled."""
+    cancel = getattr(_reply_ctx, "cancel", None)
+    if cancel is None:
+        time.sleep(seconds)
+        return False
+    return cancel.wait(seconds)
+
 
 def log_message(direction: str, target: int, message: str, channel: bool = False):
     message = redact_sensitive(safe_text(message, MAX_TEXT_LEN))
@@ -213,6 +342,87 @@ def record_message(peer: int, role: str, content: str):
         return hist.copy()
 
 
+def api_headers() -> Optional[dict]:
+    return {"Authorization": f"Bearer {API_KEY}"} if API_KEY else None
+
+
+def probe_backend(timeout: float = 5) -> bool:
+    """Return ``True`` if the model API answers its model listing."""
+    try:
+        r = requests.get(
+            f"{API_BASE}/models",
+            headers=api_headers(),
+            timeout=timeout,
+            verify=True,
+            allow_redirects=False,
+        )
+        r.raise_for_status()
+        return True
+    except Exception as e:
+        logger.debug("backend probe failed: %s", e)
+        return False
+
+
+def warm_up_backend(timeout: float = 120) -> bool:
+    """Send a one-token completion so the model and system prompt are cached."""
+    payload = {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": "ping"},
+        ],
+        "temperature": 0,
+        "max_tokens": 1,
+    }
+    try:
+        r = requests.post(
+            f"{API_BASE}/chat/completions",
+            headers=api_headers(),
+            json=payload,
+            timeout=timeout,
+            verify=True,
+            allow_redirects=False,
+        )
+        r.raise_for_status()
+        return True
+    except Exception as e:
+        logger.warning("backend warm-up failed: %s", e)
+        return False
+
+
+def prepare_backend(wait: float = 0) -> bool:
+    """Probe the model API, retrying for up to ``wait`` seconds, then warm it up.
+
+    Logs how long the backend took to become reachable and to finish the
+    warm-up completion. Returns ``True`` once the warm-up succeeded.
+    """
+
+    started = time.monotonic()
+    while not probe_backend():
+        if time.monotonic() - started >= wait:
+            logger.warning("backend %s not reachable", API_BASE)
+            return False
+        time.sleep(BACKEND_PROBE_INTERVAL)
+    reachable = time.monotonic() - started
+    ok = warm_up_backend()
+    total = time.monotonic() - started
+    if ok:
+        logger.info(
+            "backend ready: reachable after %.1fs, warm-up done after %.1fs",
+            reachable,
+            total,
+        )
+    return ok
+
+
+def current_load_level() -> DegradationLevel:
+    prev = load_controller.level
+    level = load_controller.update(executor.queued, executor.in_flight)
+    if level is not prev:
+        logger.warning("load level %s -> %s", prev.name, level.name)
+    return level
+
+
 def is_safe_prompt(text: str) -> bool:
     lower = text.lower()
     return not any(f in lower for f in FORBIDDEN_PROMPTS)
@@ -273,7 +483,8 @@ def send_chunked_text(
     Side Effects
     ------------
     Introduces delays between chunk transmissions, sends packets over the radio
-    and logs warnings when acknowledgements fail.
+    and logs warnings when acknowledgements fail. When called while handling a
+    request that gets superseded, the remaining chunks are abandoned.
 
     Thread Safety
     -------------
@@ -290,9 +501,18 @@ def send_chunked_text(
         if new_prefix_len == prefix_len:
             break
         prefix_len = new_prefix_len
+    trace = getattr(_reply_ctx, "trace", None)
+    started = time.monotonic()
     for i, chunk in enumerate(split_into_chunks(text, size - prefix_len), 1):
-        time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
+        if _pause(random.uniform(DELAY_MIN, DELAY_MAX)):
+            logger.info("reply to %s cancelled after %d/%d chunks", target, i - 1, total)
+            if trace is not None:
+                trace["outcome"] = "cancelled"
+            break
         chunk = f"[{i}/{total}] {chunk}"
+        if trace is not None:
+            trace["chunks"] = trace.get("chunks", 0) + 1
+            trace["tx_bytes"] = trace.get("tx_bytes", 0) + len(chunk.encode("utf-8"))
         if channel:
             iface.sendText(chunk, channelIndex=target, wantAck=False)
         else:
@@ -304,12 +524,18 @@ def send_chunked_text(
                 except Exception:
                     if attempt == 2:
                         logger.warning("no ACK after 3 tries")
-                    time.sleep(RETRY_DELAY)
+                    if _pause(RETRY_DELAY):
+                        break
+    if trace is not None:
+        tx_ms = (time.monotonic() - started) * 1000
+        trace["tx_ms"] = round(trace.get("tx_ms", 0) + tx_ms, 1)
 
 
 def reset_script(iface: SerialInterface) -> None:
     iface.close()
     executor.shutdown(wait=False)
+    flush_boards()
+    hibernate_games()
     args = [a for a in sys.argv if a != "--no-boot"]
     args.append("--no-boot")
     os.execv(sys.executable, [sys.executable] + args)
@@ -343,12 +569,20 @@ def is_addressed(text: str, direct: bool, channel_id: int, user: int) -> bool:
     return False
 
 
+def message_kind(text: str) -> str:
+    """The command a message starts with if it is one of ``MESSAGE_KINDS``, else ``llm``."""
+    words = HANDLE_PREFIX_RE.sub("", text).lower().split(maxsplit=1)
+    return words[0] if words and words[0] in MESSAGE_KINDS else "llm"
+
+
 def handle_message(
     target: int,
     text: str,
     iface: SerialInterface,
     is_channel: bool = False,
     user: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+    trace: Optional[dict] = None,
 ) -> None:
     """Handle an incoming user message and send an appropriate reply.
 
@@ -366,6 +600,15 @@ def handle_message(
         direct message.
     user:
         Identifier of the originating user, used for conversation state.
+    cancel:
+        Event set when a newer request from the same user supersedes this one.
+        Once set, the reply is abandoned and no further chunks are sent. A
+        request in ``STATEFUL_KINDS`` (a BBS post, a game move...) superseded
+        before it started still runs, with its whole reply.
+    trace:
+        Metrics record for this message, started by :func:`on_receive`. Stage
+        timings and the outcome are added to it and it is written to
+        ``metrics`` when handling ends.
 
     Side Effects
     ------------
@@ -379,9 +622,47 @@ def handle_message(
     used concurrently.
     """
 
+    if trace is not None:
+        trace["queue_ms"] = round((time.time() - trace["ts"]) * 1000, 1)
+    if cancel is not None and cancel.is_set():
+        if message_kind(text) not in STATEFUL_KINDS:
+            logger.debug("request for %s superseded before it started", target)
+            if trace is not None:
+                trace["outcome"] = "superseded"
+                metrics.write(trace)
+            return
+        # A newer message must not lose a post or a move; only replies are superseded.
+        cancel = None
+    _reply_ctx.cancel = cancel
+    _reply_ctx.trace = trace
+    try:
+        _handle_message(target, text, iface, is_channel, user)
+    except Exception:
+        trace_note(outcome="error")
+        raise
+    finally:
+        _reply_ctx.cancel = None
+        _reply_ctx.trace = None
+        if cancel is not None:
+            end_reply((target, user), cancel)
+        if trace is not None:
+            trace.setdefault("outcome", "ok")
+            trace["total_ms"] = round((time.time() - trace["ts"]) * 1000, 1)
+            metrics.write(trace)
+
+
+def _handle_message(
+    target: int,
+    text: str,
+    iface: SerialInterface,
+    is_channel: bool,
+    user: Optional[int],
+) -> None:
     text = safe_text(text, MAX_TEXT_LEN)
-    text = HANDLE_PREFIX_RE.sub("", text)
+    # Dropping a leading handle cannot make sanitized text unsafe.
+    text = SafeText(HANDLE_PREFIX_RE.sub("", text))
     lower = text.lower()
+    trace_note(kind=message_kind(text))
 
     if lower.startswith("bbs"):
         parts = text.split(maxsplit=1)
@@ -396,11 +677,19 @@ def handle_message(
         return
 
     if not is_safe_prompt(text):
+        trace_note(outcome="refused")
         reply = "fuck off."
         log_message("OUT", target, reply, channel=is_channel)
         send_chunked_text(reply, target, iface, channel=is_channel)
         return
 
+    if lower == "stop":
+        # Any earlier reply to this user was already cancelled on receipt.
+        reply = "Stopped."
+        log_message("OUT", target, reply, channel=is_channel)
+        send_chunked_text(reply, target, iface, channel=is_channel)
+        return
+
     if lower == "help":
         reply = MENU
         log_message("OUT", target, reply, channel=is_channel)
@@ -411,6 +700,7 @@ def handle_message(
         parts = text.split(maxsplit=1)
         loc = parts[1] if len(parts) > 1 else DEFAULT_LOCATION
         loc = safe_text(loc, MAX_LOC_LEN)
+        trace_note(cache=weather_cache.status(loc))
         reply = get_weather(loc)
         log_message("OUT", target, reply, channel=is_channel)
         send_chunked_text(reply, target, iface, channel=is_channel)
@@ -424,23 +714,36 @@ def handle_message(
         return
 
     if any(k in lower for k in ("code", "script", "write a", "hello world")):
+        trace_note(outcome="refused")
         reply = "Not my gig."
         log_message("OUT", target, reply, channel=is_channel)
         send_chunked_text(reply, target, iface, channel=is_channel)
         return
 
+    level = current_load_level()
+    if is_channel and level.pause_channel_chat:
+        trace_note(outcome="busy")
+        if busy_notices.seen((target, user)):
+            return
+        reply = "Busy right now; DM me instead."
+        log_message("OUT", target, reply, channel=is_channel)
+        send_chunked_text(reply, target, iface, channel=is_channel)
+        return
+
     history = record_message(target, "user", text)
+    if len(history) > level.history_len + 1:
+        history = history[:1] + history[-level.history_len:]
     payload = {
-        "model": MODEL_NAME,
+        "model": level.model or MODEL_NAME,
         "messages": history,
         "temperature": 0.7,
-        "max_tokens": 300,
+        "max_tokens": level.max_tokens,
     }
-    headers = {"Authorization": f"Bearer {API_KEY}"} if API_KEY else None
+    started = time.monotonic()
     try:
         r = requests.post(
             f"{API_BASE}/chat/completions",
-            headers=headers,
+            headers=api_headers(),
             json=payload,
             timeout=60,
             verify=True,
@@ -452,16 +755,36 @@ def handle_message(
         status = e.response.status_code if e.response else "unknown"
         detail = e.response.text.strip() if e.response else str(e)
         reply = f"HTTP error {status}: {detail}"
+        trace_note(outcome="llm_error")
     except Exception as e:
         reply = f"Error: {e}"
+        trace_note(outcome="llm_error")
     finally:
         del payload
+        llm_time = time.monotonic() - started
+        load_controller.observe_latency(llm_time)
+    trace_note(llm_ms=round(llm_time * 1000, 1))
+
+    if reply_cancelled():
+        logger.info("discarding superseded reply for %s", target)
+        trace_note(outcome="cancelled")
+        return
 
     reply = strip_llm_artifacts(reply)
     reply = safe_text(reply, MAX_TEXT_LEN)
     record_message(target, "assistant", reply)
     log_message("OUT", target, reply, channel=is_channel)
+    sent = time.monotonic()
     send_chunked_text(reply, target, iface, channel=is_channel)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "replied to %s",
+            target,
+            extra={
+                "llm_ms": round(llm_time * 1000, 1),
+                "tx_ms": round((time.monotonic() - sent) * 1000, 1),
+            },
+        )
 
 
 def on_receive(
@@ -471,6 +794,7 @@ def on_receive(
 ) -> None:
     try:
         pkt = packet or {}
+        received = pkt.get("rx_time") or time.time()
         iface = cast(SerialInterface, interface)
         chan_info = pkt.get("channel")
         if isinstance(chan_info, dict):
@@ -498,15 +822,20 @@ def on_receive(
         except UnicodeEncodeError:
             logger.warning("drop malformed packet from %s", pkt.get("from"))
             return
+        if text.startswith(SYNC_PREFIX) and deliver_sync(
+            text, pkt.get("from"), channel, to == iface.myInfo.my_node_num
+        ):
+            return
         text = safe_text(text, MAX_TEXT_LEN)
-        logger.debug(
-            "chan_raw=%s parsed=%s to=%s from=%s text='%s'",
-            chan_info,
-            channel,
-            to,
-            pkt.get("from"),
-            redact_sensitive(text),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "chan_raw=%s parsed=%s to=%s from=%s text='%s'",
+                chan_info,
+                channel,
+                to,
+                pkt.get("from"),
+                Redacted(text),
+            )
         if not text:
             logger.debug("no text; ignoring packet")
             return
@@ -527,6 +856,17 @@ def on_receive(
             logger.debug("ignoring own message")
             return
 
+        dedupe_key = packet_key(src, pkt.get("id"), to if is_dm else channel, text)
+        if recent_packets.seen(dedupe_key, DEDUPE_TTL if pkt.get("id") else DEDUPE_HASH_TTL):
+            metrics.write({"ts": round(received, 3), "peer": src, "outcome": "duplicate"})
+            logger.debug(
+                "duplicate packet %s from %s suppressed (%d total)",
+                pkt.get("id"),
+                src,
+                recent_packets.suppressed,
+            )
+            return
+
         if not is_addressed(text, is_dm, channel, src):
             logger.debug("message not addressed to bot; ignoring")
             return
@@ -536,12 +876,77 @@ def on_receive(
 
         target = src if is_dm else channel
         log_message("IN", target, text, channel=not is_dm)
-        if executor.submit(handle_message, target, text, iface, not is_dm, src) is None:
+        trace = {"ts": round(received, 3), "peer": src, "target": target, "channel": not is_dm}
+        cancel = threading.Event()
+        supersede_reply((target, src), cancel)
+        if executor.submit(
+            handle_message, target, text, iface, not is_dm, src, cancel=cancel, trace=trace
+        ) is None:
+            end_reply((target, src), cancel)
+            # Let a retransmission of this packet be handled once there is room.
+            recent_packets.forget(dedupe_key)
             logger.warning("Dropping message for target %s due to full queue", target)
+            trace.update(outcome="dropped", reason="queue_full")
+            metrics.write(trace)
     except Exception:
         logger.exception("Error in on_receive")
 
 
+_INGRESS_FIELDS = ("from", "to", "id", "channel", "channelIndex", "channel_index")
+
+
+def receive_packet(
+    packet: Optional[dict] = None,
+    interface: Optional[SerialInterface] = None,
+    **kwargs,
+) -> None:
+    """Copy the fields ``on_receive`` needs and queue them for the dispatcher.
+
+    Runs on the meshtastic reader thread, so it does no parsing, logging or
+    locking beyond the queue hand-off.
+    """
+
+    pkt = packet or {}
+    fields = {k: pkt[k] for k in _INGRESS_FIELDS if k in pkt}
+    fields["rx_time"] = time.time()
+    decoded = pkt.get("decoded")
+    if isinstance(decoded, dict):
+        fields["decoded"] = {"text": decoded.get("text", "")}
+    if not ingress.put((fields, interface)):
+        logger.warning(
+            "ingress queue full (%d); dropped %d packets", ingress.maxsize, ingress.dropped
+        )
+
+
+_ingress_drops_recorded = 0
+
+
+def _dispatch_packet(packet: dict, interface: Optional[SerialInterface]) -> None:
+    global _ingress_drops_recorded
+    on_receive(packet=packet, interface=interface)
+    dropped = ingress.dropped
+    if dropped != _ingress_drops_recorded:
+        metrics.write(
+            {
+                "ts": round(time.time(), 3),
+                "outcome": "dropped",
+                "reason": "ingress_full",
+                "count": dropped - _ingress_drops_recorded,
+            }
+        )
+        _ingress_drops_recorded = dropped
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "ingress depth=%d high_water=%d dropped=%d",
+            ingress.depth,
+            ingress.high_water,
+            ingress.dropped,
+        )
+
+
+ingress = IngressQueue(_dispatch_packet, INGRESS_QUEUE_SIZE)
+
+
 def greeting_loop(iface: SerialInterface) -> None:
     if BEACON_HOUR is not None and BEACON_MESSAGE:
         while True:
@@ -595,11 +1000,22 @@ def main():
     def shutdown(signum, frame):
         iface.close()
         executor.shutdown(wait=False)
+        hibernate_games()
         sys.exit(0)
 
     signal.signal(signal.SIGTERM, shutdown)
 
-    pub.subscribe(on_receive, "meshtastic.receive.text")
+    if BACKEND_WAIT > 0:
+        if not prepare_backend(BACKEND_WAIT):
+            print(f"Backend {API_BASE} not ready; continuing anyway.")
+    else:
+        threading.Thread(target=prepare_backend, daemon=True).start()
+
+    start_weather_prefetch(DEFAULT_LOCATION)
+    start_compactor()
+    start_replication(iface)
+    ingress.start()
+    pub.subscribe(receive_packet, "meshtastic.receive.text")
     if respond_channels:
         chs = ", ".join(str(c) for c in sorted(respond_channels))
         print(f"Meshtastic ↔️ {SOUL_NAME} ready. DMs or channel(s) {chs}")
@@ -621,6 +1037,7 @@ def main():
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        hibernate_games()
         iface.close()
         executor.shutdown(wait=False)
         print("Stopped.")
@@ -0,0 +1,331 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from adventure.game import SNAPSHOT_EVERY, Game, World, first_sentence
+from adventure.world import DEFAULT_WORLD, DIRECTIONS, WorldError, validate, main as world_main
+
+
+class WorldTemplateTests(unittest.TestCase):
+    def play(self, game, command):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            for verb, noun, prep in game.parser.parse(command):
+                game.run_command(verb, noun, prep)
+        return buf.getvalue()
+
+    def test_games_share_one_parsed_world(self):
+        a, b = Game(), Game()
+        self.assertIs(a.world, b.world)
+        self.assertIs(a.world, World.load())
+        self.assertIs(a.parser, b.parser)
+
+    def test_changes_stay_in_the_players_overlay(self):
+        a, b = Game(), Game()
+        self.assertIn("Taken.", self.play(a, "take lamp"))
+        self.assertEqual([i.name for i in a.items_in(1)], [])
+        self.assertEqual([i.name for i in b.items_in(1)], ["lamp"])
+        self.assertEqual(a.world.rooms[1].items[0].name, "lamp")
+        self.assertIn("You see: lamp", self.play(b, "look"))
+
+    def test_description_shown_once_per_game(self):
+        a, b = Game(), Game()
+        desc = a.current_room().desc
+        self.assertIn(desc, self.play(a, "look"))
+        self.assertNotIn(desc, self.play(a, "look"))
+        self.assertIn(desc, self.play(b, "look"))
+
+    def test_template_is_read_only(self):
+        room = World.load().rooms[1]
+        with self.assertRaises(TypeError):
+            room.exits["north"] = 2
+        with self.assertRaises(AttributeError):
+            Game().extra = 1
+
+    def test_save_and_restore_overlay(self):
+        a = Game(seed=1)  # the thief stays away on this seed
+        self.play(a, "look and take lamp and east")
+        with tempfile.TemporaryDirectory() as tmp:
+            a.save_dir = tmp
+            self.play(a, "save")
+            b = Game()
+            b.save_dir = tmp
+            self.assertIn("Restored.", self.play(b, "restore"))
+        self.assertEqual(b.player_room, 2)
+        self.assertEqual([i.name for i in b.inventory], ["lamp"])
+        self.assertEqual(list(b.items_in(1)), [])
+        self.assertEqual(b.visited, {1, 2})
+
+
+class WorldCompilerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "world.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def small_world(self, desc="A cave."):
+        return {
+            "items": {"gem": {"name": "gem", "weight": 1, "desc": "Shiny."}},
+            "rooms": [
+                {"id": 1, "name": "Cave", "desc": desc, "exits": {"east": 2}, "items": ["gem"]},
+                {"id": 2, "name": "Hall", "desc": "A hall.", "exits": {"west": 1}},
+            ],
+            "locks": {},
+        }
+
+    def test_reports_every_problem(self):
+        data = self.small_world()
+        data["rooms"][0]["exits"]["sideways"] = 9
+        data["rooms"][1]["items"] = ["gem", "ghost"]
+        data["locks"] = {"2": ["north"]}
+        errors = validate(data)
+        self.assertEqual(len(errors), 5, errors)
+        self.write(data)
+        with self.assertRaises(WorldError):
+            World.load(self.path)
+
+    def test_missing_locks_means_no_locks(self):
+        data = self.small_world()
+        del data["locks"]
+        self.assertEqual(validate(data), [])
+        self.write(data)
+        self.assertEqual(dict(World.load(self.path).locks), {})
+
+    def test_reports_malformed_fields_instead_of_crashing(self):
+        data = self.small_world()
+        data["rooms"][0]["exits"]["east"] = [2]
+        data["items"]["gem"]["colour"] = "red"
+        data["start"] = [1]
+        errors = validate(data)
+        self.assertEqual(len(errors), 3, errors)
+        self.write(data)
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            self.assertEqual(world_main(["world", self.path]), 1)
+        self.assertIn("unknown field 'colour'", buf.getvalue())
+
+    def test_recompiled_when_file_changes(self):
+        self.write(self.small_world())
+        first = World.load(self.path)
+        self.assertIs(World.load(self.path), first)
+        self.write(self.small_world(desc="A much bigger cave."))
+        os.utime(self.path, ns=(1, 1))
+        second = World.load(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.rooms[1].desc, "A much bigger cave.")
+
+    def test_indexes(self):
+        self.write(self.small_world())
+        world = World.load(self.path)
+        room = world.rooms[1]
+        self.assertEqual(room.exit_table[DIRECTIONS.index("east")], 2)
+        self.assertIsNone(room.exit_table[DIRECTIONS.index("north")])
+        self.assertIs(room.item_map["gem"], world.items["gem"])
+        self.assertEqual(world.items["gem"].id, 0)
+        game = Game(self.path, output=lambda _line: None)
+        self.assertEqual(game.locked_doors, {})
+        self.assertIs(game.verbs["take"], Game.do_take)
+        game.run_command("take", "gem", "")
+        self.assertEqual([i.name for i in game.inventory], ["gem"])
+
+    def test_bundled_world_is_valid(self):
+        with open(DEFAULT_WORLD) as f:
+            self.assertEqual(validate(json.load(f)), [])
+
+
+class TerseOutputTests(unittest.TestCase):
+    def play(self, game, command):
+        lines = []
+        game.output = lines.append
+        for verb, noun, prep in game.parser.parse(command):
+            game.run_command(verb, noun, prep)
+        return lines
+
+    def test_terse_room_output_sends_only_changes(self):
+        game = Game(seed=1)
+        game.terse = True
+        first = self.play(game, "east")
+        self.assertEqual(first[0], "Room 2: Abandoned Guardroom")
+        self.assertEqual(first[1], "Rusted spears litter the floor and torn banners hang limply from iron rings.")
+        self.assertEqual(first[2:], ["Exits: s w e", "See: key"])
+        self.play(game, "west")
+        self.assertEqual(self.play(game, "east"), ["Room 2: Abandoned Guardroom", "Exits: s w e"])
+        look = self.play(game, "look")
+        self.assertIn(game.current_room().desc, look)
+        self.assertIn("See: key", look)
+
+    def test_first_sentence_keeps_its_terminator(self):
+        self.assertEqual(first_sentence("Run! The roof shakes."), "Run!")
+        self.assertEqual(first_sentence("Who goes there? Silence."), "Who goes there?")
+        self.assertEqual(first_sentence("A 2.5 m drop. Careful."), "A 2.5 m drop.")
+        self.assertEqual(first_sentence("No full stop"), "No full stop")
+
+    def test_terse_score_delta_and_inventory(self):
+        game = Game(seed=1)
+        game.terse = True
+        game.inventory.append(game.items["treasure"])
+        self.assertEqual(self.play(game, "inventory"), ["Carrying: treasure (5/10)"])
+        self.assertEqual(self.play(game, "use scroll")[-1], "Score +5 (5)")
+
+    def test_toggle(self):
+        game = Game()
+        self.assertEqual(self.play(game, "terse"), ["Terse"])
+        self.assertTrue(Game.from_dict(game.to_dict()).terse)
+
+
+class EventLogSaveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def game(self, seed=7):
+        game = Game(seed=seed, output=lambda _line: None)
+        game.save_dir = self.tmp.name
+        return game
+
+    def play(self, game, command):
+        lines = []
+        game.output = lines.append
+        for verb, noun, prep in game.parser.parse(command):
+            game.run_command(verb, noun, prep)
+        return "\n".join(lines)
+
+    def wander(self, game):
+        self.play(game, "take lamp and east and take key")
+        for _ in range(20):
+            self.play(game, "west and east")
+
+    def test_seeded_games_replay_identically(self):
+        a, b = self.game(), self.game()
+        self.wander(a)
+        self.wander(b)
+        self.assertEqual(a.to_dict(), b.to_dict())
+
+    def test_restore_replays_journal_including_thief(self):
+        a = self.game()
+        self.wander(a)
+        self.play(a, "save")
+        b = self.game(seed=99)
+        self.play(b, "restore")
+        self.assertEqual(b.to_dict(), a.to_dict())
+        self.assertEqual(b.journal, a.journal)
+
+    def test_saves_append_only_new_commands(self):
+        a = self.game()
+        self.play(a, "look")
+        self.play(a, "save")
+        path = os.path.join(self.tmp.name, "default.log")
+        size = os.path.getsize(path)
+        self.play(a, "take lamp")
+        self.play(a, "save")
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[1:], ['"look"', '"take lamp"'])
+        self.assertLess(os.path.getsize(path) - size, 16)
+
+    def test_snapshots_bound_the_journal(self):
+        a = self.game()
+        for _ in range(SNAPSHOT_EVERY + 5):
+            self.play(a, "look")
+        self.assertEqual(len(a.journal), 5)
+        self.play(a, "save")
+        with open(os.path.join(self.tmp.name, "default.log")) as f:
+            self.assertEqual(len(f.readlines()), 6)
+        b = self.game()
+        self.play(b, "restore")
+        self.assertEqual(b.move_count, SNAPSHOT_EVERY + 5)
+
+    def test_named_slots(self):
+        a = self.game()
+        self.play(a, "save start")
+        self.play(a, "take lamp and save lamp")
+        self.assertEqual(self.play(a, "saves"), "Saves: lamp, start")
+        self.play(a, "restore start")
+        self.assertEqual(a.inventory, [])
+        self.play(a, "restore lamp")
+        self.assertEqual([i.name for i in a.inventory], ["lamp"])
+        self.assertIn("Slot names", self.play(a, "save ../etc"))
+        self.assertIn("Unable to load", self.play(a, "restore nothing"))
+
+    def test_save_commands_are_not_moves(self):
+        a = self.game()
+        self.play(a, "save and saves")
+        self.assertEqual(a.move_count, 0)
+        self.assertEqual(a.journal, [])
+
+class NavigationTests(unittest.TestCase):
+    def game(self):
+        return Game(seed=3, output=lambda _line: None)
+
+    def play(self, game, command):
+        lines = []
+        game.output = lines.append
+        for verb, noun, prep in game.parser.parse(command):
+            game.run_command(verb, noun, prep)
+        return "\n".join(lines)
+
+    def test_routes_respect_locked_doors(self):
+        world = World.load()
+        open_routes = world.routes()
+        locked = world.routes(frozenset({(10, "east")}))
+        self.assertEqual(open_routes.path(10, 11, world.rooms), ["east"])
+        self.assertEqual(len(locked.path(10, 11, world.rooms)), 3)
+        self.assertEqual(open_routes.distance[1][30], 9)
+        self.assertIs(world.routes(frozenset({(10, "east")})), locked)
+
+    def test_go_walks_to_visited_rooms_only(self):
+        a = self.game()
+        self.assertIn("don't know the way", self.play(a, "go shrine of echoes"))
+        self.play(a, "south and east and east and east")
+        self.assertEqual(a.player_room, 10)
+        reply = self.play(a, "go entrance")
+        self.assertEqual(a.player_room, 1)
+        self.assertTrue(reply.startswith("Room 1: Dusty Entrance Hall"))
+        self.assertEqual(reply.count("Room "), 1)
+        self.play(a, "go shrine of echoes")
+        self.assertEqual(a.player_room, 10)
+        self.assertEqual(a.journal[-1], ["go", "shrine of echoes", ""])
+        self.play(a, "go e")
+        self.assertEqual(a.player_room, 10)
+
+    def test_go_survives_save_and_restore(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            a = self.game()
+            a.save_dir = tmp
+            self.play(a, "east and east and go dusty entrance and save")
+            b = self.game()
+            b.save_dir = tmp
+            self.play(b, "restore")
+            self.assertEqual(b.player_room, 1)
+            self.assertEqual(b.move_count, 3)
+
+    def test_hint_leads_through_the_puzzle(self):
+        a = self.game()
+        self.assertIn("Get the lamp here", self.play(a, "hint"))
+        self.play(a, "take lamp")
+        self.assertIn("use lamp", self.play(a, "hint"))
+        self.play(a, "use lamp")
+        self.assertIn("Get the key in Room 2 (Abandoned Guardroom): 1 move, head east", self.play(a, "hint"))
+        self.play(a, "drop lamp and east and take key")
+        self.assertIn("use key door in Room 10", self.play(a, "hint"))
+        a.player_room = 10
+        self.play(a, "use key door")
+        self.assertIn("Get the treasure in Room 4", self.play(a, "hint"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,4 @@
-import os, sys, tempfile, shutil, atexit, json
+import os, sys, tempfile, shutil, atexit, json, threading
 from unittest.mock import patch
 import unittest
 
@@ -23,7 +23,7 @@ class SaveBoardFailureTests(unittest.TestCase):
                 pass
 
     def test_json_dump_failure_removes_temp_and_logs(self):
-        with patch("bbs.json.dump", side_effect=OSError("fail")):
+        with patch("bbs.json.dumps", side_effect=OSError("fail")):
             with self.assertLogs("meshtastic_llm_bot", level="ERROR") as cm:
                 bbs._save_board(1, ["post"])
             self.assertTrue(any("Failed to write board" in m for m in cm.output))
@@ -41,10 +41,116 @@ class SaveBoardFailureTests(unittest.TestCase):
             with self.assertLogs("meshtastic_llm_bot", level="ERROR") as cm:
                 bbs._save_board(1, ["post"])
             self.assertTrue(any("Failed to chmod" in m for m in cm.output))
-        board_path = os.path.join(BBS_DIR, "1.json")
+        board_path = os.path.join(BBS_DIR, "1.jsonl")
         self.assertTrue(os.path.exists(board_path))
         with open(board_path, "r", encoding="utf-8") as f:
-            self.assertEqual(json.load(f), ["post"])
+            self.assertEqual([json.loads(line) for line in f], ["post"])
+
+    def test_append_failure_logs(self):
+        with patch("bbs.os.write", side_effect=OSError("disk full")):
+            with self.assertLogs("meshtastic_llm_bot", level="ERROR") as cm:
+                self.assertFalse(bbs._append_post(1, "post"))
+            self.assertTrue(any("Failed to append" in m for m in cm.output))
+
+
+class AppendOnlyStorageTests(unittest.TestCase):
+    def setUp(self):
+        for f in os.listdir(BBS_DIR):
+            os.remove(os.path.join(BBS_DIR, f))
+
+    def test_posts_are_appended(self):
+        bbs._append_post(2, "a: one")
+        bbs._append_post(2, "b: two")
+        path = os.path.join(BBS_DIR, "2.jsonl")
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        self.assertEqual(bbs._load_board(2), ["a: one", "b: two"])
+
+    def test_legacy_board_is_migrated(self):
+        with open(os.path.join(BBS_DIR, "3.json"), "w", encoding="utf-8") as f:
+            json.dump(["old: post"], f)
+        self.assertEqual(bbs._load_board(3), ["old: post"])
+        self.assertFalse(os.path.exists(os.path.join(BBS_DIR, "3.json")))
+        bbs._append_post(3, "new: post")
+        self.assertEqual(bbs._load_board(3), ["old: post", "new: post"])
+
+    def test_torn_line_is_dropped(self):
+        bbs._append_post(4, "a: one")
+        with open(os.path.join(BBS_DIR, "4.jsonl"), "a", encoding="utf-8") as f:
+            f.write('"b: tw')
+        with self.assertLogs("meshtastic_llm_bot", level="WARNING"):
+            self.assertEqual(bbs._load_board(4), ["a: one"])
+        bbs._append_post(4, "c: three")
+        self.assertEqual(bbs._load_board(4), ["a: one", "c: three"])
+
+
+class BoardCacheTests(unittest.TestCase):
+    def setUp(self):
+        bbs.bbs_posts.clear()
+        for f in os.listdir(BBS_DIR):
+            os.remove(os.path.join(BBS_DIR, f))
+
+    def test_posts_are_written_behind(self):
+        with bbs.bbs_posts.use(5) as board:
+            self.assertEqual(board.append("a: one"), 1)
+        self.assertFalse(os.path.exists(os.path.join(BBS_DIR, "5.jsonl")))
+        with bbs.bbs_posts.use(5) as board:
+            self.assertEqual(board.read(1, 1), ["a: one"])
+        bbs.flush_boards()
+        self.assertEqual(bbs._load_board(5), ["a: one"])
+
+    def test_flusher_writes_within_delay(self):
+        with patch.object(bbs._flusher, "delay", 0.01), bbs.bbs_posts.use(6) as board:
+            board.append("a: soon")
+        for _ in range(200):
+            if not board.pending:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(bbs._load_board(6), ["a: soon"])
+
+    def test_cache_is_bounded_and_keeps_dirty_boards(self):
+        cache = bbs.BoardCache(max_bytes=500)
+        for target in range(10, 14):
+            with cache.use(target):
+                pass
+        self.assertLess(len(cache), 4)
+        self.assertIn(13, cache)
+        with cache.use(20) as dirty:
+            dirty.append("x" * 400)
+        with cache.use(21):
+            pass
+        self.assertIn(20, cache)
+        cache.clear()
+        self.assertEqual(bbs._load_board(20), ["x" * 400])
+
+    def test_board_in_use_survives_eviction(self):
+        cache = bbs.BoardCache(max_bytes=300)
+        with cache.use(40) as board:
+            for target in range(41, 45):
+                with cache.use(target):
+                    pass
+            self.assertIn(40, cache)
+            first = board.append("a: first")
+        bbs.flush_boards()
+        for target in range(41, 45):
+            with cache.use(target):
+                pass
+        with cache.use(40) as board:
+            second = board.append("b: second")
+        bbs.flush_boards()
+        self.assertEqual((first, second), (1, 2))
+        self.assertEqual(bbs._load_board(40), ["a: first", "b: second"])
+
+    def test_boards_do_not_block_each_other(self):
+        replies = []
+        with bbs.bbs_posts.use(30):
+            t = threading.Thread(
+                target=bbs.handle_bbs,
+                args=(31, "post hi", None, True, 1, lambda *a, **k: None,
+                      lambda text, *a, **k: replies.append(text)),
+            )
+            t.start()
+            t.join(2)
+        self.assertEqual(replies, ["Post #1 recorded."])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+import os, sys, tempfile, shutil, atexit
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+BBS_DIR = tempfile.mkdtemp(prefix="bbs-test-")
+os.environ["MESHTASTIC_BBS_DIR"] = BBS_DIR
+atexit.register(lambda: shutil.rmtree(BBS_DIR, ignore_errors=True))
+
+sys.modules.pop("bbs", None)
+import bbs
+
+
+class BBSTestCase(unittest.TestCase):
+    def setUp(self):
+        bbs.bbs_posts.clear()
+        for f in os.listdir(BBS_DIR):
+            os.remove(os.path.join(BBS_DIR, f))
+        self.replies = []
+
+    def run_bbs(self, command, target=7):
+        def send(text, target, iface, channel=False):
+            self.replies.append(text)
+
+        bbs.handle_bbs(target, command, None, True, 42, lambda *a, **k: None, send)
+        return self.replies[-1]
+
+    def post_many(self, n, target=7):
+        for i in range(1, n + 1):
+            self.run_bbs(f"post message number {i} " + "x" * 60, target)
+
+
+class BBSPagingTests(BBSTestCase):
+    def test_list_is_newest_first_and_fits_one_packet(self):
+        self.post_many(30)
+        reply = self.run_bbs("list")
+        lines = reply.splitlines()
+        self.assertEqual(lines[0], "Posts (30):")
+        self.assertTrue(lines[1].startswith("30. 42: message number 30"))
+        self.assertLessEqual(len(reply.encode("utf-8")), bbs.PAGE_BYTES)
+        self.assertTrue(lines[-1].startswith("More: bbs list "))
+
+    def test_list_cursor_continues_where_previous_page_ended(self):
+        self.post_many(30)
+        first_page = self.run_bbs("list")
+        cursor = int(first_page.splitlines()[-1].rsplit(" ", 1)[1])
+        second = self.run_bbs(f"list {cursor}")
+        self.assertTrue(second.splitlines()[1].startswith(f"{cursor}. "))
+        last = self.run_bbs("list 1")
+        self.assertNotIn("More:", last)
+
+    def test_read_range_packs_posts(self):
+        self.post_many(8)
+        reply = self.run_bbs("read 4-6")
+        lines = reply.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("#4 42: message number 4 "))
+        self.assertTrue(lines[2].startswith("#6 42: message number 6 "))
+
+    def test_read_range_is_capped(self):
+        self.post_many(15)
+        reply = self.run_bbs("read 1-15")
+        self.assertEqual(len(reply.splitlines()), bbs.MAX_READ_RANGE)
+
+    def test_read_errors(self):
+        self.post_many(2)
+        self.assertEqual(self.run_bbs("read 9"), "No such post.")
+        self.assertIn("Usage", self.run_bbs("read x"))
+
+    def test_index_survives_reload(self):
+        self.post_many(3)
+        bbs.bbs_posts.clear()
+        self.assertEqual(len(bbs.Board.load(7)), 3)
+        self.assertTrue(self.run_bbs("read 3").startswith("42: message number 3"))
+
+
+class BBSSearchTests(BBSTestCase):
+    def test_search_ranks_by_matching_terms(self):
+        self.run_bbs("post antenna swap meet saturday")
+        self.run_bbs("post need an antenna for the repeater")
+        self.run_bbs("post coffee meetup")
+        reply = self.run_bbs("search Antenna repeater")
+        lines = reply.splitlines()
+        self.assertEqual(lines[0], "Matches (2):")
+        self.assertTrue(lines[1].startswith("#2 "))
+        self.assertTrue(lines[2].startswith("#1 "))
+
+    def test_prefix_search(self):
+        self.run_bbs("post meetup at noon")
+        self.run_bbs("post meeting moved")
+        self.assertIn("Matches (2)", self.run_bbs("search meet*"))
+        self.assertEqual(self.run_bbs("search meet"), "No matches.")
+
+    def test_search_pages_results(self):
+        self.post_many(12)
+        reply = self.run_bbs("search message")
+        self.assertLessEqual(len(reply.encode("utf-8")), bbs.PAGE_BYTES)
+        footer = reply.splitlines()[-1]
+        self.assertTrue(footer.startswith("More: bbs search message /"))
+        nxt = self.run_bbs(footer[len("More: bbs ") :])
+        self.assertIn("Matches (12)", nxt)
+
+    def test_index_is_persisted_and_rebuilt(self):
+        self.run_bbs("post first radio")
+        self.run_bbs("search radio")
+        self.run_bbs("post second radio")
+        index_path = os.path.join(BBS_DIR, "7.idx.jsonl")
+        # Index lines for a post are only written once the post is on disk.
+        self.assertFalse(os.path.exists(index_path))
+        bbs.flush_boards()
+        with open(index_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        bbs.bbs_posts.clear()
+        self.assertIn("Matches (2)", self.run_bbs("search radio"))
+        os.remove(index_path)
+        bbs.bbs_posts.clear()
+        self.assertIn("Matches (2)", self.run_bbs("search radio"))
+        self.assertTrue(os.path.exists(index_path))
+
+
+class BBSRetentionTests(BBSTestCase):
+    def test_max_posts_archives_oldest_and_keeps_numbers(self):
+        self.post_many(12)
+        archived = bbs.compact_board(7, bbs.RetentionPolicy(max_posts=5))
+        self.assertEqual(archived, 7)
+        self.assertEqual(self.run_bbs("read 3"), "No such post.")
+        self.assertTrue(self.run_bbs("read 8").startswith("42: message number 8 "))
+        self.assertEqual(self.run_bbs("list").splitlines()[0], "Posts (5):")
+        self.run_bbs("post after compaction")
+        self.assertEqual(self.run_bbs("read 13"), "42: after compaction")
+        self.assertEqual([r["n"] for r in bbs.read_archive(7)], list(range(1, 8)))
+
+    def test_max_age_keeps_recent_and_untimestamped_posts(self):
+        self.post_many(4)
+        with bbs.bbs_posts.use(7) as board:
+            board.flush()
+        now = bbs.time.time()
+        policy = bbs.RetentionPolicy(max_age=60)
+        self.assertEqual(bbs.compact_board(7, policy, now=now), 0)
+        self.assertEqual(bbs.compact_board(7, policy, now=now + 120), 3)
+        with bbs.bbs_posts.use(7) as board:
+            self.assertEqual(len(board), 1)
+
+    def test_max_bytes_and_search_after_compaction(self):
+        self.run_bbs("post old antenna")
+        self.post_many(5)
+        self.run_bbs("post new antenna")
+        self.assertIn("Matches (2)", self.run_bbs("search antenna"))
+        bbs.compact_board(7, bbs.RetentionPolicy(max_bytes=200))
+        self.assertFalse(os.path.exists(os.path.join(BBS_DIR, "7.idx.jsonl")))
+        reply = self.run_bbs("search antenna")
+        self.assertIn("Matches (1)", reply)
+        self.assertIn("#7 ", reply)
+
+    def test_retention_file_overrides_defaults(self):
+        with open(bbs.RETENTION_FILE, "w", encoding="utf-8") as f:
+            f.write('{"default": {"max_posts": 9}, "3": {"max_age_days": 1}}')
+        self.assertEqual(bbs.retention_for(7), bbs.RetentionPolicy(max_posts=9))
+        self.assertEqual(bbs.retention_for(3), bbs.RetentionPolicy(max_age=86400))
+
+    def test_compact_boards_scans_directory(self):
+        self.post_many(3, target=1)
+        self.post_many(3, target=2)
+        with open(bbs.RETENTION_FILE, "w", encoding="utf-8") as f:
+            f.write('{"default": {"max_posts": 1}}')
+        self.assertEqual(bbs.compact_boards(), 4)
+
+    def test_compact_boards_skips_boards_without_a_limit(self):
+        self.post_many(3, target=1)
+        bbs.flush_boards()
+        bbs.bbs_posts.clear()
+        self.assertEqual(bbs.compact_boards(), 0)
+        self.assertIsNone(bbs.bbs_posts.get(1))
+
+
+def tearDownModule():
+    sys.modules.pop("bbs", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
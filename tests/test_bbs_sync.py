@@ -0,0 +1,212 @@
+import os, sys, tempfile, shutil, atexit
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+BBS_DIR = tempfile.mkdtemp(prefix="bbs-sync-test-")
+os.environ["MESHTASTIC_BBS_DIR"] = BBS_DIR
+atexit.register(lambda: shutil.rmtree(BBS_DIR, ignore_errors=True))
+
+sys.modules.pop("bbs", None)
+sys.modules.pop("bbs_sync", None)
+import bbs
+import bbs_sync
+
+
+class FakeIface:
+    def __init__(self):
+        self.sent = []
+
+    def sendText(self, text, channelIndex=0):
+        self.sent.append((text, channelIndex))
+
+
+class ReplicatorTests(unittest.TestCase):
+    def setUp(self):
+        bbs.bbs_posts.clear()
+        for f in os.listdir(BBS_DIR):
+            path = os.path.join(BBS_DIR, f)
+            if os.path.isfile(path):
+                os.remove(path)
+        self.spool = tempfile.mkdtemp(dir=BBS_DIR)
+        self.transport = bbs_sync.FileTransport(self.spool, "local")
+        self.peer = bbs_sync.FileTransport(self.spool, "peer")
+        self.replicator = bbs_sync.Replicator(self.transport, node="local", boards={0})
+
+    def tearDown(self):
+        shutil.rmtree(self.spool, ignore_errors=True)
+
+    def post(self, text):
+        with bbs.bbs_posts.use(0) as board:
+            return board.append(text, 42)
+
+    def test_peer_receives_only_posts_above_its_vector(self):
+        self.post("one")
+        self.post("two")
+        self.peer.send({"type": "vector", "node": "peer", "board": 0, "vector": {"local": 1}})
+        self.replicator.sync_once()
+        messages = self.peer.receive()
+        posts = [m for m in messages if m["type"] == "posts"]
+        self.assertEqual(len(posts), 1)
+        self.assertEqual(posts[0]["to"], "peer")
+        self.assertEqual([p["id"] for p in posts[0]["posts"]], ["local:2"])
+        vector = [m for m in messages if m["type"] == "vector"][0]
+        self.assertEqual(vector["vector"], {"local": 2})
+
+    def test_merge_is_idempotent_and_survives_reload(self):
+        self.post("local post")
+        remote = [
+            {"id": "peer:1", "ts": 100, "user": 7, "text": "hello from afar"},
+            {"id": "peer:2", "ts": 101, "user": 7, "text": "second"},
+        ]
+        self.assertEqual(self.replicator.merge(0, remote), 2)
+        self.assertEqual(self.replicator.merge(0, remote), 0)
+        self.assertEqual(self.replicator.merge(0, [{"id": "local:1", "text": "echo"}]), 0)
+        with bbs.bbs_posts.use(0) as board:
+            self.assertEqual(board.read(1, 3), ["42: local post", "7: hello from afar", "7: second"])
+        bbs.bbs_posts.clear()
+        fresh = bbs_sync.Replicator(self.transport, node="local", boards={0})
+        self.assertEqual(fresh.vector(0), {"local": 1, "peer": 2})
+        self.assertEqual(fresh.merge(0, remote), 0)
+
+    def test_vector_counts_only_posts_written_here(self):
+        self.post("one")
+        self.replicator.merge(0, [{"id": "peer:1", "ts": 1, "user": 7, "text": "x"}])
+        self.assertEqual(self.replicator.vector(0), {"local": 1, "peer": 1})
+        self.assertEqual(self.post("two"), 3)
+        self.replicator.merge(0, [{"id": "peer:2", "ts": 2, "user": 7, "text": "y"}])
+        self.assertEqual(self.replicator.vector(0), {"local": 3, "peer": 2})
+
+    def test_merged_posts_are_not_sent_back_to_their_origin(self):
+        self.replicator.merge(0, [{"id": "peer:5", "ts": 1, "user": None, "text": "x"}])
+        self.assertEqual(self.replicator.changes_since(0, {"peer": 5}), [])
+        self.assertEqual(len(self.replicator.changes_since(0, {})), 1)
+
+    def test_ignores_unshared_boards_and_bad_posts(self):
+        self.peer.send(
+            {"type": "posts", "node": "peer", "board": 99, "posts": [{"id": "peer:1", "text": "x"}]}
+        )
+        self.peer.send(
+            {"type": "posts", "node": "peer", "board": 0, "posts": [{"id": "nonsense", "text": "x"}, "junk"]}
+        )
+        self.assertEqual(self.replicator.sync_once(), 0)
+        with bbs.bbs_posts.use(0) as board:
+            self.assertEqual(len(board), 0)
+
+
+class MeshTransportTests(unittest.TestCase):
+    def test_airtime_budget_defers_sends(self):
+        now = [0.0]
+        iface = FakeIface()
+        mesh = bbs_sync.MeshTransport(iface, 2, airtime=60, peers={5}, clock=lambda: now[0])
+        message = {"type": "vector", "node": "n", "board": 0, "vector": {"n": 1}}
+        sent = 0
+        while mesh.send(message):
+            sent += 1
+        self.assertGreater(sent, 0)
+        self.assertEqual(len(iface.sent), sent)
+        self.assertEqual(iface.sent[0][1], 2)
+        self.assertTrue(iface.sent[0][0].startswith(bbs_sync.SYNC_PREFIX))
+        now[0] += 60
+        self.assertTrue(mesh.send(message))
+
+    def test_large_vector_is_split_and_joined(self):
+        iface = FakeIface()
+        mesh = bbs_sync.MeshTransport(iface, 0, airtime=60, secret="k")
+        vector = {f"node{i:02d}": 1000 + i for i in range(30)}
+        message = {"type": "vector", "node": "n", "board": 0, "vector": vector}
+        self.assertTrue(mesh.send(message))
+        self.assertGreater(len(iface.sent), 1)
+        for text, _ in iface.sent:
+            self.assertLessEqual(len(text.encode("utf-8")), bbs_sync.MESH_MAX_BYTES)
+        receiver = bbs_sync.MeshTransport(FakeIface(), 0, secret="k")
+        for text, _ in iface.sent[:-1]:
+            receiver.deliver(text, 5, 0)
+        self.assertEqual(receiver.receive(), [])
+        receiver.deliver(iface.sent[-1][0], 5, 0)
+        self.assertEqual(receiver.receive(), [message])
+        # A round missing a part never produces a partial vector.
+        for text, _ in iface.sent[1:]:
+            receiver.deliver(text, 5, 0)
+        self.assertEqual(receiver.receive(), [])
+
+    def test_oversized_post_is_skipped_with_warning(self):
+        iface = FakeIface()
+        mesh = bbs_sync.MeshTransport(iface, 0, peers={5})
+        post = {"id": "n:1", "ts": 1, "user": 1, "text": "x" * 300}
+        with self.assertLogs("meshtastic_llm_bot", "WARNING"):
+            self.assertTrue(mesh.send({"type": "posts", "node": "n", "board": 0, "posts": [post]}))
+        self.assertEqual(iface.sent, [])
+
+    def test_deliver_filters_peers_and_channel(self):
+        mesh = bbs_sync.MeshTransport(FakeIface(), 3, peers={5})
+        text = bbs_sync.SYNC_PREFIX + '{"type": "vector"}'
+        self.assertFalse(mesh.deliver("hello", 5, 3))
+        self.assertTrue(mesh.deliver(text, 6, 3))
+        self.assertTrue(mesh.deliver(text, 5, 0))
+        self.assertTrue(mesh.deliver(text, 5, 3, direct=True))
+        self.assertEqual(mesh.receive(), [])
+        self.assertTrue(mesh.deliver(text, 5, 3))
+        self.assertEqual(mesh.receive(), [{"type": "vector"}])
+
+    def test_requires_peers_or_secret(self):
+        with self.assertRaises(ValueError):
+            bbs_sync.MeshTransport(FakeIface(), 0)
+
+    def test_secret_rejects_unsigned_packets(self):
+        iface = FakeIface()
+        message = {"type": "vector", "node": "n", "board": 0, "vector": {"n": 1}}
+        bbs_sync.MeshTransport(iface, 0, secret="k").send(message)
+        receiver = bbs_sync.MeshTransport(FakeIface(), 0, secret="k")
+        forged = bbs_sync.SYNC_PREFIX + '{"type": "vector"}'
+        with self.assertLogs("meshtastic_llm_bot", "WARNING"):
+            receiver.deliver(forged, 9, 0)
+        receiver.deliver(iface.sent[0][0], 9, 0)
+        self.assertEqual(receiver.receive(), [message])
+
+    def test_transport_must_implement_send_and_receive(self):
+        class Incomplete(bbs_sync.Transport):
+            def send(self, message):
+                return True
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TCPTransportTests(unittest.TestCase):
+    def exchange(self, sender_secret="", receiver_secret=""):
+        receiver = bbs_sync.TCPTransport(("127.0.0.1", 0), [], secret=receiver_secret)
+        sender = bbs_sync.TCPTransport(("127.0.0.1", 0), [receiver.address], secret=sender_secret)
+        messages = []
+        try:
+            sender.send({"type": "vector", "node": "a", "board": 0, "vector": {}})
+            for _ in range(100):
+                messages = receiver.receive()
+                if messages:
+                    break
+                bbs_sync.time.sleep(0.01)
+        finally:
+            sender.close()
+            receiver.close()
+        return messages
+
+    def test_loopback_delivery(self):
+        self.assertEqual(self.exchange()[0]["node"], "a")
+
+    def test_signed_messages(self):
+        self.assertEqual(self.exchange("s3cret", "s3cret")[0]["node"], "a")
+        with self.assertLogs("meshtastic_llm_bot", "WARNING"):
+            self.assertEqual(self.exchange("wrong", "s3cret"), [])
+
+    def test_public_listen_requires_secret(self):
+        self.assertEqual(bbs_sync._address(":7710"), ("127.0.0.1", 7710))
+        with self.assertRaises(ValueError):
+            bbs_sync.TCPTransport(("0.0.0.0", 0), [])
+
+
+def tearDownModule():
+    sys.modules.pop("bbs", None)
+    sys.modules.pop("bbs_sync", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,6 +71,39 @@ class ChunkedTextTests(unittest.TestCase):
         self.assertTrue(all(len(s.encode("utf-8")) <= bot.CHANNEL_CHUNK_BYTES for s in iface.sent))
         self.assertTrue(iface.sent[0].startswith(f"[1/{total}] "))
 
+    def test_cancelled_reply_stops_sending(self):
+        bot = importlib.import_module("meshtastic_llm_bot")
+        bot = importlib.reload(bot)
+        iface = FakeIface()
+        cancel = bot.threading.Event()
+
+        def send_and_cancel(text, *args, **kwargs):
+            iface.sent.append(text)
+            if len(iface.sent) == 2:
+                cancel.set()
+
+        iface.sendText = send_and_cancel
+        bot._reply_ctx.cancel = cancel
+        try:
+            with patch("meshtastic_llm_bot.random.uniform", return_value=0):
+                bot.send_chunked_text("a" * (bot.CHUNK_BYTES * 5), 1, iface)
+        finally:
+            bot._reply_ctx.cancel = None
+        self.assertEqual(len(iface.sent), 2)
+
+    def test_superseded_request_is_skipped(self):
+        bot = importlib.import_module("meshtastic_llm_bot")
+        bot = importlib.reload(bot)
+        first, second = bot.threading.Event(), bot.threading.Event()
+        bot.supersede_reply((5, 5), first)
+        bot.supersede_reply((5, 5), second)
+        self.assertTrue(first.is_set())
+        iface = FakeIface()
+        bot.handle_message(5, "help", iface, False, 5, cancel=first)
+        self.assertEqual(iface.sent, [])
+        bot.end_reply((5, 5), second)
+        self.assertEqual(bot.active_replies, {})
+
 
 if __name__ == "__main__":
     unittest.main()
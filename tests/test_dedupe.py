@@ -0,0 +1,115 @@
+import os
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+meshtastic_stub = types.ModuleType("meshtastic")
+serial_stub = types.ModuleType("serial_interface")
+
+
+class DummySerial:
+    pass
+
+
+serial_stub.SerialInterface = DummySerial
+meshtastic_stub.serial_interface = serial_stub
+sys.modules.setdefault("meshtastic", meshtastic_stub)
+sys.modules.setdefault("meshtastic.serial_interface", serial_stub)
+
+pubsub_stub = types.ModuleType("pubsub")
+pubsub_stub.pub = SimpleNamespace(subscribe=lambda *a, **k: None)
+sys.modules.setdefault("pubsub", pubsub_stub)
+
+import meshtastic_llm_bot as bot
+from utils.dedupe import DedupeCache, packet_key
+from utils.metrics import MetricsLog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DummyIface:
+    myInfo = SimpleNamespace(my_node_num=1)
+
+
+@pytest.fixture(autouse=True)
+def private_metrics(monkeypatch, tmp_path):
+    """Keep on_receive's metrics records out of the real logs directory."""
+    monkeypatch.setattr(bot, "metrics", MetricsLog(str(tmp_path)))
+
+
+def test_cache_expires_after_ttl():
+    clock = FakeClock()
+    cache = DedupeCache(max_entries=8, ttl=10, clock=clock)
+    assert not cache.seen("a")
+    assert cache.seen("a")
+    clock.now = 11
+    assert not cache.seen("a")
+    assert cache.suppressed == 1
+
+
+def test_cache_per_key_ttl_and_forget():
+    clock = FakeClock()
+    cache = DedupeCache(max_entries=8, ttl=100, clock=clock)
+    assert not cache.seen("long")
+    assert not cache.seen("short", ttl=5)
+    clock.now = 6
+    assert not cache.seen("short", ttl=5)
+    assert cache.seen("long")
+    cache.forget("long")
+    assert not cache.seen("long")
+
+
+def test_cache_is_bounded():
+    cache = DedupeCache(max_entries=2, ttl=100)
+    for key in ("a", "b", "c"):
+        cache.seen(key)
+    assert not cache.seen("a")
+
+
+def test_packet_key_falls_back_to_content_hash():
+    assert packet_key(2, 77, 1, "hi") == packet_key(2, 77, 1, "other")
+    assert packet_key(2, None, 1, "hi") == packet_key(2, None, 1, "hi")
+    assert packet_key(2, None, 1, "hi") != packet_key(2, None, 1, "bye")
+
+
+def test_on_receive_drops_rebroadcast(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(bot, "recent_packets", DedupeCache())
+    monkeypatch.setattr(bot, "log_message", lambda *a, **k: None)
+    monkeypatch.setattr(bot.executor, "submit", lambda *a, **k: submitted.append(a) or object())
+
+    packet = {"decoded": {"text": "hello"}, "id": 1234, "to": 1, "from": 2}
+    bot.on_receive(packet=dict(packet), interface=DummyIface())
+    bot.on_receive(packet=dict(packet), interface=DummyIface())
+    assert len(submitted) == 1
+    assert bot.recent_packets.suppressed == 1
+
+    packet["id"] = 1235
+    bot.on_receive(packet=packet, interface=DummyIface())
+    assert len(submitted) == 2
+
+
+def test_on_receive_repeat_without_id_is_handled_after_short_window(monkeypatch):
+    submitted = []
+    clock = FakeClock()
+    monkeypatch.setattr(bot, "recent_packets", DedupeCache(clock=clock))
+    monkeypatch.setattr(bot, "log_message", lambda *a, **k: None)
+    monkeypatch.setattr(bot.executor, "submit", lambda *a, **k: submitted.append(a) or object())
+
+    packet = {"decoded": {"text": "zork north"}, "to": 1, "from": 2}
+    bot.on_receive(packet=dict(packet), interface=DummyIface())
+    bot.on_receive(packet=dict(packet), interface=DummyIface())
+    assert len(submitted) == 1
+    clock.now = bot.DEDUPE_HASH_TTL + 1
+    bot.on_receive(packet=dict(packet), interface=DummyIface())
+    assert len(submitted) == 2
@@ -0,0 +1,58 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from utils.ingress import IngressQueue
+
+
+class IngressQueueTests(unittest.TestCase):
+    def test_drops_when_full_without_blocking(self):
+        q = IngressQueue(lambda *a: None, maxsize=2)
+        self.assertTrue(q.put((1,)))
+        self.assertTrue(q.put((2,)))
+        self.assertFalse(q.put((3,)))
+        self.assertEqual(q.depth, 2)
+        self.assertEqual(q.dropped, 1)
+        self.assertEqual(q.high_water, 2)
+
+    def test_dispatcher_handles_items_in_order(self):
+        seen = []
+        done = threading.Event()
+
+        def handler(n):
+            seen.append(n)
+            if n == 4:
+                done.set()
+
+        q = IngressQueue(handler, maxsize=8)
+        for n in range(5):
+            q.put((n,))
+        q.start()
+        self.assertTrue(done.wait(2))
+        q.stop()
+        q._thread.join(2)
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+        self.assertFalse(q.running)
+
+    def test_handler_errors_do_not_stop_dispatcher(self):
+        done = threading.Event()
+
+        def handler(n):
+            if n == 0:
+                raise RuntimeError("boom")
+            done.set()
+
+        q = IngressQueue(handler, maxsize=4)
+        q.start()
+        with self.assertLogs("meshtastic_llm_bot", level="ERROR"):
+            q.put((0,))
+            q.put((1,))
+            self.assertTrue(done.wait(2))
+        q.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from utils import Redacted
+from utils.jsonlog import JsonFormatter
+
+
+class JsonFormatterTests(unittest.TestCase):
+    def record(self, msg, *args, **kwargs):
+        logger = logging.getLogger("jsonlog-test")
+        return logger.makeRecord(logger.name, logging.INFO, __file__, 1, msg, args, None, **kwargs)
+
+    def test_one_json_object_with_extra_fields(self):
+        record = self.record("replied to %s", 7, extra={"llm_ms": 812.5, "tx_ms": 40.0})
+        line = JsonFormatter().format(record)
+        self.assertNotIn("\n", line)
+        entry = json.loads(line)
+        self.assertEqual(entry["msg"], "replied to 7")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "jsonlog-test")
+        self.assertEqual((entry["llm_ms"], entry["tx_ms"]), (812.5, 40.0))
+        self.assertNotIn("args", entry)
+
+    def test_exceptions_and_lazy_redaction(self):
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            record = self.record("text=%s", Redacted("psk=secret"))
+            record.exc_info = sys.exc_info()
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["msg"], "text=[REDACTED]")
+        self.assertIn("RuntimeError: boom", entry["exc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
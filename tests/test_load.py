@@ -0,0 +1,78 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from utils.load import DegradationLevel, LoadController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+LEVELS = [
+    DegradationLevel("normal", 300, 20),
+    DegradationLevel("reduced", 150, 8),
+    DegradationLevel("dm-only", 60, 2, pause_channel_chat=True),
+]
+
+
+class LoadControllerTests(unittest.TestCase):
+    def make(self):
+        clock = FakeClock()
+        ctl = LoadController(
+            LEVELS,
+            queue_high=10,
+            queue_low=2,
+            latency_high=20.0,
+            latency_low=5.0,
+            recover_after=30.0,
+            escalate_after=5.0,
+            clock=clock,
+        )
+        return ctl, clock
+
+    def test_escalates_one_step_at_a_time(self):
+        ctl, clock = self.make()
+        clock.now = 10
+        self.assertEqual(ctl.update(8, 4).name, "reduced")
+        clock.now = 12
+        self.assertEqual(ctl.update(8, 4).name, "reduced")
+        clock.now = 16
+        self.assertEqual(ctl.update(8, 4).name, "dm-only")
+        clock.now = 30
+        self.assertEqual(ctl.update(8, 4).name, "dm-only")
+
+    def test_escalates_on_latency(self):
+        ctl, clock = self.make()
+        clock.now = 10
+        for _ in range(3):
+            ctl.observe_latency(25.0)
+        self.assertEqual(ctl.update(0, 1).name, "reduced")
+
+    def test_recovers_with_hysteresis(self):
+        ctl, clock = self.make()
+        clock.now = 10
+        ctl.update(20, 4)
+        # Between the watermarks: neither escalate nor recover.
+        clock.now = 100
+        self.assertEqual(ctl.update(5, 0).name, "reduced")
+        clock.now = 101
+        self.assertEqual(ctl.update(1, 0).name, "reduced")
+        clock.now = 120
+        self.assertEqual(ctl.update(1, 0).name, "reduced")
+        clock.now = 131
+        self.assertEqual(ctl.update(1, 0).name, "normal")
+
+    def test_requires_levels(self):
+        with self.assertRaises(ValueError):
+            LoadController([], 1, 0, 1.0, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import log_report
+
+TS = 1760000400.0  # the start of an hour
+
+
+def record(**fields):
+    base = {"ts": TS, "peer": 5, "target": 5, "channel": False, "kind": "llm", "outcome": "ok"}
+    base.update(fields)
+    return base
+
+
+class HistogramTests(unittest.TestCase):
+    def test_percentiles_within_bucket_error(self):
+        hist = log_report.Histogram()
+        for value in range(1, 1001):
+            hist.add(float(value))
+        self.assertAlmostEqual(hist.percentile(50), 500, delta=500 * 0.05)
+        self.assertAlmostEqual(hist.percentile(99), 990, delta=990 * 0.05)
+        self.assertEqual(hist.percentile(100), 1000)
+        self.assertLess(len(hist.buckets), 200)
+
+
+class ReportTests(unittest.TestCase):
+    def test_summary(self):
+        report = log_report.Report()
+        for i in range(98):
+            report.add(record(ts=TS + i * 60, total_ms=100.0 + i, tx_bytes=100, chunks=1))
+        report.add(record(target=2, channel=True, kind="weather", cache="hit", tx_bytes=50, chunks=1))
+        report.add(record(kind="weather", cache="miss", tx_bytes=50, chunks=1))
+        report.add({"ts": TS, "outcome": "dropped", "reason": "ingress_full", "count": 3})
+        report.add({"ts": TS, "peer": 5, "outcome": "duplicate"})
+        summary = report.summary(top=1)
+        self.assertEqual(summary["records"], 104)
+        self.assertEqual(summary["handled"], 100)
+        self.assertEqual(summary["drop_rate"], round(3 / 103, 4))
+        self.assertEqual(summary["drop_reasons"], {"ingress_full": 3})
+        self.assertEqual(summary["cache"]["hit_rate"], 0.5)
+        self.assertEqual(summary["top_peers_by_airtime"], [{"target": 5, "bytes": 9850}])
+        self.assertEqual(summary["top_channels_by_airtime"], [{"target": 2, "bytes": 50}])
+        self.assertEqual(summary["latency_ms"]["total_ms"]["n"], 98)
+        self.assertEqual(summary["per_hour"]["busiest"]["messages"], 62)
+        self.assertEqual(summary["per_hour"]["average"], 50)
+
+    def test_ignores_fields_of_the_wrong_type(self):
+        report = log_report.Report()
+        report.add(record(outcome="dropped", reason=["x"], count="3"))
+        report.add(record(kind=None, cache={}, target=[1], tx_bytes="big", chunks=None))
+        report.add(record(tx_bytes=40, chunks=2))
+        summary = report.summary(top=5)
+        self.assertEqual(summary["records"], 3)
+        self.assertEqual(summary["drop_reasons"], {"unknown": 1})
+        self.assertEqual(summary["kinds"], {"llm": 2})
+        self.assertEqual(summary["cache"]["lookups"], 0)
+        self.assertEqual(summary["top_peers_by_airtime"], [{"target": 5, "bytes": 40}])
+        self.assertEqual(summary["chunks_per_reply"], 1.0)
+
+
+class CommandLineTests(unittest.TestCase):
+    def test_reads_plain_and_gzipped_files_in_range(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "2026-01-01-metrics.jsonl"), "w") as f:
+                f.write(json.dumps(record(total_ms=10.0)) + "\nnot json\n")
+            with gzip.open(os.path.join(tmp, "2026-01-02-metrics.jsonl.gz"), "wt") as f:
+                f.write(json.dumps(record(total_ms=20.0)) + "\n")
+            with open(os.path.join(tmp, "2026-02-01-metrics.jsonl"), "w") as f:
+                f.write(json.dumps(record(total_ms=30.0)) + "\n")
+            with open(os.path.join(tmp, "2026-01-01.log"), "w") as f:
+                f.write("ignored\n")
+            out = io.StringIO()
+            with redirect_stdout(out):
+                code = log_report.main([tmp, "--until", "2026-01-31", "--json"])
+            self.assertEqual(code, 0)
+            summary = json.loads(out.getvalue())
+            self.assertEqual(summary["handled"], 2)
+            self.assertEqual(summary["latency_ms"]["total_ms"]["max"], 20.0)
+            with redirect_stdout(io.StringIO()) as text:
+                log_report.main([tmp])
+            self.assertIn("latency (ms):", text.getvalue())
+
+    def test_truncated_gzip_file_is_reported_and_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = gzip.compress(
+                "".join(json.dumps(record(total_ms=float(n))) + "\n" for n in range(1, 200)).encode()
+            )
+            with open(os.path.join(tmp, "2026-01-01-metrics.jsonl.gz"), "wb") as f:
+                f.write(data[: len(data) // 2])
+            with open(os.path.join(tmp, "2026-01-02-metrics.jsonl"), "w") as f:
+                f.write(json.dumps(record(total_ms=500.0)) + "\n")
+            out, err = io.StringIO(), io.StringIO()
+            with redirect_stdout(out), redirect_stderr(err):
+                code = log_report.main([tmp, "--json"])
+            self.assertEqual(code, 0)
+            self.assertIn("2026-01-01-metrics.jsonl.gz", err.getvalue())
+            summary = json.loads(out.getvalue())
+            self.assertEqual(summary["latency_ms"]["total_ms"]["max"], 500.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
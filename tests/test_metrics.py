@@ -0,0 +1,108 @@
+import os, sys, types, tempfile, shutil, atexit, json
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("MESHTASTIC_API_KEY", "test")
+os.environ.setdefault("MESHTASTIC_SOUL", "cipher")
+
+BBS_DIR = tempfile.mkdtemp(prefix="bbs-test-")
+os.environ["MESHTASTIC_BBS_DIR"] = BBS_DIR
+atexit.register(lambda: shutil.rmtree(BBS_DIR, ignore_errors=True))
+
+meshtastic_stub = types.ModuleType("meshtastic")
+serial_stub = types.ModuleType("serial_interface")
+
+
+class DummySerial:
+    pass
+
+
+serial_stub.SerialInterface = DummySerial
+meshtastic_stub.serial_interface = serial_stub
+sys.modules["meshtastic"] = meshtastic_stub
+sys.modules["meshtastic.serial_interface"] = serial_stub
+
+pubsub_stub = types.ModuleType("pubsub")
+pubsub_stub.pub = types.SimpleNamespace(subscribe=lambda *a, **k: None)
+sys.modules["pubsub"] = pubsub_stub
+
+import unittest
+
+import meshtastic_llm_bot as bot
+from utils.metrics import MetricsLog
+
+
+class FakeIface:
+    myInfo = types.SimpleNamespace(my_node_num=1)
+
+    def __init__(self):
+        self.sent = []
+
+    def sendText(self, text, *args, **kwargs):
+        self.sent.append(text)
+
+    def waitForAckNak(self):
+        return
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.metrics = MetricsLog(self.tmp)
+        patcher = patch.object(bot, "metrics", self.metrics)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+
+    def records(self):
+        path = self.metrics.path()
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_file_is_private_and_disabled_log_writes_nothing(self):
+        self.metrics.write({"outcome": "ok"})
+        self.assertEqual(os.stat(self.metrics.path()).st_mode & 0o777, 0o600)
+        MetricsLog(self.tmp, enabled=False).write({"outcome": "lost"})
+        self.assertEqual(self.records(), [{"outcome": "ok"}])
+
+    def test_handled_message_records_stages(self):
+        iface = FakeIface()
+        trace = {"ts": bot.time.time() - 0.5, "peer": 7, "target": 7, "channel": False}
+        with patch.object(bot, "log_message", lambda *a, **k: None), patch(
+            "meshtastic_llm_bot.random.uniform", return_value=0
+        ):
+            bot.handle_message(7, "help", iface, False, 7, trace=trace)
+        [record] = self.records()
+        self.assertEqual(record["kind"], "help")
+        self.assertEqual(record["outcome"], "ok")
+        self.assertEqual(record["chunks"], len(iface.sent))
+        self.assertEqual(record["tx_bytes"], sum(len(s.encode("utf-8")) for s in iface.sent))
+        self.assertGreaterEqual(record["queue_ms"], 500)
+        self.assertGreaterEqual(record["total_ms"], record["queue_ms"])
+        self.assertIn("tx_ms", record)
+
+    def test_superseded_and_dropped_messages_are_recorded(self):
+        cancel = bot.threading.Event()
+        cancel.set()
+        trace = {"ts": bot.time.time(), "peer": 7, "target": 7, "channel": False}
+        bot.handle_message(7, "help", FakeIface(), False, 7, cancel=cancel, trace=trace)
+        packet = {"decoded": {"text": "hi"}, "to": 1, "from": 9, "id": 77}
+        results = [None, object()]
+        with patch.object(bot, "log_message", lambda *a, **k: None), patch.object(
+            bot.executor, "submit", lambda *a, **k: results.pop(0)
+        ):
+            bot.on_receive(packet=packet, interface=FakeIface())
+            # The sender's retry is handled once the queue has room.
+            bot.on_receive(packet=packet, interface=FakeIface())
+            bot.on_receive(packet=packet, interface=FakeIface())
+        outcomes = [(r["outcome"], r.get("reason")) for r in self.records()]
+        self.assertEqual(results, [])
+        self.assertEqual(
+            outcomes, [("superseded", None), ("dropped", "queue_full"), ("duplicate", None)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
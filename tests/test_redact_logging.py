@@ -37,7 +37,7 @@ def test_log_message_redacts_sensitive(tmp_path, monkeypatch):
 
 def test_on_receive_debug_redacts_sensitive(monkeypatch, caplog):
     monkeypatch.setenv("MESHTASTIC_DEBUG", "1")
-    bot.logger.setLevel(logging.DEBUG)
+    caplog.set_level(logging.DEBUG, logger=bot.logger.name)
 
     monkeypatch.setattr(bot, "log_message", lambda *a, **k: None)
     monkeypatch.setattr(bot, "respond_channels", {0})
@@ -51,7 +51,6 @@ def test_on_receive_debug_redacts_sensitive(monkeypatch, caplog):
     monkeypatch.setattr(bot.executor, "submit", lambda *a, **k: DummyFuture())
 
     packet = {"decoded": {"text": "password=foo psk=bar secret"}, "channel": 0, "to": 1, "from": 2}
-    caplog.set_level(logging.DEBUG, logger="meshtastic_llm_bot")
     bot.on_receive(packet=packet, interface=DummyIface())
     logs = "\n".join(caplog.messages)
     assert "foo" not in logs
@@ -75,3 +74,37 @@ def test_on_receive_logs_exception(monkeypatch, caplog):
     bot.on_receive(packet=packet, interface=DummyIface())
     assert "Error in on_receive" in caplog.text
     assert "Traceback (most recent call last)" in caplog.text
+
+
+def test_redact_sensitive_masks_without_inspecting():
+    assert bot.redact_sensitive("psk=abcd hello") == "[REDACTED]"
+    assert bot.redact_sensitive("") == ""
+
+
+def test_on_receive_skips_debug_work_when_disabled(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger=bot.logger.name)
+    monkeypatch.setattr(bot, "respond_channels", set())
+
+    built = []
+    monkeypatch.setattr(bot, "Redacted", built.append)
+    packet = {"decoded": {"text": "psk=abcd"}, "channel": 3, "to": 9, "from": 2}
+    bot.on_receive(packet=packet, interface=DummyIface())
+    assert built == []
+
+
+def test_dispatch_logs_ingress_high_water(monkeypatch, caplog):
+    monkeypatch.setattr(bot, "on_receive", lambda **k: None)
+    monkeypatch.setattr(bot.ingress, "high_water", 7)
+    caplog.set_level(logging.DEBUG, logger="meshtastic_llm_bot")
+    bot._dispatch_packet({}, DummyIface())
+    assert "high_water=7" in caplog.text
+
+
+def test_invalid_backend_wait_falls_back_to_default(monkeypatch, caplog):
+    caplog.set_level(logging.WARNING, logger=bot.logger.name)
+    for value in ("soon", "-5", "inf"):
+        monkeypatch.setenv("MESHTASTIC_BACKEND_WAIT", value)
+        assert bot._env_seconds("MESHTASTIC_BACKEND_WAIT", 0) == 0
+    monkeypatch.setenv("MESHTASTIC_BACKEND_WAIT", "30")
+    assert bot._env_seconds("MESHTASTIC_BACKEND_WAIT", 0) == 30.0
+    assert caplog.text.count("Ignoring invalid MESHTASTIC_BACKEND_WAIT") == 3
@@ -9,9 +9,11 @@ os.environ["MESHTASTIC_BBS_DIR"] = BBS_DIR
 atexit.register(lambda: shutil.rmtree(BBS_DIR, ignore_errors=True))
 
 
+import random
+import re
 import unittest
 
-from utils.text import safe_text, strip_llm_artifacts
+from utils.text import SafeText, safe_text, strip_llm_artifacts
 
 
 class SafeTextTests(unittest.TestCase):
@@ -24,6 +26,31 @@ class SafeTextTests(unittest.TestCase):
         raw = "Hey, [USERNAME]! [USER_DATA]"
         self.assertEqual(safe_text(raw), "Hey, !")
 
+    def test_returns_safe_text_and_skips_rework(self):
+        once = safe_text("  hi [NAME] there\x07 ")
+        self.assertIsInstance(once, SafeText)
+        self.assertEqual(once, "hi there\\x07")
+        self.assertIs(safe_text(once), once)
+        self.assertEqual(safe_text(once, 4), "hi t")
+        self.assertIsInstance(safe_text(once, 4), SafeText)
+        self.assertNotIsInstance(once + "\x00", SafeText)
+        self.assertEqual(safe_text(once + "\x00"), "hi there\\x07\\x00")
+
+    def test_matches_two_pass_sanitizer(self):
+        control = re.compile(r"[\x00-\x09\x0b-\x0c\x0e-\x1f\x7f]")
+        placeholder = re.compile(r"\s*\[[A-Z_]+\]\s*")
+
+        def two_pass(s, max_len):
+            s = placeholder.sub(" ", s).strip()
+            return control.sub(lambda m: f"\\x{ord(m.group(0)):02x}", s)[:max_len]
+
+        alphabet = ["a", "Z", " ", "\t", "\n", "\r", "\x00", "\x1c", "[", "]", "_", "\u3000", "é", "\x7f"]
+        rng = random.Random(4)
+        for _ in range(5000):
+            raw = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            max_len = rng.choice([4, 1024])
+            self.assertEqual(safe_text(raw, max_len), two_pass(raw, max_len), repr(raw))
+
 
 class StripLLMArtifactsTests(unittest.TestCase):
     def test_removes_response_artifact(self):
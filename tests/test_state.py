@@ -1,5 +1,6 @@
-import os, sys, types, tempfile, shutil, atexit, io
+import os, sys, types, tempfile, shutil, atexit, io, threading
 from contextlib import redirect_stdout
+from unittest.mock import patch
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 os.environ.setdefault("MESHTASTIC_API_KEY", "test")
 os.environ["MESHTASTIC_SOUL"] = "cipher"
@@ -92,6 +93,19 @@ class StateTests(unittest.TestCase):
         self.assertTrue(outputs)
         self.assertIn("prefix", outputs[0].lower())
 
+    def test_paused_channel_sends_busy_notice_once_per_user(self):
+        outputs = []
+        paused = bot.DegradationLevel("dm-only", 60, 2, pause_channel_chat=True)
+        with patch.object(bot, "current_load_level", lambda: paused), patch.object(
+            bot, "busy_notices", bot.DedupeCache()
+        ), patch.object(bot, "log_message", lambda *a, **k: None), patch.object(
+            bot, "send_chunked_text", lambda text, *a, **k: outputs.append(text)
+        ):
+            bot.handle_message(0, "cipher hi", object(), True, user=42)
+            bot.handle_message(0, "cipher hello?", object(), True, user=42)
+            bot.handle_message(0, "cipher hi", object(), True, user=43)
+        self.assertEqual(outputs, ["Busy right now; DM me instead."] * 2)
+
     def test_weather_command_with_handle(self):
         outputs = {}
 
@@ -138,6 +152,44 @@ class StateTests(unittest.TestCase):
 
         self.assertIn("format=3&u", called.get("url", ""))
 
+    def test_prepare_backend_warms_with_system_prompt(self):
+        calls = {}
+
+        class DummyResp:
+            def raise_for_status(self):
+                return None
+
+        def fake_get(url, **kwargs):
+            calls["probe"] = url
+            return DummyResp()
+
+        def fake_post(url, json=None, **kwargs):
+            calls["payload"] = json
+            return DummyResp()
+
+        orig_get, orig_post = bot.requests.get, bot.requests.post
+        bot.requests.get = fake_get
+        bot.requests.post = fake_post
+        try:
+            self.assertTrue(bot.prepare_backend())
+        finally:
+            bot.requests.get, bot.requests.post = orig_get, orig_post
+
+        self.assertTrue(calls["probe"].endswith("/models"))
+        self.assertEqual(calls["payload"]["messages"][0]["content"], bot.SYSTEM_PROMPT)
+        self.assertEqual(calls["payload"]["max_tokens"], 1)
+
+    def test_prepare_backend_gives_up_after_wait(self):
+        def fake_get(url, **kwargs):
+            raise bot.requests.ConnectionError("down")
+
+        orig_get = bot.requests.get
+        bot.requests.get = fake_get
+        try:
+            self.assertFalse(bot.prepare_backend(wait=0))
+        finally:
+            bot.requests.get = orig_get
+
     def test_bbs_post_and_list(self):
         outputs = []
 
@@ -160,6 +212,24 @@ class StateTests(unittest.TestCase):
         self.assertIn("1. 42: hello", outputs[1])
         self.assertEqual(bot.histories, {})
 
+    def test_superseded_bbs_post_is_still_stored(self):
+        outputs, queued = [], []
+        iface = types.SimpleNamespace(myInfo=types.SimpleNamespace(my_node_num=1))
+        with patch.object(
+            bot.executor, "submit", lambda fn, *a, **k: queued.append((fn, a, k)) or object()
+        ), patch.object(bot, "send_chunked_text", lambda text, *a, **k: outputs.append(text)), patch.object(
+            bot, "log_message", lambda *a, **k: None
+        ), patch.object(bot, "metrics", bot.MetricsLog(BBS_DIR, enabled=False)):
+            for n, text in enumerate(["bbs post queued", "help"]):
+                packet = {"decoded": {"text": text}, "to": 1, "from": 42, "id": 9100 + n}
+                bot.on_receive(packet=packet, interface=iface)
+            self.assertTrue(queued[0][2]["cancel"].is_set())
+            for fn, args, kwargs in queued:
+                fn(*args, **kwargs)
+        self.assertEqual(outputs, ["Post #1 recorded.", bot.MENU])
+        with bot.bbs_posts.use(42) as board:
+            self.assertEqual(board.read(1, 1), ["42: queued"])
+
     def test_bbs_persistence(self):
         outputs = []
 
@@ -201,6 +271,9 @@ class StateTests(unittest.TestCase):
 
         self.assertIn("Room 1", outputs[0])
         self.assertIn("zork north", outputs[0].lower())
+        self.assertLessEqual(
+            len(outputs[0].encode("utf-8")), zork.ZORK_MAX_PACKETS * zork.ZORK_PACKET_BYTES
+        )
 
     def test_zork_output_sanitized(self):
         outputs = []
@@ -215,25 +288,32 @@ class StateTests(unittest.TestCase):
         long_room = "start\n" + "x" * (bot.MAX_TEXT_LEN + 50)
 
         class DummyGame:
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.output = print
+
             def do_look(self):
-                print(long_room)
+                self.output(long_room)
 
         zork.Game = DummyGame
         bot.send_chunked_text = fake_send
         bot.log_message = lambda *a, **k: None
         try:
             bot.handle_message(0, "zork start", object(), True, user=42)
+            bot.handle_message(0, "zork more", object(), True, user=42)
         finally:
             bot.send_chunked_text = orig_send
             bot.log_message = orig_log
             zork.Game = orig_game
             zork.games.clear()
+            zork.pages.discard(42)
 
-        self.assertTrue(outputs)
-        self.assertIn("\n", outputs[0])
+        self.assertEqual(len(outputs), 2)
+        self.assertTrue(outputs[0].startswith("start\n"))
         self.assertNotIn("\\n", outputs[0])
         self.assertNotIn("\r", outputs[0])
-        self.assertEqual(len(outputs[0]), bot.MAX_TEXT_LEN)
+        self.assertTrue(outputs[0].endswith("'zork more')"))
+        self.assertEqual(len(outputs[1]), bot.MAX_TEXT_LEN)
 
 
 if __name__ == "__main__":
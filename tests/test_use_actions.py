@@ -20,16 +20,25 @@ class UseActionTests(unittest.TestCase):
 
     def test_use_key_unlocks_door(self):
         g = Game()
+        g.player_room = 10
         out = self.capture(g.do_use, "key", "door")
         self.assertFalse(g.locked_doors[10]["east"])
         self.assertIn("door unlocks", out)
 
     def test_use_lockpick_unlocks_door(self):
         g = Game()
+        g.player_room = 10
         out = self.capture(g.do_use, "lockpick", "door")
         self.assertFalse(g.locked_doors[10]["east"])
         self.assertIn("door unlocks", out)
 
+    def test_key_only_unlocks_doors_in_the_current_room(self):
+        g = Game()
+        out = self.capture(g.do_use, "key", "door")
+        self.assertTrue(g.locked_doors[10]["east"])
+        self.assertIn("nothing to unlock", out)
+        self.assertEqual(g.score, 0)
+
     def test_use_scroll_increases_score(self):
         g = Game()
         out = self.capture(g.do_use, "scroll", "")
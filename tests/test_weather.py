@@ -1,5 +1,9 @@
+import json
 import os
 import sys
+import tempfile
+import threading
+import time
 import unittest
 import requests
 
@@ -9,6 +13,9 @@ import weather
 
 
 class WeatherErrorTests(unittest.TestCase):
+    def setUp(self):
+        weather.weather_cache.clear()
+
     def test_http_error_includes_status(self):
         class DummyResp:
             status_code = 500
@@ -45,5 +52,205 @@ class WeatherErrorTests(unittest.TestCase):
         self.assertIn("Network down", msg)
 
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class WeatherCacheTests(unittest.TestCase):
+    def test_fresh_entries_are_served_from_cache(self):
+        calls = []
+
+        def fetch(loc):
+            calls.append(loc)
+            return f"{loc}: sunny"
+
+        cache = weather.WeatherCache(fetch, ttl=60, stale_ttl=600, clock=FakeClock())
+        self.assertEqual(cache.get("Paris"), "Paris: sunny")
+        self.assertEqual(cache.get("  paris "), "Paris: sunny")
+        self.assertEqual(calls, ["Paris"])
+        self.assertEqual(cache.hits, 1)
+
+    def test_concurrent_lookups_share_one_fetch(self):
+        calls = []
+        started, release = threading.Event(), threading.Event()
+
+        def fetch(loc):
+            calls.append(loc)
+            started.set()
+            release.wait(2)
+            return "ok"
+
+        cache = weather.WeatherCache(fetch, ttl=60, stale_ttl=600)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("Oslo")))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        self.assertTrue(started.wait(2))
+        release.set()
+        for t in threads:
+            t.join(2)
+        self.assertEqual(calls, ["Oslo"])
+        self.assertEqual(results, ["ok"] * 5)
+
+    def test_stale_entry_served_while_refreshing(self):
+        clock = FakeClock()
+        answers = iter(["old", "new"])
+        refreshed = threading.Event()
+
+        def fetch(loc):
+            value = next(answers)
+            if value == "new":
+                refreshed.set()
+            return value
+
+        cache = weather.WeatherCache(fetch, ttl=60, stale_ttl=600, clock=clock)
+        cache.get("Rome")
+        clock.now = 120
+        self.assertEqual(cache.get("Rome"), "old")
+        self.assertTrue(refreshed.wait(2))
+        for _ in range(100):
+            if cache.age("Rome") == 0:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(cache.get("Rome"), "new")
+
+    def test_last_good_value_used_when_service_fails(self):
+        clock = FakeClock()
+        fail = []
+
+        def fetch(loc):
+            if fail:
+                raise weather.WeatherError("Error retrieving weather: down")
+            return "cached"
+
+        cache = weather.WeatherCache(fetch, ttl=60, stale_ttl=600, clock=clock)
+        cache.get("Lima")
+        fail.append(True)
+        clock.now = 5000
+        self.assertEqual(cache.get("Lima"), "cached")
+        self.assertIn("down", cache.get("Quito"))
+
+
+class WeatherPrefetcherTests(unittest.TestCase):
+    def make(self, clock, calls):
+        def fetch(loc):
+            calls.append(loc)
+            return loc
+
+        cache = weather.WeatherCache(fetch, ttl=100, stale_ttl=1000, clock=clock)
+        return cache, weather.WeatherPrefetcher(
+            cache, ["Home"], window=3600, top=2, hot=4, clock=clock
+        )
+
+    def test_tracks_configured_and_popular_locations(self):
+        clock, calls = FakeClock(), []
+        cache, pre = self.make(clock, calls)
+        for loc in ["Reno", "Reno", "Elko", "Ely"]:
+            pre.record(loc)
+        names = [loc for loc, _ in pre.popular()]
+        self.assertEqual(names[0], "Reno")
+        self.assertIn("Home", names)
+        self.assertEqual(len(names), 3)
+        clock.now = 4000
+        self.assertEqual(pre.popular(), [("Home", 4)])
+
+    def test_refresh_interval_adapts_to_popularity(self):
+        clock, calls = FakeClock(), []
+        cache, pre = self.make(clock, calls)
+        self.assertEqual(pre.interval(4), 90)
+        self.assertEqual(pre.interval(8), 90)
+        self.assertEqual(pre.interval(2), 180)
+        self.assertEqual(pre.interval(1), 360)
+
+    def test_run_once_refreshes_due_locations(self):
+        clock, calls = FakeClock(), []
+        cache, pre = self.make(clock, calls)
+        pre.record("Reno")
+        self.assertEqual(pre.run_once(), 2)
+        self.assertEqual(sorted(calls), ["Home", "Reno"])
+        clock.now = 95
+        self.assertEqual(pre.run_once(), 1)
+        self.assertEqual(calls[-1], "Home")
+        self.assertEqual(cache.get("home"), "Home")
+
+    def test_failing_location_backs_off(self):
+        clock, calls = FakeClock(), []
+
+        def fetch(loc):
+            calls.append(loc)
+            raise weather.WeatherError("no such place")
+
+        cache = weather.WeatherCache(fetch, ttl=100, stale_ttl=1000, clock=clock)
+        pre = weather.WeatherPrefetcher(cache, ["Nowhere"], clock=clock)
+        for tick in range(121):
+            clock.now = tick * 30
+            pre.run_once()
+        # 60 s backoff doubling: attempts at 0, 60, 180, 420, 900, 1860 s.
+        self.assertEqual(len(calls), 6)
+
+
+class StaticProvider(weather.WeatherProvider):
+    def __init__(self, name, report=None, delay=0.0, timeout=1):
+        super().__init__(timeout)
+        self.name = name
+        self.report = report
+        self.delay = delay
+
+    def fetch(self, loc):
+        time.sleep(self.delay)
+        if self.report is None:
+            raise weather.WeatherError(f"{self.name} down")
+        return self.report
+
+
+class WeatherProviderTests(unittest.TestCase):
+    def test_provider_without_fetch_cannot_be_created(self):
+        class Incomplete(weather.WeatherProvider):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_local_file_provider(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"Hartford": "Hartford: 🌧 +48°F", "*": "Home: ☀️ +70°F"}, f)
+        self.addCleanup(os.unlink, f.name)
+        provider = weather.LocalFileProvider(f.name)
+        self.assertEqual(provider.fetch("hartford"), "Hartford: 🌧 +48°F")
+        self.assertEqual(provider.fetch("Elsewhere"), "Home: ☀️ +70°F")
+
+    def test_local_file_provider_rejects_stale_export(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"*": "old"}, f)
+        self.addCleanup(os.unlink, f.name)
+        os.utime(f.name, (0, 0))
+        with self.assertRaises(weather.WeatherError):
+            weather.LocalFileProvider(f.name, max_age=60).fetch("x")
+
+    def test_race_returns_first_good_answer(self):
+        race = weather.ProviderRace([
+            StaticProvider("slow", "slow report", delay=0.5),
+            StaticProvider("broken"),
+            StaticProvider("fast", "fast report", delay=0.01),
+        ])
+        started = time.monotonic()
+        self.assertEqual(race("Paris"), "fast report")
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    def test_race_combines_errors(self):
+        race = weather.ProviderRace([StaticProvider("a"), StaticProvider("b")])
+        with self.assertRaises(weather.WeatherError) as cm:
+            race("Paris")
+        self.assertIn("a down", str(cm.exception))
+        self.assertIn("b down", str(cm.exception))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import zork
+from zork import GameStore
+
+
+class GameStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now = 0.0
+        self.store = GameStore(self.tmp.name, ttl=60, max_games=2, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def play(self, game, command):
+        return zork._run(game, zork._play, game, command)
+
+    def test_idle_game_is_hibernated_and_restored(self):
+        game = zork.Game()
+        self.play(game, "take lamp")
+        self.store[1] = game
+        self.now = 120
+        self.store.evict()
+        self.assertEqual(len(self.store), 0)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "1.json")))
+        self.assertIn(1, self.store)
+        restored = self.store.get(1)
+        self.assertIsNot(restored, game)
+        self.assertEqual([i.name for i in restored.inventory], ["lamp"])
+        self.assertEqual(restored.move_count, 1)
+        self.assertEqual(len(self.store), 1)
+
+    def test_lru_cap_hibernates_least_recently_used(self):
+        for key in (1, 2, 3):
+            self.store[key] = zork.Game()
+            self.now += 1
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(os.listdir(self.tmp.name), ["1.json"])
+        self.store.get(2)
+        self.store[4] = zork.Game()
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["1.json", "3.json"])
+
+    def test_delete_and_clear_remove_saved_games(self):
+        self.store[1] = zork.Game()
+        self.store.hibernate_all()
+        del self.store[1]
+        self.assertNotIn(1, self.store)
+        self.assertIsNone(self.store.get(1))
+        with self.assertRaises(KeyError):
+            del self.store[1]
+        self.store[2] = zork.Game()
+        self.store.hibernate_all()
+        self.store.clear()
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_busy_game_is_not_evicted(self):
+        busy = zork.Game()
+        self.store[1] = busy
+        self.store[2] = zork.Game()
+        with busy.lock:
+            self.now = 120
+            self.store.evict()
+            self.assertEqual(len(self.store), 1)
+        self.store.evict()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["1.json", "2.json"])
+
+    def test_game_that_cannot_be_saved_stays_in_memory(self):
+        game = zork.Game()
+        self.store[1] = game
+        self.now = 120
+        with patch.object(zork.json, "dump", side_effect=OSError("disk full")):
+            with self.assertLogs("meshtastic_llm_bot", level="ERROR"):
+                self.store.evict()
+        self.assertEqual(len(self.store), 1)
+        self.assertIs(self.store.get(1), game)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+        self.now = 240
+        self.store.evict()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(os.listdir(self.tmp.name), ["1.json"])
+
+    def test_corrupt_save_is_ignored(self):
+        with open(os.path.join(self.tmp.name, "5.json"), "w") as f:
+            f.write("{broken")
+        with self.assertLogs("meshtastic_llm_bot", level="ERROR"):
+            self.assertIsNone(self.store.get(5))
+
+
+class PacketBudgetTests(unittest.TestCase):
+    def test_short_replies_are_untouched(self):
+        self.assertEqual(zork.fit_packets("Taken.", 1), ("Taken.", ""))
+
+    def test_long_replies_keep_whole_lines_and_summarise(self):
+        text = "Room 1: Hall\n" + "\n".join("x" * 60 for _ in range(10))
+        fitted, rest = zork.fit_packets(text, 1)
+        lines = fitted.splitlines()
+        self.assertEqual(lines[0], "Room 1: Hall")
+        self.assertEqual(lines[-1], f"(+{len(rest.splitlines())} more; 'zork more')")
+        self.assertEqual(lines[:-1] + rest.splitlines(), text.splitlines())
+        self.assertLessEqual(len(fitted.encode("utf-8")), zork.ZORK_PACKET_BYTES)
+
+    def test_more_pages_through_the_rest(self):
+        pages = zork._Pages(max_players=2)
+        text = "\n".join(f"line {i} " + "x" * 60 for i in range(12))
+        shown = [pages.page(7, text)]
+        while True:
+            page = pages.more(7)
+            if page is None:
+                break
+            shown.append(page)
+        self.assertGreater(len(shown), 1)
+        lines = [line for page in shown for line in page.splitlines() if not line.startswith("(+")]
+        self.assertEqual(lines, text.splitlines())
+        pages.page(7, text)
+        pages.page(7, "Taken.")
+        self.assertIsNone(pages.more(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,21 +2,15 @@
 
 from __future__ import annotations
 
-import re
-
-
-_REDACT_PATTERNS = [
-    re.compile(r"(?i)password=[^\s&]+"),
-    re.compile(r"(?i)psk=[^\s&]+"),
-    re.compile(r"(?i)message=[^\s&]+"),
-]
+REDACTED = "[REDACTED]"
 
 
 def redact_sensitive(text: str) -> str:
     """Mask potentially sensitive text before logging.
 
-    Replaces common credential patterns such as ``password=`` and ``psk`` with a
-    ``[REDACTED]`` marker and suppresses any message content entirely.
+    Message content is never logged, so any non-empty text (credentials such
+    as ``password=`` or ``psk=`` included) becomes a ``[REDACTED]`` marker
+    without being inspected.
 
     Parameters
     ----------
@@ -29,13 +23,21 @@ def redact_sensitive(text: str) -> str:
         A redacted version of *text* safe for logging.
     """
 
-    if not text:
-        return text
+    return REDACTED if text else text
+
+
+class Redacted:
+    """Log argument that redacts ``text`` only if the record is formatted.
+
+    Use as ``logger.debug("text=%s", Redacted(text))``.
+    """
+
+    __slots__ = ("text",)
 
-    redacted = text
-    for pat in _REDACT_PATTERNS:
-        redacted = pat.sub(lambda m: m.group(0).split("=")[0] + "=[REDACTED]", redacted)
+    def __init__(self, text: str):
+        self.text = text
 
-    # Never log actual message content
-    return "[REDACTED]"
+    def __str__(self) -> str:
+        return redact_sensitive(self.text)
 
+    __repr__ = __str__
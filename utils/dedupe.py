@@ -0,0 +1,73 @@
+"""Time-windowed cache for suppressing duplicate mesh packets."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class DedupeCache:
+    """Remember recently seen packet keys for ``ttl`` seconds.
+
+    :meth:`seen` may give a key its own window. At most ``max_entries`` keys
+    are kept; the oldest are forgotten first. ``suppressed`` counts how many
+    duplicates were reported by :meth:`seen`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.suppressed = 0
+        self._clock = clock
+        # Key -> time it expires, oldest first.
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, key: Hashable, ttl: Optional[float] = None) -> bool:
+        """Return ``True`` if ``key`` was seen within the window, else record it.
+
+        A newly recorded key is remembered for ``ttl`` seconds (default
+        ``self.ttl``).
+        """
+        with self._lock:
+            now = self._clock()
+            while self._entries:
+                oldest, expires = next(iter(self._entries.items()))
+                if expires > now:
+                    break
+                del self._entries[oldest]
+            expires = self._entries.get(key)
+            if expires is not None and expires > now:
+                self.suppressed += 1
+                return True
+            self._entries.pop(key, None)
+            self._entries[key] = now + (self.ttl if ttl is None else ttl)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return False
+
+    def forget(self, key: Hashable) -> None:
+        """Drop ``key`` so the next packet with it is not a duplicate."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.suppressed = 0
+
+
+def packet_key(src: object, packet_id: Optional[int], dest: object, text: str) -> tuple:
+    """Build a dedupe key from the packet id, or a content hash if it has none."""
+    if packet_id:
+        return ("id", src, packet_id)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return ("text", src, dest, digest)
@@ -0,0 +1,73 @@
+"""Bounded hand-off queue between the radio reader thread and a dispatcher."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger("meshtastic_llm_bot")
+
+
+class IngressQueue:
+    """Ring buffer drained by a dedicated dispatcher thread.
+
+    :meth:`put` never blocks: it appends to a :class:`collections.deque`
+    (atomic under the GIL) and drops the item when ``maxsize`` items are already
+    waiting, so the producer thread returns immediately even when the
+    dispatcher falls behind. ``dropped`` and ``high_water`` record how often
+    that happened and how deep the queue got.
+    """
+
+    def __init__(self, handler: Callable[..., None], maxsize: int = 256, name: str = "ingress"):
+        self.maxsize = maxsize
+        self.name = name
+        self.dropped = 0
+        self.high_water = 0
+        self._handler = handler
+        self._items: deque = deque()
+        self._ready = threading.Semaphore(0)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def put(self, item: tuple) -> bool:
+        depth = len(self._items)
+        if depth >= self.maxsize:
+            self.dropped += 1
+            return False
+        self._items.append(item)
+        if depth >= self.high_water:
+            self.high_water = depth + 1
+        self._ready.release()
+        return True
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the dispatcher to exit once the items ahead of it are handled."""
+        if self.running:
+            self._items.append(None)
+            self._ready.release()
+
+    def _run(self) -> None:
+        while True:
+            self._ready.acquire()
+            item = self._items.popleft()
+            if item is None:
+                return
+            try:
+                self._handler(*item)
+            except Exception:
+                logger.exception("Error in %s dispatcher", self.name)
@@ -0,0 +1,39 @@
+"""JSON-lines log formatting."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``.
+_STANDARD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys() | {"message", "asctime", "taskName"}
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line.
+
+    The object holds ``ts``, ``level``, ``logger`` and ``msg`` plus every
+    field given with ``extra=`` (for example per-stage timings such as
+    ``llm_ms``), and ``exc`` when there is a traceback. Like any formatter it
+    only runs for records a handler actually emits, so lazy arguments such as
+    :class:`utils.Redacted` are never evaluated for disabled levels.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
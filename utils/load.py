@@ -0,0 +1,113 @@
+"""Load-aware degradation controller for the message pipeline."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from statistics import median
+from typing import Callable, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class DegradationLevel:
+    """Limits applied to language model work while the bot is under load.
+
+    Parameters
+    ----------
+    name: str
+        Label used in log messages.
+    max_tokens: int
+        Completion budget passed to the model.
+    history_len: int
+        Number of most recent conversation messages sent with the prompt.
+    model: str | None
+        Model override, or ``None`` to keep the configured model.
+    pause_channel_chat: bool
+        When ``True`` chat on channels is refused while DMs are still served.
+    """
+
+    name: str
+    max_tokens: int
+    history_len: int
+    model: Optional[str] = None
+    pause_channel_chat: bool = False
+
+
+class LoadController:
+    """Step through degradation levels based on queue depth and latency.
+
+    The controller escalates one level at a time when the backlog (queued plus
+    in-flight jobs) or the median of recent model latencies crosses the high
+    watermark, and only recovers one level after load has stayed below the low
+    watermark for ``recover_after`` seconds. The gap between the watermarks and
+    the hold time provide hysteresis so the level does not flap.
+    """
+
+    def __init__(
+        self,
+        levels: Sequence[DegradationLevel],
+        queue_high: int,
+        queue_low: int,
+        latency_high: float,
+        latency_low: float,
+        recover_after: float = 60.0,
+        escalate_after: float = 5.0,
+        window: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not levels:
+            raise ValueError("at least one degradation level is required")
+        self.levels = list(levels)
+        self.queue_high = queue_high
+        self.queue_low = queue_low
+        self.latency_high = latency_high
+        self.latency_low = latency_low
+        self.recover_after = recover_after
+        self.escalate_after = escalate_after
+        self._clock = clock
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._index = 0
+        self._changed_at = clock()
+        self._calm_since: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def level(self) -> DegradationLevel:
+        return self.levels[self._index]
+
+    def observe_latency(self, seconds: float) -> None:
+        """Record the duration of one language model request."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def update(self, queued: int, in_flight: int) -> DegradationLevel:
+        """Re-evaluate the level from current load and return it."""
+        with self._lock:
+            now = self._clock()
+            backlog = queued + in_flight
+            latency = median(self._latencies) if self._latencies else 0.0
+            overloaded = backlog >= self.queue_high or latency >= self.latency_high
+            calm = backlog <= self.queue_low and latency <= self.latency_low
+
+            if overloaded:
+                self._calm_since = None
+                if (
+                    self._index < len(self.levels) - 1
+                    and now - self._changed_at >= self.escalate_after
+                ):
+                    self._index += 1
+                    self._changed_at = now
+            elif calm and self._index > 0:
+                if self._calm_since is None:
+                    self._calm_since = now
+                if now - max(self._calm_since, self._changed_at) >= self.recover_after:
+                    self._index -= 1
+                    self._changed_at = now
+                    self._calm_since = now
+                    # Give the next step down a fresh view of latency.
+                    self._latencies.clear()
+            else:
+                self._calm_since = None
+            return self.levels[self._index]
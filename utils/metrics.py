@@ -0,0 +1,52 @@
+"""Per-message metrics records, one JSON object per line.
+
+Each handled message produces a record such as::
+
+    {"ts": 1760889600.123, "peer": 42, "target": 42, "channel": false,
+     "kind": "llm", "queue_ms": 3.1, "llm_ms": 2210.4, "chunks": 2,
+     "tx_bytes": 341, "tx_ms": 8120.7, "total_ms": 10334.9, "outcome": "ok"}
+
+Packets that are never handled get a record with ``outcome`` ``dropped``
+(and a ``reason``) or ``duplicate``. ``log_report.py`` summarises the files.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+logger = logging.getLogger("meshtastic_llm_bot")
+
+
+class MetricsLog:
+    """Append records to ``<directory>/<date>-metrics.jsonl``.
+
+    Files are created with mode 0600 and a new one is started each day.
+    Nothing is written when ``enabled`` is false.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def path(self, day: Optional[datetime.date] = None) -> str:
+        day = day or datetime.date.today()
+        return os.path.join(self.directory, f"{day.isoformat()}-metrics.jsonl")
+
+    def write(self, record: dict) -> None:
+        if not self.enabled:
+            return
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        path = self.path()
+        try:
+            with self._lock:
+                fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                with os.fdopen(fd, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            logger.warning("unable to write metrics to %s: %s", path, e)
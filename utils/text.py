@@ -3,21 +3,37 @@ import re
 MAX_TEXT_LEN = 1024
 MAX_LOC_LEN = 256
 
-# Allow newline and carriage return, escape other control characters
-_CONTROL_CHARS_RE = re.compile(r"[\x00-\x09\x0b-\x0c\x0e-\x1f\x7f]")
-_PLACEHOLDER_RE = re.compile(r"\s*\[[A-Z_]+\]\s*")
+# Placeholders such as "[USERNAME]" (with the space around them) are removed;
+# control characters other than newline and carriage return are escaped.
+_SANITIZE_RE = re.compile(r"(\s*\[[A-Z_]+\]\s*)|[\x00-\x09\x0b-\x0c\x0e-\x1f\x7f]")
 _LLM_ARTIFACT_RE = re.compile(r"\n?###\s*Response:\s*", re.IGNORECASE)
 
 
-def _escape_control(match: re.Match) -> str:
-    c = match.group(0)
-    return f"\\x{ord(c):02x}"
+class SafeText(str):
+    """A string already passed through :func:`safe_text`.
 
+    Sanitizing it again is free. Any operation that builds a new string
+    (slicing, concatenation, ``lower()``...) returns a plain ``str``.
+    """
 
-def safe_text(s: str, max_len: int = MAX_TEXT_LEN) -> str:
+    __slots__ = ()
+
+
+def _sanitize_match(match: re.Match) -> str:
+    if match.group(1) is not None:
+        return " "
+    return f"\\x{ord(match.group(0)):02x}"
+
+
+def safe_text(s: str, max_len: int = MAX_TEXT_LEN) -> SafeText:
     """Remove placeholders, escape control characters, and truncate."""
-    s = _PLACEHOLDER_RE.sub(" ", s).strip()
-    return _CONTROL_CHARS_RE.sub(_escape_control, s)[:max_len]
+    if type(s) is SafeText and len(s) <= max_len:
+        return s
+    s = s.strip()
+    # Most packets are plain printable text with nothing to remove.
+    if "[" not in s and s.isprintable():
+        return SafeText(s[:max_len])
+    return SafeText(_SANITIZE_RE.sub(_sanitize_match, s).strip()[:max_len])
 
 
 def strip_llm_artifacts(s: str) -> str:
@@ -1,27 +1,468 @@
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
 import requests
 from urllib.parse import quote_plus
 
 from utils.text import MAX_LOC_LEN, safe_text
 
+# Seconds a report is served as fresh, and how long it may still be served
+# while a background refresh runs.
+WEATHER_TTL = float(os.getenv("MESHTASTIC_WEATHER_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("MESHTASTIC_WEATHER_STALE_TTL", "3600"))
+WEATHER_CACHE_SIZE = 64
+WEATHER_WAIT = 10
 
-def get_weather(loc: str = "") -> str:
-    try:
+# Locations kept warm by the background refresher, comma separated.
+WEATHER_PREFETCH = [
+    loc.strip() for loc in os.getenv("MESHTASTIC_WEATHER_PREFETCH", "").split(",") if loc.strip()
+]
+PREFETCH_WINDOW = 3600
+PREFETCH_TOP = 8
+PREFETCH_HOT = 6
+PREFETCH_TICK = 30
+# A location whose prefetch fails is retried after this long, doubling up to
+# PREFETCH_RETRY_MAX, instead of on every tick.
+PREFETCH_RETRY = 60
+PREFETCH_RETRY_MAX = 3600
+
+# Offline sources: a JSON export of local reports and a local HTTP endpoint.
+WEATHER_FILE = os.getenv("MESHTASTIC_WEATHER_FILE")
+WEATHER_URL = os.getenv("MESHTASTIC_WEATHER_URL")
+
+logger = logging.getLogger("meshtastic_llm_bot")
+
+
+class WeatherError(Exception):
+    """Raised with a user-facing message when a lookup fails."""
+
+
+def normalize_location(loc: str) -> str:
+    return " ".join(safe_text(loc, MAX_LOC_LEN).lower().split())
+
+
+class WeatherProvider(ABC):
+    """Source of one-line weather reports.
+
+    Subclasses implement :meth:`fetch`, raising :class:`WeatherError` with a
+    user-facing message on failure and honouring ``timeout`` seconds.
+    """
+
+    name = "provider"
+
+    def __init__(self, timeout: float = 5):
+        self.timeout = timeout
+
+    @abstractmethod
+    def fetch(self, loc: str) -> str:
+        ...
+
+
+class WttrProvider(WeatherProvider):
+    """Current conditions from wttr.in."""
+
+    name = "wttr"
+
+    def fetch(self, loc: str) -> str:
+        try:
+            url = f"https://wttr.in/{quote_plus(loc) if loc else ''}?format=3&u"
+            r = requests.get(url, timeout=self.timeout, verify=True, allow_redirects=False)
+            r.raise_for_status()
+            if r.status_code == 200:
+                return r.text.strip()
+        except requests.RequestException as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            reason = getattr(getattr(e, "response", None), "reason", None)
+            if status is not None:
+                msg = f"HTTP {status}"
+                if reason:
+                    msg += f" {reason}"
+            else:
+                msg = str(e)
+            raise WeatherError(f"Error retrieving weather: {msg}") from e
+        except Exception as e:
+            raise WeatherError(f"Error retrieving weather: {e}") from e
+        raise WeatherError("Unable to retrieve weather.")
+
+
+class LocalFileProvider(WeatherProvider):
+    """Reports exported to a JSON file, e.g. by a home weather station.
+
+    The file maps location names to report strings; a ``"*"`` entry answers
+    any location. Files older than ``max_age`` seconds are treated as missing.
+    """
+
+    name = "local"
+
+    def __init__(self, path: str, max_age: float = WEATHER_STALE_TTL, timeout: float = 1):
+        super().__init__(timeout)
+        self.path = path
+        self.max_age = max_age
+
+    def fetch(self, loc: str) -> str:
+        try:
+            if time.time() - os.path.getmtime(self.path) > self.max_age:
+                raise WeatherError("Error retrieving weather: local report is stale")
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise WeatherError(f"Error retrieving weather: {e}") from e
+        if not isinstance(data, dict):
+            raise WeatherError("Error retrieving weather: malformed local report")
+        reports = {normalize_location(str(k)): v for k, v in data.items()}
+        report = reports.get(normalize_location(loc), reports.get("*"))
+        if not isinstance(report, str) or not report.strip():
+            raise WeatherError(f"Error retrieving weather: no local report for {loc}")
+        return report.strip()
+
+
+class LocalHTTPProvider(WeatherProvider):
+    """Reports from a local HTTP endpoint; ``{loc}`` in the URL is replaced."""
+
+    name = "local-http"
+
+    def __init__(self, url: str, timeout: float = 2):
+        super().__init__(timeout)
+        self.url = url
+
+    def fetch(self, loc: str) -> str:
+        try:
+            r = requests.get(
+                self.url.replace("{loc}", quote_plus(loc)),
+                timeout=self.timeout,
+                allow_redirects=False,
+            )
+            r.raise_for_status()
+            text = r.text.strip()
+        except Exception as e:
+            raise WeatherError(f"Error retrieving weather: {e}") from e
+        if not text:
+            raise WeatherError("Unable to retrieve weather.")
+        return text
+
+
+def configured_providers() -> List[WeatherProvider]:
+    """Build providers from ``MESHTASTIC_WEATHER_PROVIDERS`` (default: wttr)."""
+    names = [
+        n.strip().lower()
+        for n in os.getenv("MESHTASTIC_WEATHER_PROVIDERS", "wttr").split(",")
+        if n.strip()
+    ]
+    providers: List[WeatherProvider] = []
+    for name in names:
+        if name == "wttr":
+            providers.append(WttrProvider())
+        elif name == "local" and WEATHER_FILE:
+            providers.append(LocalFileProvider(WEATHER_FILE))
+        elif name == "local-http" and WEATHER_URL:
+            providers.append(LocalHTTPProvider(WEATHER_URL))
+        else:
+            logger.warning("weather provider %s unknown or not configured", name)
+    return providers or [WttrProvider()]
+
+
+class ProviderRace:
+    """Query providers concurrently and return the first good report.
+
+    If every provider fails, the errors are combined into one
+    :class:`WeatherError`. Providers that do not answer within their own
+    ``timeout`` are abandoned.
+    """
+
+    def __init__(self, providers: Sequence[WeatherProvider]):
+        self.providers = list(providers)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(2, 2 * len(self.providers)), thread_name_prefix="weather"
+        )
+
+    def __call__(self, loc: str) -> str:
         loc = safe_text(loc, MAX_LOC_LEN)
-        url = f"https://wttr.in/{quote_plus(loc) if loc else ''}?format=3&u"
-        r = requests.get(url, timeout=5, verify=True, allow_redirects=False)
-        r.raise_for_status()
-        if r.status_code == 200:
-            return r.text.strip()
-    except requests.RequestException as e:
-        status = getattr(getattr(e, "response", None), "status_code", None)
-        reason = getattr(getattr(e, "response", None), "reason", None)
-        if status is not None:
-            msg = f"HTTP {status}"
-            if reason:
-                msg += f" {reason}"
+        if len(self.providers) == 1:
+            return self.providers[0].fetch(loc)
+        futures = {self._pool.submit(p.fetch, loc): p for p in self.providers}
+        errors: List[str] = []
+        deadline = max(p.timeout for p in self.providers)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                try:
+                    return future.result()
+                except WeatherError as e:
+                    errors.append(f"{futures[future].name}: {e}")
+                except Exception as e:
+                    errors.append(f"{futures[future].name}: {e}")
+        except FuturesTimeout:
+            errors.append("timed out")
+        finally:
+            for future in futures:
+                future.cancel()
+        raise WeatherError("; ".join(errors))
+
+
+weather_providers = ProviderRace(configured_providers())
+
+
+def fetch_weather(loc: str = "") -> str:
+    return weather_providers(loc)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+
+
+class WeatherCache:
+    """LRU cache of weather reports keyed on normalized location.
+
+    Concurrent lookups for the same location share a single fetch. Reports
+    older than ``ttl`` but younger than ``stale_ttl`` are returned immediately
+    while a background thread refreshes them, and the last good report is
+    returned if a refresh fails.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], str] = fetch_weather,
+        ttl: float = WEATHER_TTL,
+        stale_ttl: float = WEATHER_STALE_TTL,
+        max_entries: int = WEATHER_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.stale_hits = self.misses = 0
+
+    def age(self, loc: str) -> Optional[float]:
+        """Seconds since ``loc`` was last fetched, or ``None`` if not cached."""
+        with self._lock:
+            entry = self._entries.get(normalize_location(loc))
+            return None if entry is None else self._clock() - entry[1]
+
+    def status(self, loc: str) -> str:
+        """How :meth:`get` would answer ``loc`` now: ``hit``, ``stale`` or ``miss``."""
+        age = self.age(loc)
+        if age is None or age >= self.stale_ttl:
+            return "miss"
+        return "hit" if age < self.ttl else "stale"
+
+    def get(self, loc: str) -> str:
+        key = normalize_location(loc)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                age = self._clock() - entry[1]
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry[0]
+                if age < self.stale_ttl:
+                    self.stale_hits += 1
+                    flight, leader = self._join(key)
+                    if leader:
+                        threading.Thread(
+                            target=self._run, args=(key, loc, flight), daemon=True
+                        ).start()
+                    return entry[0]
+            self.misses += 1
+            flight, leader = self._join(key)
+        if leader:
+            self._run(key, loc, flight)
         else:
-            msg = str(e)
-        return f"Error retrieving weather: {msg}"
-    except Exception as e:
-        return f"Error retrieving weather: {e}"
-    return "Unable to retrieve weather."
+            flight.done.wait(WEATHER_WAIT)
+        if flight.result is not None:
+            return flight.result
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry[0]
+        return flight.error or "Unable to retrieve weather."
+
+    def refresh(self, loc: str) -> bool:
+        """Fetch ``loc`` now, sharing any lookup already in progress.
+
+        Return whether a new report was cached.
+        """
+        key = normalize_location(loc)
+        with self._lock:
+            flight, leader = self._join(key)
+        if leader:
+            self._run(key, loc, flight)
+        else:
+            flight.done.wait(WEATHER_WAIT)
+        return flight.result is not None
+
+    def _join(self, key: str) -> Tuple[_Flight, bool]:
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = self._flights[key] = _Flight()
+        return flight, True
+
+    def _run(self, key: str, loc: str, flight: _Flight) -> None:
+        try:
+            flight.result = self.fetch(loc)
+        except WeatherError as e:
+            flight.error = str(e)
+        except Exception as e:
+            flight.error = f"Error retrieving weather: {e}"
+        finally:
+            with self._lock:
+                if flight.result is not None:
+                    self._entries[key] = (flight.result, self._clock())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+class WeatherPrefetcher:
+    """Keep popular locations warm in a :class:`WeatherCache`.
+
+    Locations are ranked by how often they were requested in the last
+    ``window`` seconds; configured locations always count as hot. Hot
+    locations are refreshed just before they expire, quieter ones less often
+    but still within the cache's stale window, so every tracked location is
+    answered from memory while outbound requests stay bounded by ``top``.
+    Locations whose lookups fail back off exponentially.
+    """
+
+    def __init__(
+        self,
+        cache: WeatherCache,
+        locations: Iterable[str] = (),
+        window: float = PREFETCH_WINDOW,
+        top: int = PREFETCH_TOP,
+        hot: int = PREFETCH_HOT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cache = cache
+        self.window = window
+        self.top = top
+        self.hot = hot
+        self._clock = clock
+        self._configured: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._recent: deque = deque()
+        self._counts: Counter = Counter()
+        # Normalized location -> (consecutive failures, next attempt).
+        self._failures: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        for loc in locations:
+            self.add(loc)
+
+    def add(self, loc: str) -> None:
+        key = normalize_location(loc)
+        with self._lock:
+            self._configured[key] = loc
+
+    def record(self, loc: str) -> None:
+        key = normalize_location(loc)
+        with self._lock:
+            now = self._clock()
+            self._recent.append((now, key))
+            self._counts[key] += 1
+            self._names[key] = loc
+            self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        while self._recent and now - self._recent[0][0] > self.window:
+            _, key = self._recent.popleft()
+            self._counts[key] -= 1
+            if self._counts[key] <= 0:
+                del self._counts[key]
+                self._names.pop(key, None)
+
+    def popular(self) -> List[Tuple[str, int]]:
+        """Return ``(location, requests)`` pairs to keep warm, busiest first."""
+        with self._lock:
+            self._expire(self._clock())
+            ranked = [(self._names[k], n) for k, n in self._counts.most_common(self.top)]
+            seen = {normalize_location(loc) for loc, _ in ranked}
+            for key, loc in self._configured.items():
+                if key not in seen:
+                    ranked.append((loc, self.hot))
+            return ranked
+
+    def interval(self, requests_seen: int) -> float:
+        """Refresh interval for a location requested ``requests_seen`` times."""
+        fresh = self.cache.ttl * 0.9
+        scaled = fresh * max(1.0, self.hot / max(requests_seen, 1))
+        return min(scaled, max(fresh, self.cache.stale_ttl * 0.9))
+
+    def run_once(self) -> int:
+        """Refresh every tracked location that is due; return how many."""
+        refreshed = 0
+        now = self._clock()
+        tracked = set()
+        for loc, n in self.popular():
+            key = normalize_location(loc)
+            tracked.add(key)
+            failed = self._failures.get(key)
+            if failed is not None and now < failed[1]:
+                continue
+            age = self.cache.age(loc)
+            if age is None or age >= self.interval(n):
+                refreshed += 1
+                if self.cache.refresh(loc):
+                    self._failures.pop(key, None)
+                else:
+                    count = failed[0] + 1 if failed else 1
+                    delay = min(PREFETCH_RETRY * 2 ** (count - 1), PREFETCH_RETRY_MAX)
+                    self._failures[key] = (count, now + delay)
+        for key in set(self._failures) - tracked:
+            del self._failures[key]
+        return refreshed
+
+    def start(self, tick: float = PREFETCH_TICK) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def loop():
+            while True:
+                try:
+                    self.run_once()
+                except Exception:
+                    logger.exception("weather prefetch failed")
+                time.sleep(tick)
+
+        self._thread = threading.Thread(target=loop, name="weather-prefetch", daemon=True)
+        self._thread.start()
+
+
+weather_cache = WeatherCache()
+weather_prefetcher = WeatherPrefetcher(weather_cache, WEATHER_PREFETCH)
+
+
+def start_weather_prefetch(*locations: str) -> None:
+    """Keep ``locations`` and popular recent lookups warm in the background."""
+    for loc in locations:
+        weather_prefetcher.add(loc)
+    weather_prefetcher.start()
+
+
+def get_weather(loc: str = "") -> str:
+    weather_prefetcher.record(loc)
+    return weather_cache.get(loc)
@@ -1,65 +1,292 @@
-import io
+import json
+import logging
+import os
+import tempfile
 import threading
-from contextlib import redirect_stdout
-from typing import Dict
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from adventure import Game
 from utils.text import MAX_TEXT_LEN, safe_text
 
-games: Dict[int, Game] = {}
-_games_lock = threading.Lock()
+logger = logging.getLogger("meshtastic_llm_bot")
+
+ZORK_DIR = os.path.abspath(os.getenv("MESHTASTIC_ZORK_DIR", "zork_data"))
+# Games idle this long (seconds) are written to ZORK_DIR and dropped from memory.
+ZORK_IDLE_TTL = float(os.getenv("MESHTASTIC_ZORK_IDLE_TTL", "1800"))
+ZORK_MAX_GAMES = int(os.getenv("MESHTASTIC_ZORK_MAX_GAMES", "64"))
+SAVES_DIR = os.path.join(ZORK_DIR, "saves")
+# Longest game reply, in packets of ZORK_PACKET_BYTES; the rest waits for 'zork more'.
+ZORK_MAX_PACKETS = int(os.getenv("MESHTASTIC_ZORK_MAX_PACKETS", "2"))
+ZORK_PACKET_BYTES = 170
+
+
+class GameStore:
+    """Active games in memory, idle games hibernated on disk.
+
+    Behaves like a dict keyed by player. Games unused for ``ttl`` seconds, or
+    the least recently used ones beyond ``max_games``, are serialised to
+    ``<directory>/<key>.json`` and restored transparently by :meth:`get`.
+    A game whose ``lock`` is held is running a command and is never evicted.
+    """
+
+    def __init__(self, directory: str, ttl: float, max_games: int, clock=time.monotonic):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_games = max_games
+        self._clock = clock
+        self._games: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _path(self, key: int) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._games or os.path.exists(self._path(key))
+
+    def get(self, key: int) -> Optional[Game]:
+        with self._lock:
+            entry = self._games.get(key)
+            if entry is not None:
+                game = entry[0]
+            else:
+                game = self._restore(key)
+                if game is None:
+                    return None
+            self[key] = game
+            return game
+
+    def __setitem__(self, key: int, game: Game) -> None:
+        with self._lock:
+            self._games[key] = (game, self._clock())
+            self._games.move_to_end(key)
+            self.evict()
+
+    def __delitem__(self, key: int) -> None:
+        with self._lock:
+            found = self._games.pop(key, None) is not None
+            try:
+                os.unlink(self._path(key))
+                found = True
+            except FileNotFoundError:
+                pass
+            if not found:
+                raise KeyError(key)
+
+    def evict(self) -> None:
+        """Hibernate games that are idle or over the size cap.
+
+        A game that is busy or cannot be written stays in memory.
+        """
+        with self._lock:
+            now = self._clock()
+            busy = []
+            while self._games:
+                key, (game, used) = next(iter(self._games.items()))
+                if len(self._games) + len(busy) <= self.max_games and now - used < self.ttl:
+                    break
+                lock = getattr(game, "lock", None)
+                if lock is not None and not lock.acquire(blocking=False):
+                    # Mid-command; leave it in memory and look at the next one.
+                    busy.append((key, self._games.pop(key)))
+                    continue
+                try:
+                    entry = self._games.pop(key)
+                    if not self._hibernate(key, game):
+                        # Keep the player's game rather than lose it; retried next time.
+                        busy.append((key, entry))
+                finally:
+                    if lock is not None:
+                        lock.release()
+            for key, entry in reversed(busy):
+                self._games[key] = entry
+                self._games.move_to_end(key, last=False)
+
+    def hibernate_all(self) -> None:
+        """Write every active game to disk, e.g. before a restart."""
+        with self._lock:
+            for key, (game, _) in self._games.items():
+                self._hibernate(key, game)
+
+    def clear(self) -> None:
+        """Forget every game, in memory and on disk."""
+        with self._lock:
+            self._games.clear()
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith(".json"):
+                        os.unlink(os.path.join(self.directory, name))
+
+    def _hibernate(self, key: int, game: Game) -> bool:
+        to_dict = getattr(game, "to_dict", None)
+        if to_dict is None:
+            return False
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True, mode=0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(to_dict(), f)
+            os.replace(tmp_path, self._path(key))
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error("Failed to hibernate game %s: %s", key, e)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return False
+
+    def _restore(self, key: int) -> Optional[Game]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return Game.from_dict(state)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error("Failed to restore game %s: %s", key, e)
+            return None
+
+
+games = GameStore(ZORK_DIR, ZORK_IDLE_TTL, ZORK_MAX_GAMES)
+
+
+def hibernate_games() -> None:
+    games.hibernate_all()
 
 
 COMMANDS_HELP = (
     "Commands:\n"
     "- 'zork north|south|east|west|up|down' to move\n"
     "- 'zork look' to look around\n"
+    "- 'zork go <room>' to walk back to a room you have visited\n"
+    "- 'zork hint' for the next goal and which way to head\n"
     "- 'zork examine <item>' to inspect items\n"
     "- 'zork take <item>' or 'zork drop <item>' to pick up or drop\n"
     "- 'zork inventory' to list carried items\n"
     "- 'zork use <item> [on <object>]' to use items\n"
-    "- 'zork save' or 'zork restore' to save or load\n"
+    "- 'zork save [slot]' or 'zork restore [slot]' to save or load; 'zork saves' lists slots\n"
     "- 'zork score' or 'zork moves' to check score or moves\n"
     "- 'zork verbose' to toggle detailed descriptions\n"
+    "- 'zork terse' to toggle short radio-friendly output\n"
+    "- 'zork more' for the rest of a long reply\n"
     "- 'zork quit' to end the game"
 )
 
 
+def _run(game: Game, action, *args) -> str:
+    """Call ``action`` on ``game`` and return the text it wrote."""
+    lines = []
+    with game.lock:
+        game.output = lines.append
+        try:
+            action(*args)
+        finally:
+            game.output = print
+    return "\n".join(lines).strip()
+
+
+def fit_packets(text: str, packets: int = ZORK_MAX_PACKETS) -> Tuple[str, str]:
+    """Split ``text`` into a page of about ``packets`` radio packets and the rest.
+
+    Pages hold whole lines and the first line always fits; a page with lines
+    left over ends with a note saying how many and to send 'zork more'.
+    """
+    budget = packets * ZORK_PACKET_BYTES
+    if len(text.encode("utf-8")) <= budget:
+        return text, ""
+    lines = text.splitlines()
+    kept = []
+    used = 0
+    for n, line in enumerate(lines):
+        size = len(line.encode("utf-8")) + 1
+        more = f"(+{len(lines) - n} more; 'zork more')"
+        if used + size + len(more) > budget and kept:
+            kept.append(more)
+            return "\n".join(kept), "\n".join(lines[n:])
+        kept.append(line)
+        used += size
+    return "\n".join(kept), ""
+
+
+class _Pages:
+    """The unsent rest of each player's last reply, for 'zork more'."""
+
+    def __init__(self, max_players: int):
+        self.max_players = max_players
+        self._rest: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def page(self, key: int, text: str) -> str:
+        """Return the first page of ``text`` and keep the rest for ``key``."""
+        page, rest = fit_packets(text)
+        with self._lock:
+            self._rest.pop(key, None)
+            if rest:
+                self._rest[key] = rest
+                while len(self._rest) > self.max_players:
+                    self._rest.popitem(last=False)
+        return page
+
+    def more(self, key: int) -> Optional[str]:
+        with self._lock:
+            rest = self._rest.pop(key, None)
+        return None if rest is None else self.page(key, rest)
+
+    def discard(self, key: int) -> None:
+        with self._lock:
+            self._rest.pop(key, None)
+
+
+pages = _Pages(ZORK_MAX_GAMES)
+
+
+def _play(game: Game, command: str) -> None:
+    for verb, noun, prep in game.parser.parse(command):
+        game.run_command(verb, noun, prep)
+
+
 def handle_zork(target: int, command: str, iface, is_channel: bool, user: int | None,
                 log_message, send_chunked_text) -> None:
     command = command.strip()
     key = user if user is not None else target
-    with _games_lock:
+    if not command or command == "help":
+        reply = (
+            "Usage: zork start|quit|<command>. Prefix every action with 'zork'.\n"
+            f"{COMMANDS_HELP}"
+        )
+    elif command == "start":
+        game = Game()
+        game.save_dir = os.path.join(SAVES_DIR, str(key))
+        game.terse = True
+        games[key] = game
+        room = _run(game, game.do_look)
+        reply = pages.page(key, f"{room}\n{COMMANDS_HELP}")
+    elif command in ("quit", "exit"):
+        try:
+            del games[key]
+            pages.discard(key)
+            reply = "Game over."
+        except KeyError:
+            reply = "No active game."
+    else:
         game = games.get(key)
-        if not command or command == "help":
-            reply = (
-                "Usage: zork start|quit|<command>. Prefix every action with 'zork'.\n"
-                f"{COMMANDS_HELP}"
-            )
-        elif command == "start":
-            game = Game()
-            games[key] = game
-            buf = io.StringIO()
-            with redirect_stdout(buf):
-                game.do_look()
-            room = buf.getvalue().strip()
-            reply = f"{room}\n{COMMANDS_HELP}"
-        elif command in ("quit", "exit"):
-            if key in games:
-                del games[key]
-                reply = "Game over."
-            else:
-                reply = "No active game."
+        if not game:
+            reply = "No active game. Type 'zork start' to begin and prefix every command with 'zork'."
         else:
-            if not game:
-                reply = "No active game. Type 'zork start' to begin and prefix every command with 'zork'."
+            game.save_dir = os.path.join(SAVES_DIR, str(key))
+            if command == "more":
+                reply = pages.more(key) or "Nothing more."
             else:
-                buf = io.StringIO()
-                with redirect_stdout(buf):
-                    for verb, noun, prep in game.parser.parse(command):
-                        game.run_command(verb, noun, prep)
-                reply = buf.getvalue().strip() or "..."
+                reply = pages.page(key, _run(game, _play, game, command)) or "..."
 
-    safe_reply = safe_text(reply)[:MAX_TEXT_LEN]
+    safe_reply = safe_text(reply, MAX_TEXT_LEN)
     log_message("OUT", target, safe_reply, channel=is_channel)
     send_chunked_text(safe_reply, target, iface, channel=is_channel)